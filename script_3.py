@@ -1,73 +1,132 @@
 
-# Create UrlChecker service
+import os
+
+# Create UrlChecker service (uses one shared, pooled HttpClient)
 url_checker = """package com.urlvalidator.service;
 
-import java.net.HttpURLConnection;
-import java.net.URL;
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+import org.springframework.stereotype.Service;
+
+import java.net.URI;
+import java.net.http.HttpClient;
+import java.net.http.HttpRequest;
+import java.net.http.HttpResponse;
+import java.time.Duration;
 
+@Service
 public class UrlChecker {
 
-    public static boolean isUrlReachable(String urlString) {
+    private static final Logger log = LoggerFactory.getLogger(UrlChecker.class);
+
+    private static final String USER_AGENT =
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36";
+
+    private final HttpClient httpClient;
+
+    public UrlChecker(HttpClient httpClient) {
+        this.httpClient = httpClient;
+    }
+
+    public boolean isUrlReachable(String urlString) {
         try {
-            URL url = new URL(urlString);
-            HttpURLConnection connection = (HttpURLConnection) url.openConnection();
-            
+            URI uri = new URI(urlString);
+
             // Set browser-like headers to avoid bot detection
-            connection.setRequestMethod("HEAD");
-            connection.setRequestProperty("User-Agent", 
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36");
-            connection.setRequestProperty("Accept", 
-                "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8");
-            connection.setRequestProperty("Accept-Language", "en-US,en;q=0.9");
-            connection.setConnectTimeout(8000);
-            connection.setReadTimeout(8000);
-            connection.setInstanceFollowRedirects(true);
-
-            int responseCode = connection.getResponseCode();
-            
+            int responseCode = send(uri, "HEAD");
+
             // If HEAD method is not allowed (405) or forbidden (403), try GET
             if (responseCode == 405 || responseCode == 403) {
-                connection.disconnect();
-                connection = (HttpURLConnection) url.openConnection();
-                connection.setRequestMethod("GET");
-                connection.setRequestProperty("User-Agent", 
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36");
-                connection.setRequestProperty("Accept", "text/html,application/xhtml+xml");
-                connection.setConnectTimeout(8000);
-                connection.setReadTimeout(8000);
-                connection.setInstanceFollowRedirects(true);
-                responseCode = connection.getResponseCode();
+                responseCode = send(uri, "GET");
             }
 
-            connection.disconnect();
-            
             // Accept any HTTP response (2xx, 3xx, 4xx, 5xx) as valid
             // Only network failures (exceptions) indicate invalid URL
             return (responseCode >= 200 && responseCode < 600);
-            
-        } catch (java.net.UnknownHostException e) {
-            // Domain doesn't exist
-            System.out.println("Unknown host: " + urlString);
+
+        } catch (java.net.ConnectException e) {
+            // Domain doesn't exist or refused the connection
+            log.debug("Cannot connect: {}", urlString);
             return false;
-        } catch (java.net.SocketTimeoutException e) {
+        } catch (java.net.http.HttpTimeoutException e) {
             // Connection timeout - site might be slow but exists
             // Being lenient here - you can change to false if needed
-            System.out.println("Timeout for: " + urlString);
+            log.debug("Timeout for: {}", urlString);
             return false;
-        } catch (java.net.MalformedURLException e) {
+        } catch (java.net.URISyntaxException | IllegalArgumentException e) {
             // Invalid URL format
-            System.out.println("Malformed URL: " + urlString);
+            log.debug("Malformed URL: {}", urlString);
+            return false;
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
             return false;
         } catch (Exception e) {
             // Other connection errors
-            System.out.println("Error checking URL " + urlString + ": " + e.getMessage());
+            log.debug("Error checking URL {}: {}", urlString, e.getMessage());
             return false;
         }
     }
+
+    private int send(URI uri, String method) throws Exception {
+        HttpRequest request = HttpRequest.newBuilder()
+            .uri(uri)
+            .timeout(Duration.ofSeconds(8))
+            .method(method, HttpRequest.BodyPublishers.noBody())
+            .header("User-Agent", USER_AGENT)
+            .header("Accept", "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8")
+            .header("Accept-Language", "en-US,en;q=0.9")
+            .build();
+        return httpClient.send(request, HttpResponse.BodyHandlers.discarding()).statusCode();
+    }
 }
 """
 
+# Create HttpClientConfig (single client with connection reuse, keep-alive and HTTP/2)
+http_client_config = """package com.urlvalidator.config;
+
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.context.annotation.Bean;
+import org.springframework.context.annotation.Configuration;
+
+import java.net.http.HttpClient;
+import java.time.Duration;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+
+@Configuration
+public class HttpClientConfig {
+
+    @Bean(destroyMethod = "shutdown")
+    public ExecutorService httpClientExecutor(@Value("${urlchecker.http.executor-threads:16}") int threads) {
+        return Executors.newFixedThreadPool(threads);
+    }
+
+    @Bean
+    public HttpClient httpClient(ExecutorService httpClientExecutor,
+                                 @Value("${urlchecker.http.version:HTTP_2}") HttpClient.Version version,
+                                 @Value("${urlchecker.http.connect-timeout:8s}") Duration connectTimeout,
+                                 @Value("${urlchecker.http.pool-size:0}") int poolSize,
+                                 @Value("${urlchecker.http.keep-alive-timeout:30s}") Duration keepAliveTimeout) {
+        // The JDK client reads its pool settings from system properties when the first client is built.
+        System.setProperty("jdk.httpclient.connectionPoolSize", String.valueOf(poolSize));
+        System.setProperty("jdk.httpclient.keepalive.timeout", String.valueOf(keepAliveTimeout.toSeconds()));
+
+        return HttpClient.newBuilder()
+            .version(version)
+            .followRedirects(HttpClient.Redirect.NORMAL)
+            .connectTimeout(connectTimeout)
+            .executor(httpClientExecutor)
+            .build();
+    }
+}
+"""
+
+os.makedirs(f"{base_path}/src/main/java/com/urlvalidator/config", exist_ok=True)
+
 with open(f"{base_path}/src/main/java/com/urlvalidator/service/UrlChecker.java", "w") as f:
     f.write(url_checker)
 
-print("UrlChecker service created!")
+with open(f"{base_path}/src/main/java/com/urlvalidator/config/HttpClientConfig.java", "w") as f:
+    f.write(http_client_config)
+
+print("UrlChecker service and HttpClientConfig created!")
@@ -3,6 +3,8 @@
 controller = """package com.urlvalidator.controller;
 
 import com.urlvalidator.service.UrlChecker;
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
 import org.springframework.web.bind.annotation.*;
 import org.springframework.http.ResponseEntity;
 import java.util.HashMap;
@@ -13,31 +15,31 @@ import java.util.Map;
 @RequestMapping("/api")
 public class UrlCheckController {
 
+    private static final Logger log = LoggerFactory.getLogger(UrlCheckController.class);
+
+    private final UrlChecker checker;
+
+    public UrlCheckController(UrlChecker checker) {
+        this.checker = checker;
+    }
+
     @PostMapping("/check-url")
-    public ResponseEntity<Map<String, String>> checkUrl(@RequestBody Map<String, String> body) {
+    public ResponseEntity<Map<String, Object>> checkUrl(@RequestBody Map<String, String> body) {
         String url = body.get("url");
         
         if (url == null || url.trim().isEmpty()) {
-            Map<String, String> response = new HashMap<>();
-            response.put("message", "❌ Please provide a valid URL");
+            Map<String, Object> response = new HashMap<>();
+            response.put("message", "Please provide a valid URL");
             return ResponseEntity.badRequest().body(response);
         }
         
-        System.out.println("Checking URL: " + url);
-        
-        boolean isValid = UrlChecker.isUrlReachable(url);
-        String message;
-
-        if (isValid) {
-            message = "✅ Valid website URL";
-            System.out.println("Result: VALID");
-        } else {
-            message = "❌ Invalid or unreachable website URL";
-            System.out.println("Result: INVALID");
-        }
+        boolean isValid = checker.isUrlReachable(url);
+        log.debug("Checked url={} reachable={}", url, isValid);
 
-        Map<String, String> response = new HashMap<>();
-        response.put("message", message);
+        // Structured result: clients read "reachable" instead of matching message text
+        Map<String, Object> response = new HashMap<>();
+        response.put("url", url);
+        response.put("reachable", isValid);
         return ResponseEntity.ok(response);
     }
     
@@ -9,6 +9,14 @@ spring.application.name=URL Validator
 # Logging
 logging.level.root=INFO
 logging.level.com.urlvalidator=DEBUG
+
+# Outbound HTTP client shared by all URL checks
+# pool-size=0 means unbounded; keep-alive-timeout is how long idle connections stay pooled
+urlchecker.http.version=HTTP_2
+urlchecker.http.connect-timeout=8s
+urlchecker.http.pool-size=0
+urlchecker.http.keep-alive-timeout=30s
+urlchecker.http.executor-threads=16
 """
 
 with open(f"{base_path}/src/main/resources/application.properties", "w") as f:
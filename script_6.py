@@ -173,6 +173,51 @@ html_content = """<!DOCTYPE html>
             display: none;
         }
 
+        textarea {
+            width: 100%;
+            padding: 14px 20px;
+            border: 2px solid #e0e0e0;
+            border-radius: 12px;
+            font-size: 1rem;
+            font-family: inherit;
+            outline: none;
+            margin-bottom: 15px;
+            resize: vertical;
+        }
+
+        .batch {
+            margin-top: 40px;
+        }
+
+        .batch h2 {
+            color: #333;
+            font-size: 1.4rem;
+            margin-bottom: 15px;
+        }
+
+        .batch-rows {
+            list-style: none;
+            margin-top: 15px;
+        }
+
+        .batch-rows li {
+            padding: 8px 12px;
+            border-radius: 8px;
+            margin-bottom: 6px;
+            word-break: break-all;
+            font-size: 0.95rem;
+        }
+
+        .batch-rows li.valid {
+            background: #d4edda;
+            color: #155724;
+        }
+
+        .batch-rows li.invalid {
+            background: #f8d7da;
+            color: #721c24;
+        }
+
         .status-text {
             color: #666;
             text-align: center;
@@ -215,10 +260,19 @@ html_content = """<!DOCTYPE html>
 
         <div id="status" class="status-text hidden"></div>
         <div id="result" class="result hidden"></div>
+
+        <div class="batch">
+            <h2>Batch Check</h2>
+            <textarea id="batchInput" rows="6" placeholder="One URL per line"></textarea>
+            <button id="batchBtn" onclick="checkBatch()">Check All</button>
+            <div id="batchStatus" class="status-text hidden"></div>
+            <ul id="batchRows" class="batch-rows"></ul>
+        </div>
     </div>
 
     <script>
         const API_ENDPOINT = 'http://localhost:8080/api/check-url';
+        const BATCH_STREAM_ENDPOINT = 'http://localhost:8080/api/check-urls/stream';
         
         async function checkUrl() {
             const urlInput = document.getElementById('urlInput');
@@ -256,7 +310,7 @@ html_content = """<!DOCTYPE html>
                 });
 
                 const data = await response.json();
-                displayResult(data.message, url);
+                displayResult(data, url);
 
             } catch (error) {
                 console.error('Error:', error);
@@ -268,14 +322,21 @@ html_content = """<!DOCTYPE html>
             }
         }
 
-        function displayResult(message, url) {
+        function displayResult(data, url) {
             const resultDiv = document.getElementById('result');
-            const isValid = message.includes('✅');
+            const isValid = data.reachable === true;
+            const message = isValid
+                ? 'Valid website URL'
+                : (data.message || 'Invalid or unreachable website URL');
+            const detail = isValid
+                ? (data.status ? `HTTP ${data.status} via ${data.method}` : '')
+                : (data.failure ? `Failed at ${data.failure}${data.error ? ': ' + data.error : ''}` : '');
 
             resultDiv.className = 'result ' + (isValid ? 'valid' : 'invalid');
             resultDiv.innerHTML = `
                 <div class="result-icon">${isValid ? '✅' : '❌'}</div>
                 <div class="result-message">${message}</div>
+                <div class="checked-url">${detail}</div>
                 <div class="checked-url">Checked: ${url}</div>
                 <button class="reset-btn" onclick="reset()">Check Another URL</button>
             `;
@@ -303,6 +364,64 @@ html_content = """<!DOCTYPE html>
             document.getElementById('urlInput').focus();
         }
 
+        // Batch results arrive as NDJSON, one line per URL, as soon as each check finishes
+        async function checkBatch() {
+            const urls = document.getElementById('batchInput').value
+                .split('\\n').map(u => u.trim()).filter(u => u);
+            const batchBtn = document.getElementById('batchBtn');
+            const batchStatus = document.getElementById('batchStatus');
+            const batchRows = document.getElementById('batchRows');
+
+            if (urls.length === 0) {
+                alert('Please enter at least one URL');
+                return;
+            }
+
+            batchBtn.disabled = true;
+            batchRows.innerHTML = '';
+            batchStatus.textContent = `0 / ${urls.length} checked`;
+            batchStatus.classList.remove('hidden');
+
+            let checked = 0;
+            try {
+                const response = await fetch(BATCH_STREAM_ENDPOINT, {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'Accept': 'application/x-ndjson'
+                    },
+                    body: JSON.stringify({ urls: urls })
+                });
+
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
+                let buffered = '';
+                while (true) {
+                    const { value, done } = await reader.read();
+                    if (done) break;
+                    buffered += decoder.decode(value, { stream: true });
+                    const lines = buffered.split('\\n');
+                    buffered = lines.pop();
+                    for (const line of lines) {
+                        if (!line.trim()) continue;
+                        const item = JSON.parse(line);
+                        const row = document.createElement('li');
+                        row.className = item.reachable ? 'valid' : 'invalid';
+                        row.textContent = (item.reachable ? '✅ ' : '❌ ') + item.url
+                            + (item.error ? ' (' + item.error + ')' : '');
+                        batchRows.appendChild(row);
+                        checked++;
+                    }
+                    batchStatus.textContent = `${checked} / ${urls.length} checked`;
+                }
+            } catch (error) {
+                console.error('Error:', error);
+                batchStatus.textContent = 'Cannot connect to backend API';
+            } finally {
+                batchBtn.disabled = false;
+            }
+        }
+
         // Allow Enter key to submit
         document.getElementById('urlInput').addEventListener('keypress', function(e) {
             if (e.key === 'Enter') {
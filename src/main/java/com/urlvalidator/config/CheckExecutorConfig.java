@@ -0,0 +1,49 @@
+package com.urlvalidator.config;
+
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.context.annotation.Bean;
+import org.springframework.context.annotation.Configuration;
+
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.ScheduledExecutorService;
+import java.util.concurrent.ThreadFactory;
+import java.util.concurrent.atomic.AtomicInteger;
+
+/**
+ * Scheduler used to enforce batch deadlines, the pool that runs blocking DNS lookups, the
+ * thread that writes results to disk, and the threads that read bulk job files.
+ */
+@Configuration
+public class CheckExecutorConfig {
+
+    @Bean(destroyMethod = "shutdownNow")
+    public ScheduledExecutorService checkScheduler() {
+        return Executors.newSingleThreadScheduledExecutor(daemonThreads("url-check-timer-"));
+    }
+
+    @Bean(destroyMethod = "shutdownNow")
+    public ExecutorService dnsExecutor(@Value("${urlchecker.dns.threads:32}") int threads) {
+        return Executors.newFixedThreadPool(threads, daemonThreads("dns-"));
+    }
+
+    @Bean(destroyMethod = "shutdown")
+    public ExecutorService resultStoreExecutor() {
+        return Executors.newSingleThreadExecutor(daemonThreads("result-store-"));
+    }
+
+    // Interrupted on shutdown; running jobs keep their state on disk and resume on the next start.
+    @Bean(destroyMethod = "shutdownNow")
+    public ExecutorService jobExecutor(@Value("${urlchecker.jobs.max-running:2}") int maxRunning) {
+        return Executors.newFixedThreadPool(Math.max(1, maxRunning), daemonThreads("job-"));
+    }
+
+    static ThreadFactory daemonThreads(String prefix) {
+        AtomicInteger counter = new AtomicInteger();
+        return r -> {
+            Thread t = new Thread(r, prefix + counter.incrementAndGet());
+            t.setDaemon(true);
+            return t;
+        };
+    }
+}
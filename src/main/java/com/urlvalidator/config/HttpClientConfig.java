@@ -0,0 +1,84 @@
+package com.urlvalidator.config;
+
+import com.urlvalidator.service.PeerCertificates;
+import org.springframework.beans.factory.annotation.Qualifier;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.context.annotation.Bean;
+import org.springframework.context.annotation.Configuration;
+
+import javax.net.ssl.SSLContext;
+import javax.net.ssl.SSLSessionContext;
+import javax.net.ssl.TrustManager;
+import javax.net.ssl.TrustManagerFactory;
+import javax.net.ssl.X509ExtendedTrustManager;
+import java.net.http.HttpClient;
+import java.security.GeneralSecurityException;
+import java.security.KeyStore;
+import java.time.Duration;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+
+/**
+ * Builds the single {@link HttpClient} shared by every URL check, so connections,
+ * TLS sessions and the selector thread are reused instead of created per request.
+ * Its {@link SSLContext} keeps a large client session cache and sends session tickets, so
+ * repeat checks of a host resume the previous TLS session instead of a full handshake.
+ */
+@Configuration
+public class HttpClientConfig {
+
+    @Bean(destroyMethod = "shutdown")
+    public ExecutorService httpClientExecutor(@Value("${urlchecker.http.executor-threads:16}") int threads) {
+        return Executors.newFixedThreadPool(threads, CheckExecutorConfig.daemonThreads("http-client-"));
+    }
+
+    @Bean
+    public SSLContext checkSslContext(PeerCertificates peerCertificates,
+                                      @Value("${urlchecker.tls.session-tickets:true}") boolean sessionTickets,
+                                      @Value("${urlchecker.tls.session-cache-size:20480}") int sessionCacheSize,
+                                      @Value("${urlchecker.tls.session-timeout:24h}") Duration sessionTimeout)
+            throws GeneralSecurityException {
+        // Like the pool settings below, read by the JDK when TLS is first used.
+        System.setProperty("jdk.tls.client.enableSessionTicketExtension", String.valueOf(sessionTickets));
+
+        TrustManagerFactory factory = TrustManagerFactory.getInstance(TrustManagerFactory.getDefaultAlgorithm());
+        factory.init((KeyStore) null);
+        X509ExtendedTrustManager trustManager = null;
+        for (TrustManager candidate : factory.getTrustManagers()) {
+            if (candidate instanceof X509ExtendedTrustManager) {
+                trustManager = (X509ExtendedTrustManager) candidate;
+                break;
+            }
+        }
+        if (trustManager == null) {
+            throw new IllegalStateException("No X509 trust manager in " + factory.getAlgorithm());
+        }
+        SSLContext context = SSLContext.getInstance("TLS");
+        context.init(null, new TrustManager[]{peerCertificates.recording(trustManager)}, null);
+        SSLSessionContext sessions = context.getClientSessionContext();
+        sessions.setSessionCacheSize(sessionCacheSize);
+        sessions.setSessionTimeout((int) sessionTimeout.toSeconds());
+        return context;
+    }
+
+    @Bean
+    public HttpClient httpClient(@Qualifier("httpClientExecutor") ExecutorService httpClientExecutor,
+                                 @Qualifier("checkSslContext") SSLContext checkSslContext,
+                                 @Value("${urlchecker.http.version:HTTP_2}") HttpClient.Version version,
+                                 @Value("${urlchecker.http.connect-timeout:10s}") Duration connectTimeout,
+                                 @Value("${urlchecker.http.pool-size:0}") int poolSize,
+                                 @Value("${urlchecker.http.keep-alive-timeout:30s}") Duration keepAliveTimeout) {
+        // The JDK client reads its pool settings from system properties when the first client is built.
+        System.setProperty("jdk.httpclient.connectionPoolSize", String.valueOf(poolSize));
+        System.setProperty("jdk.httpclient.keepalive.timeout", String.valueOf(keepAliveTimeout.toSeconds()));
+
+        return HttpClient.newBuilder()
+                .version(version)
+                // UrlChecker follows redirects itself (urlchecker.http.redirect), so every hop is vetted and timed.
+                .followRedirects(HttpClient.Redirect.NEVER)
+                .connectTimeout(connectTimeout)
+                .sslContext(checkSslContext)
+                .executor(httpClientExecutor)
+                .build();
+    }
+}
@@ -0,0 +1,42 @@
+package com.urlvalidator.config;
+
+import io.micrometer.core.instrument.Gauge;
+import io.micrometer.core.instrument.Tags;
+import io.micrometer.core.instrument.binder.MeterBinder;
+import io.micrometer.core.instrument.binder.jvm.ExecutorServiceMetrics;
+import org.springframework.beans.factory.annotation.Qualifier;
+import org.springframework.context.annotation.Bean;
+import org.springframework.context.annotation.Configuration;
+
+import javax.net.ssl.SSLContext;
+import javax.net.ssl.SSLSessionContext;
+import java.util.Collections;
+import java.util.concurrent.ExecutorService;
+
+/**
+ * Publishes pool size, active threads and queue depth for the executors behind the checks.
+ * The JDK HttpClient does not expose its connection pool, so the executor that runs its
+ * response handling is the closest view of how busy it is. The TLS session cache size shows
+ * how many hosts a check can currently resume a session with.
+ */
+@Configuration
+public class MetricsConfig {
+
+    @Bean
+    public MeterBinder checkExecutorMetrics(@Qualifier("httpClientExecutor") ExecutorService httpClientExecutor,
+                                            @Qualifier("dnsExecutor") ExecutorService dnsExecutor) {
+        return registry -> {
+            new ExecutorServiceMetrics(httpClientExecutor, "http-client", Tags.empty()).bindTo(registry);
+            new ExecutorServiceMetrics(dnsExecutor, "dns", Tags.empty()).bindTo(registry);
+        };
+    }
+
+    @Bean
+    public MeterBinder tlsSessionMetrics(@Qualifier("checkSslContext") SSLContext checkSslContext) {
+        SSLSessionContext sessions = checkSslContext.getClientSessionContext();
+        return registry -> Gauge.builder("urlchecker.tls.sessions.cached", sessions,
+                        s -> Collections.list(s.getIds()).size())
+                .description("TLS sessions cached for resumption")
+                .register(registry);
+    }
+}
@@ -16,7 +16,10 @@ public class WebConfig {
         CorsConfiguration cfg = new CorsConfiguration();
         // Allow common methods from any origin; adjust in production to restrict origins.
         cfg.setAllowedOrigins(Arrays.asList("*"));
-        cfg.setAllowedMethods(Arrays.asList("GET", "POST", "OPTIONS"));
+        // DELETE lets cross-origin clients cancel the jobs and remove the watches they create.
+        cfg.setAllowedMethods(Arrays.asList("GET", "POST", "DELETE", "OPTIONS"));
+        // The admin and cluster secret headers are deliberately not allowed: breaker resets and forwarded checks
+        // are for operators and peers, never for a browser page on another origin.
         cfg.setAllowedHeaders(Arrays.asList("Origin", "Content-Type", "Accept", "Authorization"));
         cfg.setAllowCredentials(false);
 
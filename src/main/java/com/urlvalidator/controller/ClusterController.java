@@ -0,0 +1,68 @@
+package com.urlvalidator.controller;
+
+import com.urlvalidator.model.CacheMode;
+import com.urlvalidator.model.ForwardedCheck;
+import com.urlvalidator.model.Priority;
+import com.urlvalidator.service.ClusterRouter;
+import com.urlvalidator.service.HostScheduler;
+import com.urlvalidator.service.UrlCheckService;
+import org.springframework.http.HttpHeaders;
+import org.springframework.http.HttpStatus;
+import org.springframework.http.ResponseEntity;
+import org.springframework.web.bind.annotation.*;
+
+import java.time.Duration;
+import java.util.Map;
+import java.util.concurrent.CompletableFuture;
+
+@RestController
+@RequestMapping("/api/cluster")
+public class ClusterController {
+
+    private final ClusterRouter cluster;
+    private final UrlCheckService checkService;
+    private final HostScheduler hostScheduler;
+
+    public ClusterController(ClusterRouter cluster, UrlCheckService checkService, HostScheduler hostScheduler) {
+        this.cluster = cluster;
+        this.checkService = checkService;
+        this.hostScheduler = hostScheduler;
+    }
+
+    @GetMapping
+    public ResponseEntity<?> stats() {
+        return ResponseEntity.ok(cluster.stats());
+    }
+
+    // Internal: a peer forwards a check of a host this instance owns. Only peers holding the cluster secret may call
+    // it, and the owner's own lane admission still applies; on 429 the peer checks the URL itself.
+    @PostMapping("/check")
+    public CompletableFuture<ResponseEntity<?>> check(
+            @RequestBody ForwardedCheck body,
+            @RequestHeader(value = ClusterRouter.SECRET_HEADER, required = false) String secret) {
+        if (!cluster.enabled()) {
+            return CompletableFuture.completedFuture(
+                    ResponseEntity.status(HttpStatus.NOT_FOUND).body(Map.of("message", "Cluster mode is off")));
+        }
+        if (!cluster.isPeer(secret)) {
+            return CompletableFuture.completedFuture(
+                    ResponseEntity.status(HttpStatus.FORBIDDEN).body(Map.of("message", "Not a cluster peer")));
+        }
+        if (body.url() == null || body.url().isBlank()) {
+            return CompletableFuture.completedFuture(
+                    ResponseEntity.badRequest().body(Map.of("message", "Missing url field")));
+        }
+        cluster.received();
+        CacheMode mode = body.cache() != null ? body.cache() : CacheMode.DEFAULT;
+        Priority priority = body.priority() != null ? body.priority() : Priority.INTERACTIVE;
+        Duration deadline = body.deadlineMillis() > 0 ? Duration.ofMillis(body.deadlineMillis()) : null;
+        if (!hostScheduler.admit(priority)) {
+            Duration retryAfter = hostScheduler.retryAfter(priority);
+            return CompletableFuture.completedFuture(ResponseEntity.status(HttpStatus.TOO_MANY_REQUESTS)
+                    .header(HttpHeaders.RETRY_AFTER, String.valueOf(retryAfter.toSeconds()))
+                    .body(Map.of("message", "Too many " + priority.key() + " checks waiting")));
+        }
+        return checkService.checkOwned(body.url(), mode, deadline, priority)
+                .<ResponseEntity<?>>thenApply(ResponseEntity::ok);
+    }
+}
@@ -0,0 +1,145 @@
+package com.urlvalidator.controller;
+
+import com.urlvalidator.model.CacheMode;
+import com.urlvalidator.model.JobOptions;
+import com.urlvalidator.model.JobStatus;
+import com.urlvalidator.service.JobService;
+import jakarta.servlet.http.HttpServletRequest;
+import org.springframework.http.ContentDisposition;
+import org.springframework.http.HttpHeaders;
+import org.springframework.http.HttpStatus;
+import org.springframework.http.MediaType;
+import org.springframework.http.ResponseEntity;
+import org.springframework.web.bind.annotation.*;
+import org.springframework.web.multipart.MultipartFile;
+import org.springframework.web.servlet.mvc.method.annotation.StreamingResponseBody;
+
+import java.io.IOException;
+import java.io.InputStream;
+import java.nio.file.Files;
+import java.util.Map;
+
+@RestController
+@RequestMapping("/api/jobs")
+@CrossOrigin
+public class JobController {
+
+    private static final MediaType TEXT_CSV = MediaType.parseMediaType("text/csv");
+
+    private final JobService jobService;
+
+    public JobController(JobService jobService) {
+        this.jobService = jobService;
+    }
+
+    // curl -F file=@links.csv http://localhost:8080/api/jobs
+    @PostMapping(consumes = MediaType.MULTIPART_FORM_DATA_VALUE)
+    public ResponseEntity<?> upload(@RequestParam("file") MultipartFile file,
+                                    @RequestParam(required = false) String format,
+                                    @RequestParam(required = false) String column,
+                                    @RequestParam(required = false) Boolean header,
+                                    @RequestParam(required = false) Integer concurrency,
+                                    @RequestParam(required = false) Long checkTimeoutSeconds,
+                                    @RequestParam(required = false) String cache) throws IOException {
+        try (InputStream in = file.getInputStream()) {
+            return create(in, file.getOriginalFilename(), format, column, header, concurrency, checkTimeoutSeconds,
+                    cache);
+        }
+    }
+
+    // curl --data-binary @links.txt -H 'Content-Type: text/plain' http://localhost:8080/api/jobs
+    @PostMapping(consumes = {MediaType.TEXT_PLAIN_VALUE, "text/csv", MediaType.APPLICATION_OCTET_STREAM_VALUE})
+    public ResponseEntity<?> uploadBody(HttpServletRequest request,
+                                        @RequestParam(required = false) String fileName,
+                                        @RequestParam(required = false) String format,
+                                        @RequestParam(required = false) String column,
+                                        @RequestParam(required = false) Boolean header,
+                                        @RequestParam(required = false) Integer concurrency,
+                                        @RequestParam(required = false) Long checkTimeoutSeconds,
+                                        @RequestParam(required = false) String cache) throws IOException {
+        if (format == null && request.getContentType() != null && request.getContentType().startsWith("text/csv")) {
+            format = "csv";
+        }
+        try (InputStream in = request.getInputStream()) {
+            return create(in, fileName, format, column, header, concurrency, checkTimeoutSeconds, cache);
+        }
+    }
+
+    private ResponseEntity<?> create(InputStream in, String fileName, String format, String column,
+                                     Boolean header, Integer concurrency, Long checkTimeoutSeconds,
+                                     String cache) throws IOException {
+        if (concurrency != null && concurrency <= 0) {
+            return ResponseEntity.badRequest().body(Map.of("message", "concurrency must be positive"));
+        }
+        if (checkTimeoutSeconds != null && checkTimeoutSeconds <= 0) {
+            return ResponseEntity.badRequest().body(Map.of("message", "checkTimeoutSeconds must be positive"));
+        }
+        CacheMode cacheMode;
+        try {
+            cacheMode = CacheMode.parse(cache);
+        } catch (IllegalArgumentException e) {
+            return ResponseEntity.badRequest().body(Map.of("message", "cache must be one of: default, refresh, bypass"));
+        }
+        try {
+            JobStatus status = jobService.create(in, fileName,
+                    new JobOptions(format, column, header, concurrency, checkTimeoutSeconds, cacheMode));
+            return ResponseEntity.status(HttpStatus.CREATED).body(status);
+        } catch (IllegalArgumentException | IllegalStateException e) {
+            return ResponseEntity.badRequest().body(Map.of("message", e.getMessage()));
+        }
+    }
+
+    @GetMapping
+    public ResponseEntity<?> list() {
+        return ResponseEntity.ok(Map.of("jobs", jobService.list()));
+    }
+
+    @GetMapping("/{id}")
+    public ResponseEntity<?> get(@PathVariable String id) {
+        JobStatus status = jobService.get(id);
+        if (status == null) {
+            return ResponseEntity.status(HttpStatus.NOT_FOUND).body(Map.of("message", "No job with id " + id));
+        }
+        return ResponseEntity.ok(status);
+    }
+
+    // Results so far while the job runs, all of them once it is done.
+    @GetMapping("/{id}/results")
+    public ResponseEntity<StreamingResponseBody> results(@PathVariable String id) throws IOException {
+        JobService.Results results = jobService.results(id);
+        if (results == null) {
+            return ResponseEntity.status(HttpStatus.NOT_FOUND).build();
+        }
+        StreamingResponseBody body = out -> {
+            if (results.length() == 0) {
+                return;
+            }
+            try (InputStream in = Files.newInputStream(results.file())) {
+                byte[] buffer = new byte[64 * 1024];
+                long remaining = results.length();
+                while (remaining > 0) {
+                    int n = in.read(buffer, 0, (int) Math.min(buffer.length, remaining));
+                    if (n < 0) {
+                        break;
+                    }
+                    out.write(buffer, 0, n);
+                    remaining -= n;
+                }
+            }
+        };
+        return ResponseEntity.ok()
+                .contentType(TEXT_CSV)
+                .contentLength(results.length())
+                .header(HttpHeaders.CONTENT_DISPOSITION,
+                        ContentDisposition.attachment().filename(id + (results.complete() ? "" : "-partial") + ".csv").build().toString())
+                .body(body);
+    }
+
+    @DeleteMapping("/{id}")
+    public ResponseEntity<?> delete(@PathVariable String id) throws IOException {
+        if (!jobService.delete(id)) {
+            return ResponseEntity.status(HttpStatus.NOT_FOUND).body(Map.of("message", "No job with id " + id));
+        }
+        return ResponseEntity.noContent().build();
+    }
+}
@@ -1,40 +1,303 @@
 package com.urlvalidator.controller;
 
-import com.urlvalidator.service.UrlChecker;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import com.urlvalidator.model.BatchCheckRequest;
+import com.urlvalidator.model.CacheMode;
+import com.urlvalidator.model.CheckResult;
+import com.urlvalidator.model.FailureClass;
+import com.urlvalidator.model.Priority;
+import com.urlvalidator.service.BatchCheckService;
+import com.urlvalidator.service.CheckCapacityHealthIndicator;
+import com.urlvalidator.service.DnsResolver;
+import com.urlvalidator.service.HostBreakers;
+import com.urlvalidator.service.HostScheduler;
+import com.urlvalidator.service.InFlightChecks;
+import com.urlvalidator.service.ResultCache;
+import com.urlvalidator.service.UrlCheckService;
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.boot.actuate.health.Health;
+import org.springframework.boot.actuate.health.Status;
+import org.springframework.http.HttpHeaders;
+import org.springframework.http.HttpStatus;
 import org.springframework.http.MediaType;
 import org.springframework.http.ResponseEntity;
 import org.springframework.web.bind.annotation.*;
+import org.springframework.web.servlet.mvc.method.annotation.StreamingResponseBody;
 
+import java.io.OutputStreamWriter;
+import java.io.Writer;
+import java.nio.charset.StandardCharsets;
+import java.security.MessageDigest;
+import java.time.Duration;
+import java.util.List;
 import java.util.Map;
+import java.util.concurrent.CompletableFuture;
 
 @RestController
 @RequestMapping("/api")
 @CrossOrigin
 public class UrlCheckController {
 
-    private final UrlChecker checker;
+    private static final Logger log = LoggerFactory.getLogger(UrlCheckController.class);
 
-    public UrlCheckController(UrlChecker checker) {
-        this.checker = checker;
+    private static final String INVALID_CACHE_MODE = "cache must be one of: default, refresh, bypass";
+    static final String ADMIN_TOKEN_HEADER = "X-Urlchecker-Admin-Token";
+
+    private final UrlCheckService checkService;
+    private final BatchCheckService batchChecker;
+    private final ResultCache cache;
+    private final InFlightChecks inFlight;
+    private final DnsResolver dnsResolver;
+    private final HostScheduler hostScheduler;
+    private final HostBreakers hostBreakers;
+    private final CheckCapacityHealthIndicator capacity;
+    private final ObjectMapper objectMapper;
+    private final byte[] adminToken;
+
+    public UrlCheckController(UrlCheckService checkService, BatchCheckService batchChecker, ResultCache cache,
+                              InFlightChecks inFlight, DnsResolver dnsResolver, HostScheduler hostScheduler,
+                              HostBreakers hostBreakers, CheckCapacityHealthIndicator capacity,
+                              ObjectMapper objectMapper,
+                              @Value("${urlchecker.admin.token:}") String adminToken) {
+        this.checkService = checkService;
+        this.batchChecker = batchChecker;
+        this.cache = cache;
+        this.inFlight = inFlight;
+        this.dnsResolver = dnsResolver;
+        this.hostScheduler = hostScheduler;
+        this.hostBreakers = hostBreakers;
+        this.capacity = capacity;
+        this.objectMapper = objectMapper;
+        this.adminToken = adminToken.getBytes(StandardCharsets.UTF_8);
     }
 
     @PostMapping("/check-url")
-    public ResponseEntity<?> checkUrl(@RequestBody Map<String, String> body) {
+    public CompletableFuture<ResponseEntity<?>> checkUrl(@RequestBody Map<String, String> body) {
         String url = body.get("url");
         if (url == null || url.isBlank()) {
-            return ResponseEntity.badRequest().body(Map.of("message", "Missing url field"));
+            return CompletableFuture.completedFuture(
+                    ResponseEntity.badRequest().body(Map.of("message", "Missing url field")));
         }
-        
+        if (!isValidCacheMode(body.get("cache"))) {
+            return CompletableFuture.completedFuture(
+                    ResponseEntity.badRequest().body(Map.of("message", INVALID_CACHE_MODE)));
+        }
+        Duration deadline;
         try {
-            boolean ok = checker.isReachable(url);
-            if (ok) {
-                return ResponseEntity.ok(Map.of("message", "✅ Valid website URL"));
+            deadline = secondsOf(body.get("timeoutSeconds"));
+        } catch (NumberFormatException e) {
+            return CompletableFuture.completedFuture(
+                    ResponseEntity.badRequest().body(Map.of("message", "timeoutSeconds must be a positive number")));
+        }
+
+        if (!hostScheduler.admit(Priority.INTERACTIVE)) {
+            return CompletableFuture.completedFuture(overloaded(Priority.INTERACTIVE));
+        }
+
+        // Returned to Spring MVC as-is, so the servlet thread is released while the check runs.
+        return checkService.checkAsync(url, CacheMode.parse(body.get("cache")), deadline, Priority.INTERACTIVE)
+                .thenApply(UrlCheckController::toResponse)
+                .exceptionally(e -> {
+                    log.warn("Error checking URL {}", url, e);
+                    return ResponseEntity.ok(CheckResult.failed(url, FailureClass.HTTP, e.getMessage()));
+                });
+    }
+
+    private static ResponseEntity<?> toResponse(CheckResult result) {
+        if (result.cacheAgeSeconds() != null) {
+            return ResponseEntity.ok()
+                    .header(HttpHeaders.AGE, String.valueOf(result.cacheAgeSeconds()))
+                    .body(result);
+        }
+        return ResponseEntity.ok(result);
+    }
+
+    @PostMapping("/check-urls")
+    public CompletableFuture<ResponseEntity<?>> checkUrls(@RequestBody BatchCheckRequest body) {
+        String error = validateBatch(body);
+        if (error != null) {
+            return CompletableFuture.completedFuture(ResponseEntity.badRequest().body(Map.of("message", error)));
+        }
+        Priority priority = batchChecker.priorityOf(body.urls());
+        if (!hostScheduler.admit(priority)) {
+            return CompletableFuture.completedFuture(overloaded(priority));
+        }
+
+        long started = System.nanoTime();
+        CacheMode cacheMode = CacheMode.parse(body.cache());
+        return batchChecker.checkAll(body.urls(), body.concurrency(), timeoutOf(body), checkTimeoutOf(body), cacheMode).thenApply(results -> {
+            long reachable = results.stream().filter(CheckResult::reachable).count();
+            return ResponseEntity.ok(Map.of(
+                    "total", results.size(),
+                    "reachable", reachable,
+                    "elapsedMillis", Duration.ofNanos(System.nanoTime() - started).toMillis(),
+                    "results", results
+            ));
+        });
+    }
+
+    // Streams one result per line (NDJSON), or as Server-Sent Events when the client accepts text/event-stream.
+    @PostMapping("/check-urls/stream")
+    public ResponseEntity<StreamingResponseBody> checkUrlsStream(
+            @RequestBody BatchCheckRequest body,
+            @RequestHeader(value = HttpHeaders.ACCEPT, required = false) String accept) {
+        String error = validateBatch(body);
+        if (error != null) {
+            return ResponseEntity.badRequest()
+                    .contentType(MediaType.APPLICATION_JSON)
+                    .body(out -> objectMapper.writeValue(out, Map.of("message", error)));
+        }
+        Priority priority = batchChecker.priorityOf(body.urls());
+        if (!hostScheduler.admit(priority)) {
+            Duration retryAfter = hostScheduler.retryAfter(priority);
+            return ResponseEntity.status(HttpStatus.TOO_MANY_REQUESTS)
+                    .header(HttpHeaders.RETRY_AFTER, String.valueOf(retryAfter.toSeconds()))
+                    .contentType(MediaType.APPLICATION_JSON)
+                    .body(out -> objectMapper.writeValue(out, Map.of("message", queueFull(priority, retryAfter))));
+        }
+
+        boolean sse = accept != null && accept.contains(MediaType.TEXT_EVENT_STREAM_VALUE);
+        CacheMode cacheMode = CacheMode.parse(body.cache());
+        StreamingResponseBody stream = out -> {
+            Writer writer = new OutputStreamWriter(out, StandardCharsets.UTF_8);
+            try {
+                batchChecker.stream(body.urls(), body.concurrency(), timeoutOf(body), checkTimeoutOf(body), cacheMode,
+                        result -> {
+                            String json = objectMapper.writeValueAsString(result);
+                            writer.write(sse ? "data: " + json + "\n\n" : json + "\n");
+                            writer.flush();
+                        });
+                if (sse) {
+                    writer.write("event: done\ndata: {}\n\n");
+                    writer.flush();
+                }
+            } catch (InterruptedException e) {
+                Thread.currentThread().interrupt();
             }
-            return ResponseEntity.ok(Map.of("message", "❌ Invalid or unreachable website URL"));
-        } catch (Exception e) {
-            System.err.println("Error checking URL: " + e.getMessage());
-            return ResponseEntity.ok(Map.of("message", "❌ Invalid or unreachable website URL"));
+        };
+        return ResponseEntity.ok()
+                .contentType(sse ? MediaType.TEXT_EVENT_STREAM : MediaType.APPLICATION_NDJSON)
+                .body(stream);
+    }
+
+    // Admission control: a full lane turns new work away at once instead of queueing it behind everything else.
+    private ResponseEntity<?> overloaded(Priority priority) {
+        Duration retryAfter = hostScheduler.retryAfter(priority);
+        return ResponseEntity.status(HttpStatus.TOO_MANY_REQUESTS)
+                .header(HttpHeaders.RETRY_AFTER, String.valueOf(retryAfter.toSeconds()))
+                .body(Map.of("message", queueFull(priority, retryAfter)));
+    }
+
+    private static String queueFull(Priority priority, Duration retryAfter) {
+        return "Too many " + priority.key() + " checks waiting, retry in " + retryAfter.toSeconds() + "s";
+    }
+
+    @GetMapping("/cache/stats")
+    public ResponseEntity<?> cacheStats() {
+        return ResponseEntity.ok(cache.stats());
+    }
+
+    @GetMapping("/coalescing/stats")
+    public ResponseEntity<?> coalescingStats() {
+        return ResponseEntity.ok(inFlight.stats());
+    }
+
+    @GetMapping("/dns/stats")
+    public ResponseEntity<?> dnsStats() {
+        return ResponseEntity.ok(dnsResolver.stats());
+    }
+
+    @GetMapping("/politeness/stats")
+    public ResponseEntity<?> politenessStats() {
+        return ResponseEntity.ok(hostScheduler.stats());
+    }
+
+    @GetMapping("/breakers/stats")
+    public ResponseEntity<?> breakerStats() {
+        return ResponseEntity.ok(hostBreakers.stats());
+    }
+
+    // Admin: closes a host's circuit (or every circuit) at once, e.g. after an outage is known to be over.
+    // Only with urlchecker.admin.token set, and only for callers presenting it.
+    @DeleteMapping("/breakers/{host}")
+    public ResponseEntity<?> resetBreaker(@PathVariable String host,
+                                          @RequestHeader(value = ADMIN_TOKEN_HEADER, required = false) String token) {
+        ResponseEntity<?> refused = refuseAdmin(token);
+        if (refused != null) {
+            return refused;
+        }
+        if (!hostBreakers.reset(host)) {
+            return ResponseEntity.status(HttpStatus.NOT_FOUND).body(Map.of("message", "No circuit for host " + host));
+        }
+        return ResponseEntity.noContent().build();
+    }
+
+    @DeleteMapping("/breakers")
+    public ResponseEntity<?> resetBreakers(@RequestHeader(value = ADMIN_TOKEN_HEADER, required = false) String token) {
+        ResponseEntity<?> refused = refuseAdmin(token);
+        if (refused != null) {
+            return refused;
         }
+        return ResponseEntity.ok(Map.of("reset", hostBreakers.resetAll()));
+    }
+
+    /** The response refusing an admin request, or {@code null} if {@code token} is the configured admin token. */
+    private ResponseEntity<?> refuseAdmin(String token) {
+        if (adminToken.length == 0) {
+            return ResponseEntity.status(HttpStatus.NOT_FOUND).body(Map.of("message", "Admin endpoints are off"));
+        }
+        if (token == null || !MessageDigest.isEqual(adminToken, token.getBytes(StandardCharsets.UTF_8))) {
+            return ResponseEntity.status(HttpStatus.FORBIDDEN).body(Map.of("message", "Admin token required"));
+        }
+        return null;
+    }
+
+    private String validateBatch(BatchCheckRequest body) {
+        List<String> urls = body.urls();
+        if (urls == null || urls.isEmpty()) {
+            return "Missing urls field";
+        }
+        if (urls.size() > batchChecker.getMaxUrls()) {
+            return "Too many urls (max " + batchChecker.getMaxUrls() + ")";
+        }
+        if (urls.stream().anyMatch(url -> url == null || url.isBlank())) {
+            return "urls must not contain blank entries";
+        }
+        if (!isValidCacheMode(body.cache())) {
+            return INVALID_CACHE_MODE;
+        }
+        return null;
+    }
+
+    private static boolean isValidCacheMode(String value) {
+        try {
+            CacheMode.parse(value);
+            return true;
+        } catch (IllegalArgumentException e) {
+            return false;
+        }
+    }
+
+    private static Duration timeoutOf(BatchCheckRequest body) {
+        return body.timeoutSeconds() != null ? Duration.ofSeconds(body.timeoutSeconds()) : null;
+    }
+
+    private static Duration checkTimeoutOf(BatchCheckRequest body) {
+        return body.checkTimeoutSeconds() != null ? Duration.ofSeconds(body.checkTimeoutSeconds()) : null;
+    }
+
+    /** Parses an optional positive number of seconds, which may be fractional. */
+    private static Duration secondsOf(String value) {
+        if (value == null || value.isBlank()) {
+            return null;
+        }
+        double seconds = Double.parseDouble(value.trim());
+        if (!(seconds > 0)) {
+            throw new NumberFormatException("not positive: " + value);
+        }
+        return Duration.ofMillis((long) (seconds * 1000));
     }
 
     // Debug endpoint: accept any content-type and return the raw body so we can see what the server receives.
@@ -46,9 +309,15 @@ public class UrlCheckController {
         ));
     }
 
+    // Readiness: 503 while the checker is saturated, so load balancers stop sending it work.
     @GetMapping("/health")
     public ResponseEntity<?> health() {
-        return ResponseEntity.ok(Map.of("status", "ok"));
+        Health health = capacity.health();
+        if (Status.UP.equals(health.getStatus())) {
+            return ResponseEntity.ok(Map.of("status", "ok", "details", health.getDetails()));
+        }
+        return ResponseEntity.status(HttpStatus.SERVICE_UNAVAILABLE)
+                .body(Map.of("status", "saturated", "details", health.getDetails()));
     }
 }
 
@@ -0,0 +1,95 @@
+package com.urlvalidator.controller;
+
+import com.urlvalidator.model.StatusChange;
+import com.urlvalidator.model.WatchRequest;
+import com.urlvalidator.model.WatchStatus;
+import com.urlvalidator.service.WatchService;
+import org.springframework.http.HttpStatus;
+import org.springframework.http.ResponseEntity;
+import org.springframework.web.bind.annotation.*;
+
+import java.time.Duration;
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Map;
+
+@RestController
+@RequestMapping("/api/watches")
+@CrossOrigin
+public class WatchController {
+
+    private static final int MAX_PAGE = 1000;
+
+    private final WatchService watchService;
+
+    public WatchController(WatchService watchService) {
+        this.watchService = watchService;
+    }
+
+    @PostMapping
+    public ResponseEntity<?> watch(@RequestBody WatchRequest body) {
+        List<String> urls = new ArrayList<>();
+        if (body.url() != null) {
+            urls.add(body.url());
+        }
+        if (body.urls() != null) {
+            urls.addAll(body.urls());
+        }
+        if (urls.isEmpty()) {
+            return ResponseEntity.badRequest().body(Map.of("message", "Missing url or urls field"));
+        }
+        if (urls.stream().anyMatch(url -> url == null || url.isBlank())) {
+            return ResponseEntity.badRequest().body(Map.of("message", "urls must not contain blank entries"));
+        }
+        if (body.intervalSeconds() != null && body.intervalSeconds() <= 0) {
+            return ResponseEntity.badRequest().body(Map.of("message", "intervalSeconds must be positive"));
+        }
+
+        Duration interval = body.intervalSeconds() != null ? Duration.ofSeconds(body.intervalSeconds()) : null;
+        List<WatchStatus> watched = new ArrayList<>(urls.size());
+        try {
+            for (String url : urls) {
+                watched.add(watchService.watch(url, interval));
+            }
+        } catch (IllegalStateException e) {
+            return ResponseEntity.badRequest().body(Map.of("message", e.getMessage(), "watched", watched));
+        }
+        return ResponseEntity.status(HttpStatus.CREATED).body(Map.of("watched", watched));
+    }
+
+    @GetMapping
+    public ResponseEntity<?> list(@RequestParam(defaultValue = "0") int offset,
+                                  @RequestParam(defaultValue = "100") int limit) {
+        int page = Math.max(1, Math.min(limit, MAX_PAGE));
+        return ResponseEntity.ok(Map.of(
+                "total", watchService.size(),
+                "watches", watchService.list(Math.max(0, offset), page)
+        ));
+    }
+
+    @GetMapping("/{id}")
+    public ResponseEntity<?> get(@PathVariable long id) {
+        WatchStatus status = watchService.get(id);
+        if (status == null) {
+            return ResponseEntity.status(HttpStatus.NOT_FOUND).body(Map.of("message", "No watch with id " + id));
+        }
+        return ResponseEntity.ok(status);
+    }
+
+    @DeleteMapping("/{id}")
+    public ResponseEntity<?> unwatch(@PathVariable long id) {
+        if (!watchService.unwatch(id)) {
+            return ResponseEntity.status(HttpStatus.NOT_FOUND).body(Map.of("message", "No watch with id " + id));
+        }
+        return ResponseEntity.noContent().build();
+    }
+
+    // Poll with the last seq seen; the response's "next" is the value to pass on the following call.
+    @GetMapping("/changes")
+    public ResponseEntity<?> changes(@RequestParam(defaultValue = "0") long since,
+                                     @RequestParam(defaultValue = "100") int limit) {
+        List<StatusChange> changes = watchService.changesSince(since, Math.max(1, Math.min(limit, MAX_PAGE)));
+        long next = changes.isEmpty() ? since : changes.get(changes.size() - 1).seq();
+        return ResponseEntity.ok(Map.of("next", next, "changes", changes));
+    }
+}
@@ -0,0 +1,12 @@
+package com.urlvalidator.model;
+
+import java.util.List;
+
+/**
+ * Body of {@code POST /api/check-urls}. {@code concurrency}, {@code timeoutSeconds} (the
+ * whole batch) and {@code checkTimeoutSeconds} (each URL) are optional and are capped by the
+ * server-side limits; {@code cache} is one of {@code default}, {@code refresh} or {@code bypass}.
+ */
+public record BatchCheckRequest(List<String> urls, Integer concurrency, Long timeoutSeconds, Long checkTimeoutSeconds,
+                                String cache) {
+}
@@ -0,0 +1,27 @@
+package com.urlvalidator.model;
+
+import java.util.Locale;
+
+/**
+ * How a check request interacts with the result cache.
+ */
+public enum CacheMode {
+    /** Serve a fresh cached result if there is one, otherwise check and cache. */
+    DEFAULT,
+    /** Always check and store the new result, replacing any cached one. */
+    REFRESH,
+    /** Always check and leave the cache untouched. */
+    BYPASS;
+
+    /**
+     * Parses the {@code cache} request field; {@code null} or blank means {@link #DEFAULT}.
+     *
+     * @throws IllegalArgumentException if the value is not one of the modes
+     */
+    public static CacheMode parse(String value) {
+        if (value == null || value.isBlank()) {
+            return DEFAULT;
+        }
+        return valueOf(value.trim().toUpperCase(Locale.ROOT));
+    }
+}
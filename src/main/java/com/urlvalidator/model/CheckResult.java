@@ -0,0 +1,55 @@
+package com.urlvalidator.model;
+
+import com.fasterxml.jackson.annotation.JsonInclude;
+
+import java.util.List;
+
+/**
+ * Outcome of checking a single URL.
+ *
+ * <p>{@code status} and {@code method} describe the last HTTP exchange (HEAD, or the GET
+ * fallback). For an unreachable URL {@code failure} says at which stage the check failed
+ * and {@code error} carries the detail. When redirects were followed, {@code finalUrl} is the
+ * URL that gave the final response and {@code redirects} lists the hops before it, in order.
+ * {@code tls} describes the final https connection and its certificate when certificate
+ * inspection is on.
+ * {@code cacheAgeSeconds} is only set when the result was served from the cache and says
+ * how long ago the check actually ran. Absent values are left out of the JSON.
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+public record CheckResult(String url,
+                          boolean reachable,
+                          Integer status,
+                          String method,
+                          FailureClass failure,
+                          String error,
+                          String finalUrl,
+                          List<RedirectHop> redirects,
+                          TlsInfo tls,
+                          Timings timings,
+                          Long cacheAgeSeconds) {
+
+    private static final String DEADLINE_EXCEEDED = "deadline exceeded";
+
+    public static CheckResult failed(String url, FailureClass failure, String error) {
+        return new CheckResult(url, false, null, null, failure, error, null, null, null, null, null);
+    }
+
+    public static CheckResult deadlineExceeded(String url, Timings timings) {
+        return new CheckResult(url, false, null, null, FailureClass.DEADLINE, DEADLINE_EXCEEDED, null, null, null,
+                timings, null);
+    }
+
+    public CheckResult forUrl(String requestedUrl) {
+        if (requestedUrl.equals(url)) {
+            return this;
+        }
+        return new CheckResult(requestedUrl, reachable, status, method, failure, error, finalUrl, redirects, tls,
+                timings, cacheAgeSeconds);
+    }
+
+    public CheckResult fromCache(String requestedUrl, long ageSeconds) {
+        return new CheckResult(requestedUrl, reachable, status, method, failure, error, finalUrl, redirects, tls,
+                timings, ageSeconds);
+    }
+}
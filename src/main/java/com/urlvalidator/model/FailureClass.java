@@ -0,0 +1,23 @@
+package com.urlvalidator.model;
+
+/**
+ * Stage at which a URL check failed.
+ */
+public enum FailureClass {
+    /** The input could not be turned into an http(s) request. */
+    INVALID_URL,
+    /** The host is, or resolves to, an address the checker may not connect to (loopback, private networks, ...). */
+    BLOCKED,
+    /** The host name did not resolve. */
+    DNS,
+    /** The host failed repeatedly in recent checks, so it was not contacted (its circuit breaker is open). */
+    HOST_DOWN,
+    /** No TCP connection could be opened (refused, unreachable or connect timeout). */
+    CONNECT,
+    /** The TLS handshake failed. */
+    TLS,
+    /** The server was reached but returned a non-2xx/3xx status, reset the exchange or timed out. */
+    HTTP,
+    /** The caller's deadline passed before the check finished. */
+    DEADLINE
+}
@@ -0,0 +1,8 @@
+package com.urlvalidator.model;
+
+/**
+ * A check one cluster instance hands to the instance that owns the URL's host
+ * ({@code POST /api/cluster/check}). {@code deadlineMillis} is how long the owner may take.
+ */
+public record ForwardedCheck(String url, CacheMode cache, long deadlineMillis, Priority priority) {
+}
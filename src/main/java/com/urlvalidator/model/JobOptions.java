@@ -0,0 +1,15 @@
+package com.urlvalidator.model;
+
+import com.fasterxml.jackson.annotation.JsonInclude;
+
+/**
+ * How a bulk job reads its file and runs its checks. {@code format} is {@code csv} or
+ * {@code text}; {@code column} picks the URL column of a CSV file by header name or
+ * zero-based index. {@code header} says whether the first CSV row is a header; when it is
+ * not given, a first row whose URL cell is not a URL is taken as one. The remaining fields
+ * mean the same as in a batch request.
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+public record JobOptions(String format, String column, Boolean header,
+                         Integer concurrency, Long checkTimeoutSeconds, CacheMode cache) {
+}
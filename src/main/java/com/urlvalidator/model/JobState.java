@@ -0,0 +1,15 @@
+package com.urlvalidator.model;
+
+/**
+ * Lifecycle of a bulk validation job.
+ */
+public enum JobState {
+    /** Uploaded and waiting for a free job slot. */
+    QUEUED,
+    /** URLs are being read and checked; results so far can be downloaded. */
+    RUNNING,
+    /** Every URL in the file has a result. */
+    DONE,
+    /** The job stopped because its files could not be read or written; see {@code error}. */
+    FAILED
+}
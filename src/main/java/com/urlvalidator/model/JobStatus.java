@@ -0,0 +1,27 @@
+package com.urlvalidator.model;
+
+import com.fasterxml.jackson.annotation.JsonInclude;
+
+/**
+ * Progress of a bulk job. {@code lines} is the number of lines in the uploaded file and
+ * {@code linesRead} how far the job has read; {@code urls} counts distinct normalized URLs
+ * found so far and {@code duplicates} the lines that repeated one of them. {@code checked}
+ * and {@code reachable} count the rows in the results file. {@code progress} runs from 0 to 1.
+ * Times are epoch millis; {@code finishedAt} and {@code error} are absent until they apply.
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+public record JobStatus(String id,
+                        String fileName,
+                        JobState state,
+                        JobOptions options,
+                        long lines,
+                        long linesRead,
+                        long urls,
+                        long duplicates,
+                        long checked,
+                        long reachable,
+                        double progress,
+                        long createdAt,
+                        Long finishedAt,
+                        String error) {
+}
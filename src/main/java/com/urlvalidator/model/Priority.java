@@ -0,0 +1,21 @@
+package com.urlvalidator.model;
+
+import java.util.Locale;
+
+/**
+ * The lane a check's outbound requests wait in. Lanes share the outbound capacity by weight
+ * ({@code urlchecker.lanes.<lane>.weight}), so bulk work cannot crowd out interactive checks.
+ */
+public enum Priority {
+    /** Single checks and small batches, typically from the web UI; someone is waiting for the answer. */
+    INTERACTIVE,
+    /** Large batches and bulk file jobs. */
+    BULK,
+    /** Scheduled re-validation of watched URLs. */
+    BACKGROUND;
+
+    /** The lane's name as used in configuration, stats and metric tags. */
+    public String key() {
+        return name().toLowerCase(Locale.ROOT);
+    }
+}
@@ -0,0 +1,13 @@
+package com.urlvalidator.model;
+
+import com.fasterxml.jackson.annotation.JsonInclude;
+
+/**
+ * One redirect on the way to a check's final response: the URL that redirected, its 3xx
+ * status and how long it took to answer in milliseconds. {@code cached} is set for a
+ * permanent redirect (301/308) taken from the redirect cache without a request, which
+ * then has no {@code millis}.
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+public record RedirectHop(String url, int status, Long millis, Boolean cached) {
+}
@@ -0,0 +1,11 @@
+package com.urlvalidator.model;
+
+import com.fasterxml.jackson.annotation.JsonInclude;
+
+/**
+ * A watched URL whose reachability flipped. {@code seq} increases by one per change, so
+ * clients can poll for everything after the last {@code seq} they saw.
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+public record StatusChange(long seq, long watchId, String url, boolean reachable, CheckResult result, long changedAt) {
+}
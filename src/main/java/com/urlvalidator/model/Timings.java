@@ -0,0 +1,12 @@
+package com.urlvalidator.model;
+
+import com.fasterxml.jackson.annotation.JsonInclude;
+
+/**
+ * Where the time of a check went, in milliseconds. {@code firstByte} runs from sending the
+ * final request to receiving its response headers, so it includes connection setup and
+ * the TLS handshake when no pooled connection could be reused.
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+public record Timings(Long dns, Long firstByte, long total) {
+}
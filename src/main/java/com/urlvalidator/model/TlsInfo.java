@@ -0,0 +1,23 @@
+package com.urlvalidator.model;
+
+import com.fasterxml.jackson.annotation.JsonInclude;
+
+/**
+ * The TLS connection and server certificate behind a check, reported when
+ * {@code urlchecker.tls.inspect-certificates} is on. {@code notBefore} and {@code notAfter}
+ * are epoch millis and {@code daysLeft} is negative once the certificate has expired.
+ * When the certificate was rejected, {@code trusted} is false, {@code problem} says why and
+ * {@code protocol} / {@code cipherSuite} are absent because the handshake never finished.
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+public record TlsInfo(String protocol,
+                      String cipherSuite,
+                      String subject,
+                      String issuer,
+                      long notBefore,
+                      long notAfter,
+                      long daysLeft,
+                      boolean hostnameMatches,
+                      boolean trusted,
+                      String problem) {
+}
@@ -0,0 +1,10 @@
+package com.urlvalidator.model;
+
+import java.util.List;
+
+/**
+ * Body of {@code POST /api/watches}: one {@code url} or a list of {@code urls} to re-check
+ * every {@code intervalSeconds} (optional, defaults and limits are server-side).
+ */
+public record WatchRequest(String url, List<String> urls, Long intervalSeconds) {
+}
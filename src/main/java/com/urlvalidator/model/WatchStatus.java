@@ -0,0 +1,11 @@
+package com.urlvalidator.model;
+
+import com.fasterxml.jackson.annotation.JsonInclude;
+
+/**
+ * A watched URL, its re-check interval and the outcome of its most recent check.
+ * {@code last} and {@code lastCheckedAt} (epoch millis) are absent until the first check has run.
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+public record WatchStatus(long id, String url, long intervalSeconds, CheckResult last, Long lastCheckedAt) {
+}
@@ -0,0 +1,311 @@
+package com.urlvalidator.service;
+
+import com.urlvalidator.model.CacheMode;
+import com.urlvalidator.model.CheckResult;
+import com.urlvalidator.model.FailureClass;
+import com.urlvalidator.model.Priority;
+import org.springframework.beans.factory.annotation.Qualifier;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Service;
+
+import java.io.IOException;
+import java.time.Duration;
+import java.util.ArrayDeque;
+import java.util.Arrays;
+import java.util.Deque;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.CompletableFuture;
+import java.util.concurrent.ScheduledExecutorService;
+import java.util.concurrent.ScheduledFuture;
+import java.util.concurrent.TimeUnit;
+
+/**
+ * Checks a list of URLs concurrently. Each batch runs at most {@code concurrency} checks
+ * at a time, at most {@code perHostConcurrency} of them against the same host, and hosts
+ * are served round-robin so one large domain does not hold up the rest of the batch.
+ * Checks still running when the batch deadline passes are reported as failed.
+ *
+ * <p>Batches can either be collected into a single list ({@link #checkAll}) or streamed
+ * result by result as checks finish ({@link #stream}). When streaming, a finished result
+ * keeps its concurrency slot until the caller has written it out, so a slow reader
+ * throttles the batch instead of letting results pile up in memory.
+ *
+ * <p>Batches of up to {@code urlchecker.batch.interactive-max-urls} URLs, such as the web UI
+ * sends, run in the interactive lane; larger ones in the bulk lane.
+ */
+@Service
+public class BatchCheckService {
+
+    private final UrlCheckService checkService;
+    private final UrlNormalizer normalizer;
+    private final DnsResolver dnsResolver;
+    private final ClusterRouter cluster;
+    private final ScheduledExecutorService scheduler;
+    private final int maxUrls;
+    private final int defaultConcurrency;
+    private final int maxConcurrency;
+    private final int perHostConcurrency;
+    private final Duration defaultTimeout;
+    private final Duration maxTimeout;
+    private final int interactiveMaxUrls;
+
+    public BatchCheckService(UrlCheckService checkService,
+                             UrlNormalizer normalizer,
+                             DnsResolver dnsResolver,
+                             ClusterRouter cluster,
+                             @Qualifier("checkScheduler") ScheduledExecutorService scheduler,
+                             @Value("${urlchecker.batch.max-urls:50000}") int maxUrls,
+                             @Value("${urlchecker.batch.default-concurrency:16}") int defaultConcurrency,
+                             @Value("${urlchecker.batch.max-concurrency:64}") int maxConcurrency,
+                             @Value("${urlchecker.batch.per-host-concurrency:2}") int perHostConcurrency,
+                             @Value("${urlchecker.batch.default-timeout:60s}") Duration defaultTimeout,
+                             @Value("${urlchecker.batch.max-timeout:300s}") Duration maxTimeout,
+                             @Value("${urlchecker.batch.interactive-max-urls:20}") int interactiveMaxUrls) {
+        this.checkService = checkService;
+        this.normalizer = normalizer;
+        this.dnsResolver = dnsResolver;
+        this.cluster = cluster;
+        this.scheduler = scheduler;
+        this.maxUrls = maxUrls;
+        this.defaultConcurrency = defaultConcurrency;
+        this.maxConcurrency = maxConcurrency;
+        this.perHostConcurrency = perHostConcurrency;
+        this.defaultTimeout = defaultTimeout;
+        this.maxTimeout = maxTimeout;
+        this.interactiveMaxUrls = interactiveMaxUrls;
+    }
+
+    public int getMaxUrls() {
+        return maxUrls;
+    }
+
+    /** The lane a batch of {@code urls} runs in. */
+    public Priority priorityOf(List<String> urls) {
+        return urls.size() <= interactiveMaxUrls ? Priority.INTERACTIVE : Priority.BULK;
+    }
+
+    /**
+     * Starts checking {@code urls} and returns a future that completes with one result per
+     * input URL, in input order, once every check has finished or the deadline has passed.
+     *
+     * @param concurrency requested parallelism, or {@code null} for the default
+     * @param timeout       requested overall deadline, or {@code null} for the default
+     * @param checkTimeout  requested deadline for each URL, or {@code null} for the default
+     * @param cacheMode     how each check uses the result cache
+     */
+    public CompletableFuture<List<CheckResult>> checkAll(List<String> urls, Integer concurrency, Duration timeout,
+                                                         Duration checkTimeout, CacheMode cacheMode) {
+        BatchRun run = new BatchRun(urls, parallelism(concurrency), checkTimeout, cacheMode, priorityOf(urls), false);
+        run.start(deadline(timeout));
+        return run.done;
+    }
+
+    /**
+     * Checks {@code urls} and hands each result to {@code sink} as soon as it is available,
+     * in completion order. Blocks the calling thread until every URL has been reported.
+     * If the sink throws (for example because the client disconnected) the batch is abandoned.
+     */
+    public void stream(List<String> urls, Integer concurrency, Duration timeout, Duration checkTimeout,
+                       CacheMode cacheMode, ResultSink sink) throws IOException, InterruptedException {
+        BatchRun run = new BatchRun(urls, parallelism(concurrency), checkTimeout, cacheMode, priorityOf(urls), true);
+        run.start(deadline(timeout));
+        try {
+            for (int emitted = 0; emitted < urls.size(); emitted++) {
+                sink.accept(run.next());
+                run.resume();
+            }
+        } finally {
+            run.abandon();
+        }
+    }
+
+    /** Receives streamed batch results; may block to apply backpressure. */
+    @FunctionalInterface
+    public interface ResultSink {
+        void accept(CheckResult result) throws IOException;
+    }
+
+    private int parallelism(Integer requested) {
+        return Math.max(1, Math.min(requested != null ? requested : defaultConcurrency, maxConcurrency));
+    }
+
+    private Duration deadline(Duration requested) {
+        if (requested == null || requested.isNegative() || requested.isZero()) {
+            return defaultTimeout;
+        }
+        return requested.compareTo(maxTimeout) > 0 ? maxTimeout : requested;
+    }
+
+    /** The canonical host {@code url} will be checked against, or {@code ""} if it is not a valid URL. */
+    private String hostOf(String url) {
+        UrlNormalizer.Normalized normalized = normalizer.canonicalize(url);
+        return normalized.valid() ? normalized.uri().getHost() : "";
+    }
+
+    private final class BatchRun {
+
+        private final List<String> urls;
+        private final CheckResult[] results;
+        private final int concurrency;
+        private final Duration checkTimeout;
+        private final CacheMode cacheMode;
+        private final Priority priority;
+        private final Map<String, Deque<Integer>> pendingByHost = new HashMap<>();
+        private final Deque<String> hostOrder = new ArrayDeque<>();
+        private final Map<String, Integer> activeByHost = new HashMap<>();
+        private final CompletableFuture<List<CheckResult>> done = new CompletableFuture<>();
+        // Only used when streaming: finished results the caller has not written out yet.
+        private final Deque<CheckResult> ready = new ArrayDeque<>();
+        private final boolean streaming;
+        private ScheduledFuture<?> deadlineTask;
+        private int inFlight;
+        // Only used when streaming: a result handed to the sink that is still being written out.
+        private int writing;
+        private int completed;
+        private boolean dispatching;
+
+        BatchRun(List<String> urls, int concurrency, Duration checkTimeout, CacheMode cacheMode, Priority priority,
+                 boolean streaming) {
+            this.urls = urls;
+            this.results = new CheckResult[urls.size()];
+            this.concurrency = concurrency;
+            this.checkTimeout = checkTimeout;
+            this.cacheMode = cacheMode;
+            this.priority = priority;
+            this.streaming = streaming;
+            for (int i = 0; i < urls.size(); i++) {
+                String host = hostOf(urls.get(i));
+                Deque<Integer> queue = pendingByHost.get(host);
+                if (queue == null) {
+                    queue = new ArrayDeque<>();
+                    pendingByHost.put(host, queue);
+                    hostOrder.addLast(host);
+                }
+                queue.addLast(i);
+            }
+        }
+
+        synchronized void start(Duration deadline) {
+            if (urls.isEmpty()) {
+                done.complete(List.of());
+                return;
+            }
+            deadlineTask = scheduler.schedule(this::expire, deadline.toMillis(), TimeUnit.MILLISECONDS);
+            // Resolve every distinct host in parallel up front; dead domains then fail fast when dispatched.
+            // Hosts owned by other cluster peers are resolved there.
+            dnsResolver.prefetch(pendingByHost.keySet().stream().filter(cluster::ownsLocally).toList());
+            dispatch();
+        }
+
+        /**
+         * Waits for the next finished result and hands it out. Until {@link #resume} says it has
+         * been written, the result keeps holding its concurrency slot.
+         */
+        synchronized CheckResult next() throws InterruptedException {
+            while (ready.isEmpty()) {
+                wait();
+            }
+            writing++;
+            return ready.pollFirst();
+        }
+
+        synchronized void resume() {
+            writing--;
+            if (!done.isDone()) {
+                dispatch();
+            }
+        }
+
+        synchronized void abandon() {
+            if (deadlineTask != null) {
+                deadlineTask.cancel(false);
+            }
+            done.complete(Arrays.asList(results));
+        }
+
+        /**
+         * Starts queued checks, round-robin across hosts, until a concurrency limit is hit.
+         * Checks answered from the cache complete inline; the guard keeps those completions
+         * from recursing back into this loop, which picks up their freed slots itself.
+         */
+        private void dispatch() {
+            if (dispatching) {
+                return;
+            }
+            dispatching = true;
+            try {
+                dispatchQueued();
+            } finally {
+                dispatching = false;
+            }
+        }
+
+        private void dispatchQueued() {
+            int skipped = 0;
+            while (inFlight + ready.size() + writing < concurrency && skipped < hostOrder.size()) {
+                String host = hostOrder.pollFirst();
+                if (activeByHost.getOrDefault(host, 0) >= perHostConcurrency) {
+                    hostOrder.addLast(host);
+                    skipped++;
+                    continue;
+                }
+                Deque<Integer> queue = pendingByHost.get(host);
+                int index = queue.pollFirst();
+                if (queue.isEmpty()) {
+                    pendingByHost.remove(host);
+                } else {
+                    hostOrder.addLast(host);
+                }
+                skipped = 0;
+                launch(index, host);
+            }
+        }
+
+        private void launch(int index, String host) {
+            inFlight++;
+            activeByHost.merge(host, 1, Integer::sum);
+            String url = urls.get(index);
+            checkService.checkAsync(url, cacheMode, checkTimeout, priority)
+                    .whenComplete((result, error) -> onComplete(index, host,
+                            result != null ? result : CheckResult.failed(url, FailureClass.HTTP, String.valueOf(error))));
+        }
+
+        private synchronized void onComplete(int index, String host, CheckResult result) {
+            inFlight--;
+            activeByHost.merge(host, -1, Integer::sum);
+            if (done.isDone()) {
+                return;
+            }
+            results[index] = result;
+            completed++;
+            if (streaming) {
+                ready.addLast(result);
+                notifyAll();
+            }
+            if (completed == results.length) {
+                deadlineTask.cancel(false);
+                done.complete(Arrays.asList(results));
+            } else {
+                dispatch();
+            }
+        }
+
+        private synchronized void expire() {
+            if (done.isDone()) {
+                return;
+            }
+            for (int i = 0; i < results.length; i++) {
+                if (results[i] == null) {
+                    results[i] = CheckResult.deadlineExceeded(urls.get(i), null);
+                    if (streaming) {
+                        ready.addLast(results[i]);
+                    }
+                }
+            }
+            notifyAll();
+            done.complete(Arrays.asList(results));
+        }
+    }
+}
@@ -0,0 +1,53 @@
+package com.urlvalidator.service;
+
+import org.springframework.beans.factory.annotation.Qualifier;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.boot.actuate.health.Health;
+import org.springframework.boot.actuate.health.HealthIndicator;
+import org.springframework.stereotype.Component;
+
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.ThreadPoolExecutor;
+
+/**
+ * Reports the instance out of service while it is saturated: too many checks in flight,
+ * or work queueing up behind the HTTP client or DNS threads.
+ */
+@Component
+public class CheckCapacityHealthIndicator implements HealthIndicator {
+
+    private final CheckMetrics metrics;
+    private final ExecutorService httpClientExecutor;
+    private final ExecutorService dnsExecutor;
+    private final int maxInFlightChecks;
+    private final int maxQueuedTasks;
+
+    public CheckCapacityHealthIndicator(CheckMetrics metrics,
+                                        @Qualifier("httpClientExecutor") ExecutorService httpClientExecutor,
+                                        @Qualifier("dnsExecutor") ExecutorService dnsExecutor,
+                                        @Value("${urlchecker.health.max-in-flight-checks:10000}") int maxInFlightChecks,
+                                        @Value("${urlchecker.health.max-queued-tasks:1000}") int maxQueuedTasks) {
+        this.metrics = metrics;
+        this.httpClientExecutor = httpClientExecutor;
+        this.dnsExecutor = dnsExecutor;
+        this.maxInFlightChecks = maxInFlightChecks;
+        this.maxQueuedTasks = maxQueuedTasks;
+    }
+
+    @Override
+    public Health health() {
+        int inFlight = metrics.inFlight();
+        int httpQueued = queued(httpClientExecutor);
+        int dnsQueued = queued(dnsExecutor);
+        boolean saturated = inFlight > maxInFlightChecks || httpQueued > maxQueuedTasks || dnsQueued > maxQueuedTasks;
+        return (saturated ? Health.outOfService() : Health.up())
+                .withDetail("inFlightChecks", inFlight)
+                .withDetail("httpClientQueued", httpQueued)
+                .withDetail("dnsQueued", dnsQueued)
+                .build();
+    }
+
+    private static int queued(ExecutorService executor) {
+        return executor instanceof ThreadPoolExecutor pool ? pool.getQueue().size() : 0;
+    }
+}
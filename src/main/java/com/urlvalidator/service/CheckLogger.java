@@ -0,0 +1,76 @@
+package com.urlvalidator.service;
+
+import com.urlvalidator.model.CheckResult;
+import com.urlvalidator.model.Timings;
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Component;
+
+import java.util.concurrent.ThreadLocalRandom;
+import java.util.concurrent.atomic.AtomicInteger;
+import java.util.concurrent.atomic.AtomicLong;
+
+/**
+ * Writes one key=value line per finished check. Successful checks are sampled at
+ * {@code urlchecker.logging.success-sample-rate} (all of them at DEBUG), and failures
+ * are capped at {@code urlchecker.logging.failure-logs-per-second}; the next failure
+ * line that gets through reports how many were suppressed in between.
+ */
+@Component
+public class CheckLogger {
+
+    private static final Logger log = LoggerFactory.getLogger(CheckLogger.class);
+
+    private final double successSampleRate;
+    private final int failureLogsPerSecond;
+    private final AtomicLong windowSecond = new AtomicLong();
+    private final AtomicInteger windowCount = new AtomicInteger();
+    private final AtomicLong suppressed = new AtomicLong();
+
+    public CheckLogger(@Value("${urlchecker.logging.success-sample-rate:0.01}") double successSampleRate,
+                       @Value("${urlchecker.logging.failure-logs-per-second:20}") int failureLogsPerSecond) {
+        this.successSampleRate = successSampleRate;
+        this.failureLogsPerSecond = failureLogsPerSecond;
+    }
+
+    public void log(CheckResult result) {
+        if (result.reachable()) {
+            boolean sampled = successSampleRate >= 1.0 || ThreadLocalRandom.current().nextDouble() < successSampleRate;
+            if (sampled ? log.isInfoEnabled() : log.isDebugEnabled()) {
+                Timings t = result.timings();
+                String line = "check ok url={} status={} method={} dnsMs={} firstByteMs={} totalMs={}";
+                Object[] args = {result.url(), result.status(), result.method(),
+                        t != null ? t.dns() : null, t != null ? t.firstByte() : null, t != null ? t.total() : null};
+                if (sampled) {
+                    log.info(line, args);
+                } else {
+                    log.debug(line, args);
+                }
+            }
+            return;
+        }
+
+        if (!log.isInfoEnabled()) {
+            return;
+        }
+        if (!tryAcquire()) {
+            suppressed.incrementAndGet();
+            return;
+        }
+        Timings t = result.timings();
+        log.info("check failed url={} failure={} error=\"{}\" status={} method={} dnsMs={} firstByteMs={} totalMs={} suppressed={}",
+                result.url(), result.failure(), result.error(), result.status(), result.method(),
+                t != null ? t.dns() : null, t != null ? t.firstByte() : null, t != null ? t.total() : null,
+                suppressed.getAndSet(0));
+    }
+
+    private boolean tryAcquire() {
+        long second = System.currentTimeMillis() / 1000;
+        long current = windowSecond.get();
+        if (current != second && windowSecond.compareAndSet(current, second)) {
+            windowCount.set(0);
+        }
+        return windowCount.incrementAndGet() <= failureLogsPerSecond;
+    }
+}
@@ -0,0 +1,124 @@
+package com.urlvalidator.service;
+
+import com.urlvalidator.model.CheckResult;
+import com.urlvalidator.model.FailureClass;
+import com.urlvalidator.model.Timings;
+import io.micrometer.core.instrument.Counter;
+import io.micrometer.core.instrument.Gauge;
+import io.micrometer.core.instrument.MeterRegistry;
+import io.micrometer.core.instrument.Timer;
+import org.springframework.stereotype.Component;
+
+import java.time.Duration;
+import java.util.EnumMap;
+import java.util.Locale;
+import java.util.Map;
+import java.util.concurrent.atomic.AtomicInteger;
+
+/**
+ * Micrometer instruments for the probe itself: latency histograms overall and per phase,
+ * outcome counts by failure class, HEAD-to-GET fallbacks, hedges, timeouts, redirects followed
+ * and checks in flight.
+ */
+@Component
+public class CheckMetrics {
+
+    private final Timer reachable;
+    private final Map<FailureClass, Timer> failed = new EnumMap<>(FailureClass.class);
+    private final Timer dnsPhase;
+    private final Timer firstBytePhase;
+    private final Counter fallbacks;
+    private final Counter timeouts;
+    private final Counter hedges;
+    private final Counter headSkips;
+    private final Counter redirects;
+    private final AtomicInteger inFlight = new AtomicInteger();
+
+    public CheckMetrics(MeterRegistry registry) {
+        this.reachable = checkTimer(registry, "reachable");
+        for (FailureClass failure : FailureClass.values()) {
+            failed.put(failure, checkTimer(registry, failure.name().toLowerCase(Locale.ROOT)));
+        }
+        this.dnsPhase = phaseTimer(registry, "dns");
+        this.firstBytePhase = phaseTimer(registry, "first_byte");
+        this.fallbacks = Counter.builder("urlchecker.check.fallbacks")
+                .description("HEAD requests that were retried as GET")
+                .register(registry);
+        this.timeouts = Counter.builder("urlchecker.check.timeouts")
+                .description("HTTP exchanges that timed out")
+                .register(registry);
+        this.hedges = Counter.builder("urlchecker.check.hedges")
+                .description("GET requests sent alongside a slow HEAD")
+                .register(registry);
+        this.headSkips = Counter.builder("urlchecker.check.head.skipped")
+                .description("Checks that went straight to GET because HEAD is known to fail on the host")
+                .register(registry);
+        this.redirects = Counter.builder("urlchecker.check.redirects")
+                .description("Redirects followed with a request (cached permanent redirects are not counted)")
+                .register(registry);
+        Gauge.builder("urlchecker.checks.in.flight", inFlight, AtomicInteger::get)
+                .description("Probes currently running")
+                .register(registry);
+    }
+
+    public void checkStarted() {
+        inFlight.incrementAndGet();
+    }
+
+    public void checkFinished(CheckResult result) {
+        inFlight.decrementAndGet();
+        Timings timings = result.timings();
+        Timer outcome = result.reachable() ? reachable : failed.get(result.failure());
+        // Only URLs rejected before any work is done have no timings.
+        outcome.record(timings != null ? Duration.ofMillis(timings.total()) : Duration.ZERO);
+        if (timings == null) {
+            return;
+        }
+        if (timings.dns() != null) {
+            dnsPhase.record(Duration.ofMillis(timings.dns()));
+        }
+        if (timings.firstByte() != null) {
+            firstBytePhase.record(Duration.ofMillis(timings.firstByte()));
+        }
+    }
+
+    public void headFallback() {
+        fallbacks.increment();
+    }
+
+    public void timeout() {
+        timeouts.increment();
+    }
+
+    public void hedged() {
+        hedges.increment();
+    }
+
+    public void headSkipped() {
+        headSkips.increment();
+    }
+
+    public void redirectFollowed() {
+        redirects.increment();
+    }
+
+    public int inFlight() {
+        return inFlight.get();
+    }
+
+    private static Timer checkTimer(MeterRegistry registry, String outcome) {
+        return Timer.builder("urlchecker.check.duration")
+                .description("Total time of a URL check")
+                .tag("outcome", outcome)
+                .publishPercentileHistogram()
+                .register(registry);
+    }
+
+    private static Timer phaseTimer(MeterRegistry registry, String phase) {
+        return Timer.builder("urlchecker.check.phase")
+                .description("Time spent in one phase of a URL check")
+                .tag("phase", phase)
+                .publishPercentileHistogram()
+                .register(registry);
+    }
+}
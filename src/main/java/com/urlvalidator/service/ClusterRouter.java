@@ -0,0 +1,312 @@
+package com.urlvalidator.service;
+
+import com.fasterxml.jackson.core.JsonProcessingException;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import com.urlvalidator.model.CacheMode;
+import com.urlvalidator.model.CheckResult;
+import com.urlvalidator.model.ForwardedCheck;
+import com.urlvalidator.model.Priority;
+import io.micrometer.core.instrument.FunctionCounter;
+import io.micrometer.core.instrument.Gauge;
+import io.micrometer.core.instrument.MeterRegistry;
+import io.micrometer.core.instrument.binder.MeterBinder;
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Component;
+
+import java.io.IOException;
+import java.io.UncheckedIOException;
+import java.net.URI;
+import java.net.http.HttpClient;
+import java.net.http.HttpRequest;
+import java.net.http.HttpResponse;
+import java.nio.charset.StandardCharsets;
+import java.security.MessageDigest;
+import java.security.NoSuchAlgorithmException;
+import java.time.Duration;
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Locale;
+import java.util.Map;
+import java.util.NavigableMap;
+import java.util.TreeMap;
+import java.util.concurrent.CompletableFuture;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.atomic.AtomicLong;
+
+/**
+ * Cluster mode ({@code urlchecker.cluster.enabled}): every host is owned by one instance of a
+ * static peer list, picked by consistent hashing of the host name, and checks of URLs on
+ * other instances' hosts are forwarded there. The owner's cache, request coalescing, host
+ * scheduler and circuit breakers therefore act for the whole cluster, and adding or removing
+ * a peer only moves the hosts next to it on the ring.
+ *
+ * <p>A peer that cannot be reached is skipped for {@code urlchecker.cluster.peer-retry}: its
+ * hosts move to the next peer on the ring, and the check that found it down runs locally.
+ * An owner whose lane is full answers 429; the check then also runs locally, without
+ * marking the owner down.
+ *
+ * <p>Forwarded checks carry {@code urlchecker.cluster.secret} in the {@value #SECRET_HEADER}
+ * header, and the owner only accepts checks that carry it.
+ */
+@Component
+public class ClusterRouter implements MeterBinder {
+
+    private static final Logger log = LoggerFactory.getLogger(ClusterRouter.class);
+
+    public static final String SECRET_HEADER = "X-Urlchecker-Cluster-Secret";
+    static final String CHECK_PATH = "/api/cluster/check";
+    private static final Duration FORWARD_GRACE = Duration.ofSeconds(2);
+
+    private final HttpClient httpClient;
+    private final ObjectMapper objectMapper;
+    private final boolean enabled;
+    private final String self;
+    private final byte[] secret;
+    private final List<String> peers;
+    private final long peerRetryMillis;
+    private final Duration forwardDeadline;
+    // Virtual nodes: hash -> peer base URL. Several points per peer even out the share each one owns.
+    private final NavigableMap<Long, String> ring = new TreeMap<>();
+    private final Map<String, Long> downUntil = new ConcurrentHashMap<>();
+
+    private final AtomicLong forwarded = new AtomicLong();
+    private final AtomicLong received = new AtomicLong();
+    private final AtomicLong fallbacks = new AtomicLong();
+
+    public ClusterRouter(HttpClient httpClient, ObjectMapper objectMapper,
+                         @Value("${urlchecker.cluster.enabled:false}") boolean enabled,
+                         @Value("${urlchecker.cluster.self:}") String self,
+                         @Value("${urlchecker.cluster.secret:}") String secret,
+                         @Value("${urlchecker.cluster.peers:}") List<String> peers,
+                         @Value("${urlchecker.cluster.virtual-nodes:160}") int virtualNodes,
+                         @Value("${urlchecker.cluster.peer-retry:10s}") Duration peerRetry,
+                         @Value("${urlchecker.check.max-deadline:60s}") Duration maxDeadline) {
+        this.httpClient = httpClient;
+        this.objectMapper = objectMapper;
+        this.enabled = enabled;
+        this.self = baseUrl(self);
+        this.secret = secret.getBytes(StandardCharsets.UTF_8);
+        this.peerRetryMillis = peerRetry.toMillis();
+        this.forwardDeadline = maxDeadline;
+        List<String> members = new ArrayList<>();
+        for (String peer : peers) {
+            String member = baseUrl(peer);
+            if (!member.isEmpty() && !members.contains(member)) {
+                members.add(member);
+            }
+        }
+        if (enabled) {
+            if (this.self.isEmpty()) {
+                throw new IllegalStateException("urlchecker.cluster.self must be set when cluster mode is enabled");
+            }
+            if (secret.isBlank()) {
+                throw new IllegalStateException("urlchecker.cluster.secret must be set when cluster mode is enabled");
+            }
+            if (!members.contains(this.self)) {
+                members.add(this.self);
+            }
+            for (String member : members) {
+                for (int i = 0; i < Math.max(1, virtualNodes); i++) {
+                    ring.put(hash(member + "#" + i), member);
+                }
+            }
+            log.info("Cluster mode: {} of {} peers {}", this.self, members.size(), members);
+        }
+        this.peers = List.copyOf(members);
+    }
+
+    public boolean enabled() {
+        return enabled;
+    }
+
+    /** Whether a forwarded check carrying {@code presented} in {@value #SECRET_HEADER} comes from a peer. */
+    public boolean isPeer(String presented) {
+        return enabled && presented != null
+                && MessageDigest.isEqual(secret, presented.getBytes(StandardCharsets.UTF_8));
+    }
+
+    /**
+     * Returns the base URL of the peer that owns {@code host}, or {@code null} if this
+     * instance owns it or cluster mode is off. Peers marked down are skipped.
+     */
+    public String ownerOf(String host) {
+        if (!enabled || host == null || host.isEmpty()) {
+            return null;
+        }
+        long now = System.currentTimeMillis();
+        Map.Entry<Long, String> entry = ring.ceilingEntry(hash(host.toLowerCase(Locale.ROOT)));
+        for (int i = 0; i < ring.size(); i++) {
+            if (entry == null) {
+                entry = ring.firstEntry();
+            }
+            String peer = entry.getValue();
+            if (peer.equals(self)) {
+                return null;
+            }
+            Long down = downUntil.get(peer);
+            if (down == null || now >= down) {
+                return peer;
+            }
+            entry = ring.higherEntry(entry.getKey());
+        }
+        return null;
+    }
+
+    /** Whether checks of {@code host} run on this instance. */
+    public boolean ownsLocally(String host) {
+        return ownerOf(host) == null;
+    }
+
+    /**
+     * Has {@code peer} check {@code url} and returns its result. Completes with {@code null},
+     * never exceptionally, if the peer was too busy (429), could not be reached or did not
+     * answer with a result; the caller should then check locally. Only in the last two cases
+     * is the peer skipped for a while.
+     */
+    public CompletableFuture<CheckResult> forward(String peer, String url, CacheMode mode, Priority priority) {
+        forwarded.incrementAndGet();
+        byte[] body;
+        try {
+            body = objectMapper.writeValueAsBytes(
+                    new ForwardedCheck(url, mode, forwardDeadline.toMillis(), priority));
+        } catch (JsonProcessingException e) {
+            throw new UncheckedIOException(e);
+        }
+        HttpRequest request = HttpRequest.newBuilder(URI.create(peer + CHECK_PATH))
+                .version(HttpClient.Version.HTTP_1_1)
+                .timeout(forwardDeadline.plus(FORWARD_GRACE))
+                .header("Content-Type", "application/json")
+                .header(SECRET_HEADER, new String(secret, StandardCharsets.UTF_8))
+                .POST(HttpRequest.BodyPublishers.ofByteArray(body))
+                .build();
+        return httpClient.sendAsync(request, HttpResponse.BodyHandlers.ofByteArray())
+                .thenApply(response -> {
+                    if (response.statusCode() == 429) {
+                        // The owner is up but its lane is full; our own lane already admitted the check.
+                        return null;
+                    }
+                    if (response.statusCode() != 200) {
+                        throw new UncheckedIOException(new IOException("peer answered HTTP " + response.statusCode()));
+                    }
+                    try {
+                        return objectMapper.readValue(response.body(), CheckResult.class);
+                    } catch (IOException e) {
+                        throw new UncheckedIOException(e);
+                    }
+                })
+                .handle((result, error) -> {
+                    if (error == null) {
+                        if (downUntil.remove(peer) != null) {
+                            log.info("Cluster peer {} is answering again", peer);
+                        }
+                        if (result == null) {
+                            fallbacks.incrementAndGet();
+                        }
+                        return result;
+                    }
+                    fallbacks.incrementAndGet();
+                    if (downUntil.put(peer, System.currentTimeMillis() + peerRetryMillis) == null) {
+                        log.warn("Cluster peer {} failed, checking its hosts elsewhere for {}s: {}", peer,
+                                peerRetryMillis / 1000, error.toString());
+                    }
+                    return null;
+                });
+    }
+
+    /** Counts a check a peer forwarded to this instance. */
+    public void received() {
+        received.incrementAndGet();
+    }
+
+    public Map<String, Object> stats() {
+        long now = System.currentTimeMillis();
+        Map<String, Double> shares = shares();
+        List<Map<String, Object>> members = new ArrayList<>();
+        for (String peer : peers) {
+            Long down = downUntil.get(peer);
+            Map<String, Object> member = new LinkedHashMap<>();
+            member.put("url", peer);
+            member.put("self", peer.equals(self));
+            member.put("up", down == null || now >= down);
+            member.put("share", shares.getOrDefault(peer, 0.0));
+            members.add(member);
+        }
+        return Map.of(
+                "enabled", enabled,
+                "self", self,
+                "peers", members,
+                "forwarded", forwarded.get(),
+                "received", received.get(),
+                "fallbacks", fallbacks.get()
+        );
+    }
+
+    @Override
+    public void bindTo(MeterRegistry registry) {
+        FunctionCounter.builder("urlchecker.cluster.forwarded", forwarded, AtomicLong::get)
+                .description("Checks forwarded to the peer owning their host")
+                .register(registry);
+        FunctionCounter.builder("urlchecker.cluster.received", received, AtomicLong::get)
+                .description("Checks received from peers as the owner of their host")
+                .register(registry);
+        FunctionCounter.builder("urlchecker.cluster.fallbacks", fallbacks, AtomicLong::get)
+                .description("Forwarded checks run locally because the owner could not be reached")
+                .register(registry);
+        Gauge.builder("urlchecker.cluster.peers.down", this, ClusterRouter::peersDown)
+                .description("Peers currently skipped after failing")
+                .register(registry);
+    }
+
+    private int peersDown() {
+        long now = System.currentTimeMillis();
+        return (int) downUntil.values().stream().filter(until -> now < until).count();
+    }
+
+    /** The fraction of the hash space each peer owns while all peers are up. */
+    private Map<String, Double> shares() {
+        Map<String, Double> shares = new HashMap<>();
+        if (ring.size() == 1) {
+            shares.put(ring.firstEntry().getValue(), 1.0);
+            return shares;
+        }
+        long previous = ring.isEmpty() ? 0 : ring.lastKey();
+        for (Map.Entry<Long, String> point : ring.entrySet()) {
+            // A point owns the arc since the previous point; the difference wraps around like the ring itself.
+            shares.merge(point.getValue(), unsigned(point.getKey() - previous) / 0x1p64, Double::sum);
+            previous = point.getKey();
+        }
+        return shares;
+    }
+
+    private static double unsigned(long value) {
+        return value >= 0 ? value : (value >>> 1) * 2.0 + (value & 1);
+    }
+
+    private static String baseUrl(String url) {
+        String trimmed = url.trim();
+        while (trimmed.endsWith("/")) {
+            trimmed = trimmed.substring(0, trimmed.length() - 1);
+        }
+        return trimmed.toLowerCase(Locale.ROOT);
+    }
+
+    /** The first 8 bytes of the MD5 digest: stable across JVMs and well spread, unlike {@link String#hashCode}. */
+    private static long hash(String value) {
+        MessageDigest md5;
+        try {
+            md5 = MessageDigest.getInstance("MD5");
+        } catch (NoSuchAlgorithmException e) {
+            throw new IllegalStateException(e);
+        }
+        byte[] digest = md5.digest(value.getBytes(StandardCharsets.UTF_8));
+        long hash = 0;
+        for (int i = 0; i < 8; i++) {
+            hash = (hash << 8) | (digest[i] & 0xff);
+        }
+        return hash;
+    }
+}
@@ -0,0 +1,164 @@
+package com.urlvalidator.service;
+
+import io.micrometer.core.instrument.FunctionCounter;
+import io.micrometer.core.instrument.Gauge;
+import io.micrometer.core.instrument.MeterRegistry;
+import io.micrometer.core.instrument.binder.MeterBinder;
+import org.springframework.beans.factory.annotation.Qualifier;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Component;
+
+import java.net.InetAddress;
+import java.net.UnknownHostException;
+import java.time.Duration;
+import java.util.Collection;
+import java.util.List;
+import java.util.Locale;
+import java.util.Map;
+import java.util.concurrent.CompletableFuture;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.atomic.AtomicLong;
+
+/**
+ * Resolves host names ahead of the HTTP probe so that dead domains fail without a
+ * connect attempt. Lookups run on their own thread pool, concurrent lookups of the same
+ * host share one query, and both answers and NXDOMAINs are cached.
+ *
+ * <p>The JDK resolver does not expose record TTLs, so positive and negative answers are
+ * kept for the configured {@code urlchecker.dns.positive-ttl} / {@code negative-ttl}.
+ */
+@Component
+public class DnsResolver implements MeterBinder {
+
+    private final ExecutorService executor;
+    private final boolean enabled;
+    private final long positiveTtlMillis;
+    private final long negativeTtlMillis;
+    private final int maxEntries;
+    private final Map<String, Lookup> lookups = new ConcurrentHashMap<>();
+
+    private final AtomicLong hits = new AtomicLong();
+    private final AtomicLong queries = new AtomicLong();
+    private final AtomicLong nxdomain = new AtomicLong();
+
+    public DnsResolver(@Qualifier("dnsExecutor") ExecutorService executor,
+                       @Value("${urlchecker.dns.enabled:true}") boolean enabled,
+                       @Value("${urlchecker.dns.positive-ttl:5m}") Duration positiveTtl,
+                       @Value("${urlchecker.dns.negative-ttl:1m}") Duration negativeTtl,
+                       @Value("${urlchecker.dns.max-entries:100000}") int maxEntries) {
+        this.executor = executor;
+        this.enabled = enabled;
+        this.positiveTtlMillis = positiveTtl.toMillis();
+        this.negativeTtlMillis = negativeTtl.toMillis();
+        this.maxEntries = maxEntries;
+    }
+
+    public CompletableFuture<Resolution> resolve(String host) {
+        if (!enabled) {
+            return CompletableFuture.completedFuture(Resolution.SKIPPED);
+        }
+        String key = host.toLowerCase(Locale.ROOT);
+        long now = System.currentTimeMillis();
+        Lookup lookup = lookups.get(key);
+        if (lookup != null && now < lookup.expiresAt) {
+            hits.incrementAndGet();
+            return lookup.future;
+        }
+
+        Lookup fresh = new Lookup();
+        Lookup existing = lookup == null ? lookups.putIfAbsent(key, fresh)
+                : (lookups.replace(key, lookup, fresh) ? null : lookups.get(key));
+        if (existing != null) {
+            hits.incrementAndGet();
+            return existing.future;
+        }
+
+        if (lookups.size() > maxEntries) {
+            purgeExpired(now);
+        }
+        queries.incrementAndGet();
+        CompletableFuture.supplyAsync(() -> query(key), executor).whenComplete((resolution, error) -> {
+            Resolution outcome = resolution != null ? resolution : Resolution.failed(String.valueOf(error));
+            fresh.expiresAt = System.currentTimeMillis() + (outcome.resolved() ? positiveTtlMillis : negativeTtlMillis);
+            fresh.future.complete(outcome);
+        });
+        return fresh.future;
+    }
+
+    /** Starts resolving every host in the background so later checks find the answer cached. */
+    public void prefetch(Collection<String> hosts) {
+        for (String host : hosts) {
+            if (!host.isEmpty()) {
+                resolve(host);
+            }
+        }
+    }
+
+    public Map<String, Object> stats() {
+        return Map.of(
+                "enabled", enabled,
+                "entries", lookups.size(),
+                "hits", hits.get(),
+                "queries", queries.get(),
+                "nxdomain", nxdomain.get()
+        );
+    }
+
+    @Override
+    public void bindTo(MeterRegistry registry) {
+        FunctionCounter.builder("urlchecker.dns.lookups", hits, AtomicLong::get)
+                .description("Host resolutions requested")
+                .tag("result", "cached")
+                .register(registry);
+        FunctionCounter.builder("urlchecker.dns.lookups", queries, AtomicLong::get)
+                .description("Host resolutions requested")
+                .tag("result", "queried")
+                .register(registry);
+        FunctionCounter.builder("urlchecker.dns.nxdomain", nxdomain, AtomicLong::get)
+                .description("Queries for hosts that do not exist")
+                .register(registry);
+        Gauge.builder("urlchecker.dns.entries", lookups, Map::size)
+                .description("Cached DNS answers")
+                .register(registry);
+    }
+
+    private Resolution query(String host) {
+        try {
+            return new Resolution(List.of(InetAddress.getAllByName(host)), null);
+        } catch (UnknownHostException e) {
+            nxdomain.incrementAndGet();
+            return Resolution.failed("unknown host " + host);
+        }
+    }
+
+    private void purgeExpired(long now) {
+        lookups.values().removeIf(l -> now >= l.expiresAt);
+        if (lookups.size() > maxEntries) {
+            // Still over the limit with only live entries; start over rather than grow without bound.
+            lookups.values().removeIf(l -> l.future.isDone());
+        }
+    }
+
+    private static final class Lookup {
+        final CompletableFuture<Resolution> future = new CompletableFuture<>();
+        // Stays at MAX_VALUE while the query runs, so in-flight lookups are shared, never expired.
+        volatile long expiresAt = Long.MAX_VALUE;
+    }
+
+    /**
+     * Answer for one host: the resolved addresses, or an error when the name did not resolve.
+     */
+    public record Resolution(List<InetAddress> addresses, String error) {
+
+        static final Resolution SKIPPED = new Resolution(List.of(), null);
+
+        static Resolution failed(String error) {
+            return new Resolution(List.of(), error);
+        }
+
+        public boolean resolved() {
+            return error == null;
+        }
+    }
+}
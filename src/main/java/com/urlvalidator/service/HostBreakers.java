@@ -0,0 +1,327 @@
+package com.urlvalidator.service;
+
+import io.micrometer.core.instrument.FunctionCounter;
+import io.micrometer.core.instrument.Gauge;
+import io.micrometer.core.instrument.MeterRegistry;
+import io.micrometer.core.instrument.binder.MeterBinder;
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Component;
+
+import java.time.Duration;
+import java.util.ArrayList;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Locale;
+import java.util.Map;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.atomic.AtomicLong;
+
+/**
+ * Per-host circuit breakers. Each host keeps the outcomes of its last {@code window} probes;
+ * once at least {@code min-calls} are known and the share of failures reaches
+ * {@code failure-rate}, the circuit opens and checks of the host fail straight away with
+ * {@code HOST_DOWN} instead of waiting out connect and request timeouts. After
+ * {@code open-duration} the circuit is half-open: up to {@code half-open-probes} trial checks
+ * go through, the first one that gets an answer closes the circuit, and a failed one opens it
+ * again for twice as long (at most {@code max-open-duration}).
+ *
+ * <p>Only failures that say something about the host count: connections that cannot be
+ * opened and exchanges that time out or break off without a response. Any HTTP status,
+ * even a 5xx, means the host answered.
+ */
+@Component
+public class HostBreakers implements MeterBinder {
+
+    private static final Logger log = LoggerFactory.getLogger(HostBreakers.class);
+
+    private static final int PURGE_THRESHOLD = 10_000;
+    private static final long IDLE_MILLIS = Duration.ofMinutes(10).toMillis();
+    private static final int MAX_LISTED = 100;
+
+    public enum State { CLOSED, OPEN, HALF_OPEN }
+
+    /** What a finished probe says about its host. */
+    public enum Outcome { ANSWERED, FAILED, IGNORED }
+
+    private final boolean enabled;
+    private final int window;
+    private final int minCalls;
+    private final double failureRate;
+    private final long openMillis;
+    private final long maxOpenMillis;
+    private final int halfOpenProbes;
+    private final Map<String, Circuit> circuits = new ConcurrentHashMap<>();
+
+    private final AtomicLong opened = new AtomicLong();
+    private final AtomicLong rejected = new AtomicLong();
+
+    public HostBreakers(@Value("${urlchecker.breaker.enabled:true}") boolean enabled,
+                        @Value("${urlchecker.breaker.window:20}") int window,
+                        @Value("${urlchecker.breaker.min-calls:5}") int minCalls,
+                        @Value("${urlchecker.breaker.failure-rate:0.5}") double failureRate,
+                        @Value("${urlchecker.breaker.open-duration:30s}") Duration openDuration,
+                        @Value("${urlchecker.breaker.max-open-duration:5m}") Duration maxOpenDuration,
+                        @Value("${urlchecker.breaker.half-open-probes:2}") int halfOpenProbes) {
+        this.enabled = enabled;
+        this.window = Math.max(1, window);
+        this.minCalls = Math.max(1, Math.min(minCalls, this.window));
+        this.failureRate = failureRate;
+        this.openMillis = openDuration.toMillis();
+        this.maxOpenMillis = Math.max(openMillis, maxOpenDuration.toMillis());
+        this.halfOpenProbes = Math.max(1, halfOpenProbes);
+    }
+
+    /**
+     * Admits a check of {@code host}, or returns {@code null} while its circuit is open (or
+     * half-open with all trial probes taken). The caller must {@link Call#finish finish} the
+     * returned call once the probe is over.
+     */
+    public Call tryAcquire(String host) {
+        if (!enabled) {
+            return Call.NONE;
+        }
+        String key = host.toLowerCase(Locale.ROOT);
+        long now = System.currentTimeMillis();
+        Circuit circuit = circuits.get(key);
+        if (circuit == null) {
+            if (circuits.size() >= PURGE_THRESHOLD) {
+                circuits.values().removeIf(c -> c.idle(now));
+            }
+            circuit = circuits.computeIfAbsent(key, Circuit::new);
+        }
+        Call call = circuit.tryAcquire(now);
+        if (call == null) {
+            rejected.incrementAndGet();
+        }
+        return call;
+    }
+
+    /** How long until {@code host} is probed again; zero if it is not open or its trial probes are running. */
+    public Duration retryIn(String host) {
+        Circuit circuit = circuits.get(host.toLowerCase(Locale.ROOT));
+        return circuit != null ? Duration.ofMillis(circuit.retryIn(System.currentTimeMillis())) : Duration.ZERO;
+    }
+
+    /** Forgets everything known about {@code host}, closing its circuit. Returns whether it was tracked. */
+    public boolean reset(String host) {
+        Circuit removed = circuits.remove(host.toLowerCase(Locale.ROOT));
+        if (removed != null) {
+            log.info("Circuit for {} reset", removed.host);
+        }
+        return removed != null;
+    }
+
+    /** Closes every circuit and returns how many hosts were tracked. */
+    public int resetAll() {
+        int count = circuits.size();
+        circuits.clear();
+        log.info("All {} circuits reset", count);
+        return count;
+    }
+
+    public Map<String, Object> stats() {
+        long now = System.currentTimeMillis();
+        int open = 0;
+        int halfOpen = 0;
+        List<Map<String, Object>> hosts = new ArrayList<>();
+        for (Circuit circuit : circuits.values()) {
+            Map<String, Object> snapshot = circuit.snapshot(now);
+            if (snapshot == null) {
+                continue;
+            }
+            if (snapshot.get("state") == State.OPEN) {
+                open++;
+            } else {
+                halfOpen++;
+            }
+            if (hosts.size() < MAX_LISTED) {
+                hosts.add(snapshot);
+            }
+        }
+        return Map.of(
+                "enabled", enabled,
+                "tracked", circuits.size(),
+                "open", open,
+                "halfOpen", halfOpen,
+                "opened", opened.get(),
+                "rejected", rejected.get(),
+                "hosts", hosts
+        );
+    }
+
+    @Override
+    public void bindTo(MeterRegistry registry) {
+        Gauge.builder("urlchecker.breaker.circuits", this, b -> b.count(State.OPEN))
+                .description("Hosts whose circuit is in the given state")
+                .tag("state", "open")
+                .register(registry);
+        Gauge.builder("urlchecker.breaker.circuits", this, b -> b.count(State.HALF_OPEN))
+                .description("Hosts whose circuit is in the given state")
+                .tag("state", "half_open")
+                .register(registry);
+        FunctionCounter.builder("urlchecker.breaker.opened", opened, AtomicLong::get)
+                .description("Times a host's circuit opened")
+                .register(registry);
+        FunctionCounter.builder("urlchecker.breaker.rejected", rejected, AtomicLong::get)
+                .description("Checks failed fast because their host's circuit was open")
+                .register(registry);
+    }
+
+    private int count(State state) {
+        int count = 0;
+        for (Circuit circuit : circuits.values()) {
+            if (circuit.state() == state) {
+                count++;
+            }
+        }
+        return count;
+    }
+
+    /** An admitted check; trial checks of a half-open circuit decide whether it closes. */
+    public static final class Call {
+
+        static final Call NONE = new Call(null, false);
+
+        private final Circuit circuit;
+        private final boolean trial;
+
+        private Call(Circuit circuit, boolean trial) {
+            this.circuit = circuit;
+            this.trial = trial;
+        }
+
+        public void finish(Outcome outcome) {
+            if (circuit != null) {
+                circuit.finish(trial, outcome, System.currentTimeMillis());
+            }
+        }
+    }
+
+    private final class Circuit {
+
+        private final String host;
+        // Ring of the most recent outcomes, true for a failure.
+        private final boolean[] outcomes = new boolean[window];
+        private int count;
+        private int next;
+        private int failures;
+        private long lastOutcomeAt;
+        private State state = State.CLOSED;
+        private long openUntil;
+        private long openDuration = openMillis;
+        private int trials;
+        private volatile long updatedAt = System.currentTimeMillis();
+
+        Circuit(String host) {
+            this.host = host;
+        }
+
+        synchronized Call tryAcquire(long now) {
+            updatedAt = now;
+            if (state == State.OPEN) {
+                if (now < openUntil) {
+                    return null;
+                }
+                state = State.HALF_OPEN;
+                trials = 0;
+            }
+            if (state == State.HALF_OPEN) {
+                if (trials >= halfOpenProbes) {
+                    return null;
+                }
+                trials++;
+                return new Call(this, true);
+            }
+            return new Call(this, false);
+        }
+
+        synchronized void finish(boolean trial, Outcome outcome, long now) {
+            updatedAt = now;
+            if (trial) {
+                // Another trial may already have decided.
+                if (state != State.HALF_OPEN) {
+                    return;
+                }
+                trials--;
+                if (outcome == Outcome.ANSWERED) {
+                    close();
+                } else if (outcome == Outcome.FAILED) {
+                    open(now, Math.min(maxOpenMillis, openDuration * 2));
+                }
+                return;
+            }
+            // Checks admitted before the circuit opened say nothing new once it has.
+            if (state != State.CLOSED || outcome == Outcome.IGNORED) {
+                return;
+            }
+            if (now - lastOutcomeAt > IDLE_MILLIS) {
+                clear();
+            }
+            lastOutcomeAt = now;
+            boolean failed = outcome == Outcome.FAILED;
+            if (count == window) {
+                if (outcomes[next]) {
+                    failures--;
+                }
+            } else {
+                count++;
+            }
+            outcomes[next] = failed;
+            next = (next + 1) % window;
+            if (failed) {
+                failures++;
+                if (count >= minCalls && failures >= failureRate * count) {
+                    open(now, openMillis);
+                }
+            }
+        }
+
+        private void open(long now, long duration) {
+            state = State.OPEN;
+            openDuration = duration;
+            openUntil = now + duration;
+            opened.incrementAndGet();
+            log.info("Circuit for {} opened for {}s", host, duration / 1000);
+        }
+
+        private void close() {
+            state = State.CLOSED;
+            openDuration = openMillis;
+            clear();
+            log.info("Circuit for {} closed", host);
+        }
+
+        private void clear() {
+            count = 0;
+            next = 0;
+            failures = 0;
+        }
+
+        synchronized long retryIn(long now) {
+            return state == State.OPEN ? Math.max(0, openUntil - now) : 0;
+        }
+
+        synchronized State state() {
+            return state;
+        }
+
+        /** Returns the host's state for the stats, or {@code null} while its circuit is closed. */
+        synchronized Map<String, Object> snapshot(long now) {
+            if (state == State.CLOSED) {
+                return null;
+            }
+            Map<String, Object> snapshot = new LinkedHashMap<>();
+            snapshot.put("host", host);
+            snapshot.put("state", state);
+            snapshot.put("retryInSeconds", state == State.OPEN ? Math.max(0, openUntil - now) / 1000 : 0);
+            snapshot.put("openSeconds", openDuration / 1000);
+            return snapshot;
+        }
+
+        boolean idle(long now) {
+            return state() == State.CLOSED && now - updatedAt > IDLE_MILLIS;
+        }
+    }
+}
@@ -0,0 +1,116 @@
+package com.urlvalidator.service;
+
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Component;
+
+import java.time.Duration;
+import java.util.Arrays;
+import java.util.Locale;
+import java.util.Map;
+import java.util.concurrent.ConcurrentHashMap;
+
+/**
+ * Recent first-byte latencies per host, used to size request timeouts and hedge delays.
+ * A host that usually answers in 200 ms gets a timeout of a few multiples of that instead
+ * of the full default, so a stalled connection is given up on quickly.
+ */
+@Component
+public class HostLatencies {
+
+    private static final int WINDOW = 64;
+    private static final int MIN_SAMPLES = 8;
+    private static final int PURGE_THRESHOLD = 10_000;
+    private static final long IDLE_MILLIS = Duration.ofMinutes(10).toMillis();
+
+    private final boolean adaptive;
+    private final Duration defaultTimeout;
+    private final Duration minTimeout;
+    private final double multiplier;
+    private final Map<String, Window> windows = new ConcurrentHashMap<>();
+
+    public HostLatencies(@Value("${urlchecker.timeouts.adaptive:true}") boolean adaptive,
+                         @Value("${urlchecker.timeouts.default:10s}") Duration defaultTimeout,
+                         @Value("${urlchecker.timeouts.min:2s}") Duration minTimeout,
+                         @Value("${urlchecker.timeouts.multiplier:3.0}") double multiplier) {
+        this.adaptive = adaptive;
+        this.defaultTimeout = defaultTimeout;
+        this.minTimeout = minTimeout;
+        this.multiplier = multiplier;
+    }
+
+    public void record(String host, long millis) {
+        if (!adaptive) {
+            return;
+        }
+        String key = host.toLowerCase(Locale.ROOT);
+        Window window = windows.get(key);
+        if (window == null) {
+            if (windows.size() >= PURGE_THRESHOLD) {
+                long now = System.currentTimeMillis();
+                windows.values().removeIf(w -> now - w.updatedAt > IDLE_MILLIS);
+            }
+            window = windows.computeIfAbsent(key, k -> new Window());
+        }
+        window.add(millis);
+    }
+
+    /**
+     * Records a request to {@code host} that got no first byte within {@code timeout}. The
+     * latency is only known to exceed the timeout, so the timeout itself is recorded: without
+     * it a host that slowed down past its timeout would time out on every attempt and never
+     * add the samples that widen the timeout again.
+     */
+    public void timedOut(String host, Duration timeout) {
+        record(host, timeout.toMillis());
+    }
+
+    /**
+     * Request timeout for {@code host}: {@code multiplier} times its p99 first-byte latency,
+     * kept between {@code urlchecker.timeouts.min} and {@code urlchecker.timeouts.default}.
+     * Hosts with too few samples get the default.
+     */
+    public Duration timeoutFor(String host) {
+        Long p99 = percentile(host, 0.99);
+        if (p99 == null) {
+            return defaultTimeout;
+        }
+        Duration scaled = Duration.ofMillis((long) (p99 * multiplier));
+        if (scaled.compareTo(minTimeout) < 0) {
+            return minTimeout;
+        }
+        return scaled.compareTo(defaultTimeout) > 0 ? defaultTimeout : scaled;
+    }
+
+    /** Returns the given percentile of recent latencies in milliseconds, or {@code null} if too few are known. */
+    public Long percentile(String host, double percentile) {
+        if (!adaptive) {
+            return null;
+        }
+        Window window = windows.get(host.toLowerCase(Locale.ROOT));
+        return window != null ? window.percentile(percentile) : null;
+    }
+
+    private static final class Window {
+
+        private final long[] samples = new long[WINDOW];
+        private int count;
+        private int next;
+        private volatile long updatedAt = System.currentTimeMillis();
+
+        synchronized void add(long millis) {
+            samples[next] = millis;
+            next = (next + 1) % WINDOW;
+            count = Math.min(count + 1, WINDOW);
+            updatedAt = System.currentTimeMillis();
+        }
+
+        synchronized Long percentile(double percentile) {
+            if (count < MIN_SAMPLES) {
+                return null;
+            }
+            long[] sorted = Arrays.copyOf(samples, count);
+            Arrays.sort(sorted);
+            return sorted[Math.min(count - 1, (int) Math.ceil(percentile * count) - 1)];
+        }
+    }
+}
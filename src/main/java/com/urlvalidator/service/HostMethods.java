@@ -0,0 +1,71 @@
+package com.urlvalidator.service;
+
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Component;
+
+import java.time.Duration;
+import java.util.Locale;
+import java.util.Map;
+import java.util.concurrent.ConcurrentHashMap;
+
+/**
+ * Remembers hosts whose HEAD requests fail while GET works, so later checks of those hosts
+ * go straight to GET instead of spending a round trip on a HEAD that is known to fail.
+ * Entries expire after {@code urlchecker.fallback.memory-ttl} so a fixed server is noticed.
+ */
+@Component
+public class HostMethods {
+
+    private final boolean enabled;
+    private final long ttlMillis;
+    private final int maxEntries;
+    private final Map<String, Long> headFailsUntil = new ConcurrentHashMap<>();
+
+    public HostMethods(@Value("${urlchecker.fallback.memory-enabled:true}") boolean enabled,
+                       @Value("${urlchecker.fallback.memory-ttl:1h}") Duration ttl,
+                       @Value("${urlchecker.fallback.memory-max-entries:100000}") int maxEntries) {
+        this.enabled = enabled;
+        this.ttlMillis = ttl.toMillis();
+        this.maxEntries = maxEntries;
+    }
+
+    /** Returns {@code true} if HEAD recently failed for {@code host} while GET succeeded. */
+    public boolean skipHead(String host) {
+        if (!enabled) {
+            return false;
+        }
+        String key = host.toLowerCase(Locale.ROOT);
+        Long until = headFailsUntil.get(key);
+        if (until == null) {
+            return false;
+        }
+        if (System.currentTimeMillis() >= until) {
+            headFailsUntil.remove(key, until);
+            return false;
+        }
+        return true;
+    }
+
+    public void headFailed(String host) {
+        if (!enabled) {
+            return;
+        }
+        long now = System.currentTimeMillis();
+        if (headFailsUntil.size() >= maxEntries) {
+            headFailsUntil.values().removeIf(until -> now >= until);
+            if (headFailsUntil.size() >= maxEntries) {
+                return;
+            }
+        }
+        headFailsUntil.put(host.toLowerCase(Locale.ROOT), now + ttlMillis);
+    }
+
+    /** Forgets {@code host}, for example because GET stopped working too. */
+    public void forget(String host) {
+        headFailsUntil.remove(host.toLowerCase(Locale.ROOT));
+    }
+
+    public int size() {
+        return headFailsUntil.size();
+    }
+}
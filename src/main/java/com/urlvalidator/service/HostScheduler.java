@@ -0,0 +1,516 @@
+package com.urlvalidator.service;
+
+import com.urlvalidator.model.Priority;
+import io.micrometer.core.instrument.FunctionCounter;
+import io.micrometer.core.instrument.Gauge;
+import io.micrometer.core.instrument.MeterRegistry;
+import io.micrometer.core.instrument.binder.MeterBinder;
+import org.springframework.beans.factory.annotation.Qualifier;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Component;
+
+import java.time.Duration;
+import java.util.ArrayDeque;
+import java.util.ArrayList;
+import java.util.Deque;
+import java.util.EnumMap;
+import java.util.EnumSet;
+import java.util.HashMap;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Locale;
+import java.util.Map;
+import java.util.Set;
+import java.util.concurrent.CompletableFuture;
+import java.util.concurrent.ScheduledExecutorService;
+import java.util.concurrent.ScheduledFuture;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicBoolean;
+import java.util.concurrent.atomic.AtomicLong;
+
+/**
+ * Politeness scheduler for outbound requests. Every HTTP exchange takes a permit first;
+ * permits are limited by a per-host token bucket, a per-host concurrency cap and a global
+ * concurrency budget. Waiting requests are granted round-robin across hosts, so one large
+ * domain cannot starve the others, and a host that sent {@code Retry-After} gets no
+ * requests until that time has passed.
+ *
+ * <p>Requests wait in one lane per {@link Priority}. Whenever a permit is free, the lanes with
+ * eligible requests share it by weight (stride scheduling), so interactive checks get through
+ * while a large batch is queued, and bulk work still progresses when interactive traffic is
+ * heavy. Each lane has a queue bound that entry points consult through {@link #admit} to turn
+ * requests away with a retry hint instead of letting the queue grow.
+ */
+@Component
+public class HostScheduler implements MeterBinder {
+
+    private static final int PURGE_THRESHOLD = 10_000;
+
+    private final ScheduledExecutorService timer;
+    private final boolean enabled;
+    private final int maxConcurrency;
+    private final int perHostConcurrency;
+    private final double perHostRate;
+    private final int perHostBurst;
+    private final long maxBackOffNanos;
+    private final Duration maxRetryAfter;
+
+    private final Map<String, HostState> hosts = new HashMap<>();
+    private final Map<Priority, Lane> lanes = new EnumMap<>(Priority.class);
+    // Pass of the lane served last; a lane that starts waiting again begins here, so idle time earns no credit.
+    private double virtualTime;
+    private int active;
+    private int waiting;
+    private ScheduledFuture<?> wakeup;
+    private long wakeupAt;
+
+    private final AtomicLong backOffs = new AtomicLong();
+
+    public HostScheduler(@Qualifier("checkScheduler") ScheduledExecutorService timer,
+                         @Value("${urlchecker.politeness.enabled:true}") boolean enabled,
+                         @Value("${urlchecker.politeness.max-concurrency:256}") int maxConcurrency,
+                         @Value("${urlchecker.politeness.per-host-concurrency:4}") int perHostConcurrency,
+                         @Value("${urlchecker.politeness.per-host-rate:5}") double perHostRate,
+                         @Value("${urlchecker.politeness.per-host-burst:10}") int perHostBurst,
+                         @Value("${urlchecker.politeness.max-back-off:5m}") Duration maxBackOff,
+                         @Value("${urlchecker.lanes.interactive.weight:8}") int interactiveWeight,
+                         @Value("${urlchecker.lanes.interactive.max-queued:200}") int interactiveMaxQueued,
+                         @Value("${urlchecker.lanes.bulk.weight:2}") int bulkWeight,
+                         @Value("${urlchecker.lanes.bulk.max-queued:5000}") int bulkMaxQueued,
+                         @Value("${urlchecker.lanes.background.weight:1}") int backgroundWeight,
+                         @Value("${urlchecker.lanes.background.max-queued:5000}") int backgroundMaxQueued,
+                         @Value("${urlchecker.lanes.max-retry-after:60s}") Duration maxRetryAfter) {
+        this.timer = timer;
+        this.enabled = enabled;
+        this.maxConcurrency = Math.max(1, maxConcurrency);
+        this.perHostConcurrency = Math.max(1, perHostConcurrency);
+        this.perHostRate = perHostRate;
+        this.perHostBurst = Math.max(1, perHostBurst);
+        this.maxBackOffNanos = maxBackOff.toNanos();
+        this.maxRetryAfter = maxRetryAfter;
+        lanes.put(Priority.INTERACTIVE, new Lane(Priority.INTERACTIVE, interactiveWeight, interactiveMaxQueued));
+        lanes.put(Priority.BULK, new Lane(Priority.BULK, bulkWeight, bulkMaxQueued));
+        lanes.put(Priority.BACKGROUND, new Lane(Priority.BACKGROUND, backgroundWeight, backgroundMaxQueued));
+    }
+
+    /**
+     * Returns a future that completes with a permit once a request to {@code host} may be
+     * sent from {@code priority}'s lane. The caller must {@link Permit#release() release} the
+     * permit when the exchange ends. If the future is completed by someone else first (for
+     * example by a timeout), no permit is consumed.
+     */
+    public CompletableFuture<Permit> acquire(String host, Priority priority) {
+        if (!enabled) {
+            return CompletableFuture.completedFuture(Permit.NONE);
+        }
+        CompletableFuture<Permit> waiter = new CompletableFuture<>();
+        String key = host.toLowerCase(Locale.ROOT);
+        List<Grant> grants;
+        synchronized (this) {
+            HostState state = hosts.get(key);
+            if (state == null) {
+                if (hosts.size() >= PURGE_THRESHOLD) {
+                    purgeIdle(System.nanoTime());
+                }
+                state = new HostState();
+                hosts.put(key, state);
+            }
+            Lane lane = lanes.get(priority);
+            Deque<CompletableFuture<Permit>> waiters = state.waiters(priority);
+            if (lane.waiting == 0) {
+                lane.pass = Math.max(lane.pass, virtualTime);
+            }
+            if (waiters.isEmpty()) {
+                lane.hostOrder.addLast(key);
+            }
+            waiters.addLast(waiter);
+            lane.waiting++;
+            waiting++;
+            grants = drain();
+        }
+        complete(grants);
+        // A waiter that times out or is cancelled leaves its queue at once, so it no longer counts against admit().
+        waiter.whenComplete((permit, error) -> {
+            if (error != null) {
+                abandon(key, priority, waiter);
+            }
+        });
+        return waiter;
+    }
+
+    /**
+     * Whether new work may join {@code priority}'s lane, i.e. fewer than its
+     * {@code max-queued} requests are waiting. A refusal is counted; the caller should
+     * turn the work away and suggest {@link #retryAfter} as the time to come back.
+     */
+    public boolean admit(Priority priority) {
+        if (!enabled) {
+            return true;
+        }
+        synchronized (this) {
+            Lane lane = lanes.get(priority);
+            if (lane.waiting < lane.maxQueued) {
+                return true;
+            }
+            lane.rejected++;
+            return false;
+        }
+    }
+
+    /**
+     * How long until {@code priority}'s queue has likely drained: the requests waiting in it
+     * divided by the rate the lane was granted permits in the last second, between one second
+     * and {@code urlchecker.lanes.max-retry-after}.
+     */
+    public Duration retryAfter(Priority priority) {
+        long seconds;
+        synchronized (this) {
+            Lane lane = lanes.get(priority);
+            seconds = (long) Math.ceil(lane.waiting / Math.max(1.0, lane.rate(System.nanoTime())));
+        }
+        Duration wait = Duration.ofSeconds(Math.max(1, seconds));
+        return wait.compareTo(maxRetryAfter) > 0 ? maxRetryAfter : wait;
+    }
+
+    /**
+     * Stops sending requests to {@code host} for {@code delay}, as asked by a
+     * {@code Retry-After} header. The delay is capped at {@code urlchecker.politeness.max-back-off}.
+     */
+    public void backOff(String host, Duration delay) {
+        if (!enabled) {
+            return;
+        }
+        backOffs.incrementAndGet();
+        long until = System.nanoTime() + Math.min(delay.toNanos(), maxBackOffNanos);
+        synchronized (this) {
+            HostState state = hosts.get(host.toLowerCase(Locale.ROOT));
+            if (state != null && until > state.blockedUntil) {
+                state.blockedUntil = until;
+            }
+        }
+    }
+
+    public synchronized Map<String, Object> stats() {
+        Map<String, Object> byLane = new LinkedHashMap<>();
+        for (Lane lane : lanes.values()) {
+            byLane.put(lane.priority.key(), Map.of(
+                    "weight", lane.weight,
+                    "active", lane.active,
+                    "waiting", lane.waiting,
+                    "maxQueued", lane.maxQueued,
+                    "granted", lane.granted,
+                    "rejected", lane.rejected
+            ));
+        }
+        return Map.of(
+                "enabled", enabled,
+                "active", active,
+                "waiting", waiting,
+                "hosts", hosts.size(),
+                "backOffs", backOffs.get(),
+                "lanes", byLane
+        );
+    }
+
+    @Override
+    public void bindTo(MeterRegistry registry) {
+        Gauge.builder("urlchecker.politeness.active", this, s -> s.count(true))
+                .description("Outbound requests holding a permit")
+                .register(registry);
+        Gauge.builder("urlchecker.politeness.waiting", this, s -> s.count(false))
+                .description("Outbound requests waiting for a permit")
+                .register(registry);
+        FunctionCounter.builder("urlchecker.politeness.back.offs", backOffs, AtomicLong::get)
+                .description("Retry-After responses that paused a host")
+                .register(registry);
+        for (Priority priority : Priority.values()) {
+            Lane lane = lanes.get(priority);
+            Gauge.builder("urlchecker.lanes.active", this, s -> s.laneCount(lane, true))
+                    .tag("lane", priority.key())
+                    .description("Outbound requests holding a permit, by lane")
+                    .register(registry);
+            Gauge.builder("urlchecker.lanes.waiting", this, s -> s.laneCount(lane, false))
+                    .tag("lane", priority.key())
+                    .description("Outbound requests waiting for a permit, by lane")
+                    .register(registry);
+            FunctionCounter.builder("urlchecker.lanes.rejected", this, s -> s.rejected(lane))
+                    .tag("lane", priority.key())
+                    .description("Requests turned away because the lane's queue was full")
+                    .register(registry);
+        }
+    }
+
+    private synchronized int count(boolean activeOnly) {
+        return activeOnly ? active : waiting;
+    }
+
+    private synchronized int laneCount(Lane lane, boolean activeOnly) {
+        return activeOnly ? lane.active : lane.waiting;
+    }
+
+    private synchronized long rejected(Lane lane) {
+        return lane.rejected;
+    }
+
+    private void release(HostState state, Lane lane) {
+        List<Grant> grants;
+        synchronized (this) {
+            active--;
+            state.active--;
+            lane.active--;
+            grants = drain();
+        }
+        complete(grants);
+    }
+
+    /**
+     * Hands out permits until the global budget is used up or every waiting host is held back
+     * by its bucket, cap or back-off. Each permit goes to the lane with the lowest pass among
+     * those that can use it, and within the lane to the next eligible host in round-robin
+     * order. Schedules a wakeup for the earliest time a held-back host becomes eligible.
+     */
+    private List<Grant> drain() {
+        List<Grant> grants = new ArrayList<>();
+        long now = System.nanoTime();
+        long nextWake = Long.MAX_VALUE;
+        // Lanes whose waiting hosts are all held back; they are passed over for the rest of this drain.
+        Set<Priority> stalled = EnumSet.noneOf(Priority.class);
+        while (active < maxConcurrency) {
+            Lane lane = nextLane(stalled);
+            if (lane == null) {
+                break;
+            }
+            Grant grant = grantFrom(lane, now);
+            if (grant == null) {
+                stalled.add(lane.priority);
+                nextWake = Math.min(nextWake, lane.heldUntil);
+                continue;
+            }
+            grants.add(grant);
+        }
+        if (nextWake != Long.MAX_VALUE) {
+            scheduleWakeup(now, nextWake);
+        }
+        return grants;
+    }
+
+    private Lane nextLane(Set<Priority> stalled) {
+        Lane next = null;
+        for (Lane lane : lanes.values()) {
+            if (lane.waiting > 0 && !stalled.contains(lane.priority) && (next == null || lane.pass < next.pass)) {
+                next = lane;
+            }
+        }
+        return next;
+    }
+
+    /**
+     * Grants a permit to the first eligible host in {@code lane}'s round-robin order, or
+     * returns {@code null} and records in {@code lane.heldUntil} when the earliest held-back
+     * host becomes eligible.
+     */
+    private Grant grantFrom(Lane lane, long now) {
+        lane.heldUntil = Long.MAX_VALUE;
+        int skipped = 0;
+        while (skipped < lane.hostOrder.size()) {
+            String key = lane.hostOrder.pollFirst();
+            HostState state = hosts.get(key);
+            Deque<CompletableFuture<Permit>> waiters = state.waiters(lane.priority);
+            dropAbandoned(lane, waiters);
+            if (waiters.isEmpty()) {
+                continue;
+            }
+            long readyAt = state.readyAt(now);
+            if (readyAt > now) {
+                lane.hostOrder.addLast(key);
+                skipped++;
+                lane.heldUntil = Math.min(lane.heldUntil, readyAt);
+                continue;
+            }
+            state.take();
+            active++;
+            waiting--;
+            lane.granted(now);
+            virtualTime = lane.pass;
+            lane.pass += 1.0 / lane.weight;
+            Grant grant = new Grant(waiters.pollFirst(), new Permit(this, state, lane));
+            if (!waiters.isEmpty()) {
+                lane.hostOrder.addLast(key);
+            }
+            return grant;
+        }
+        return null;
+    }
+
+    private synchronized void abandon(String key, Priority priority, CompletableFuture<Permit> waiter) {
+        HostState state = hosts.get(key);
+        if (state == null) {
+            return;
+        }
+        Deque<CompletableFuture<Permit>> waiters = state.waiters(priority);
+        if (!waiters.remove(waiter)) {
+            return;
+        }
+        Lane lane = lanes.get(priority);
+        lane.waiting--;
+        waiting--;
+        if (waiters.isEmpty()) {
+            lane.hostOrder.remove(key);
+        }
+    }
+
+    // Waiters completed some other way than exceptionally are only found once they reach the head of their queue.
+    private void dropAbandoned(Lane lane, Deque<CompletableFuture<Permit>> waiters) {
+        while (!waiters.isEmpty() && waiters.peekFirst().isDone()) {
+            waiters.pollFirst();
+            lane.waiting--;
+            waiting--;
+        }
+    }
+
+    private void scheduleWakeup(long now, long at) {
+        if (wakeup != null && !wakeup.isDone() && wakeupAt <= at) {
+            return;
+        }
+        if (wakeup != null) {
+            wakeup.cancel(false);
+        }
+        wakeupAt = at;
+        wakeup = timer.schedule(() -> {
+            List<Grant> grants;
+            synchronized (this) {
+                grants = drain();
+            }
+            complete(grants);
+        }, at - now, TimeUnit.NANOSECONDS);
+    }
+
+    // Completed outside the lock: the waiter's continuation starts the HTTP exchange inline.
+    private static void complete(List<Grant> grants) {
+        for (Grant grant : grants) {
+            if (!grant.waiter.complete(grant.permit)) {
+                grant.permit.release();
+            }
+        }
+    }
+
+    private void purgeIdle(long now) {
+        hosts.values().removeIf(state -> state.active == 0 && state.idle() && now >= state.blockedUntil);
+    }
+
+    private record Grant(CompletableFuture<Permit> waiter, Permit permit) {
+    }
+
+    /** One priority lane: its weight, queue bound, hosts with waiting requests and counters. Guarded by the scheduler. */
+    private static final class Lane {
+
+        private static final long RATE_WINDOW_NANOS = TimeUnit.SECONDS.toNanos(1);
+
+        final Priority priority;
+        final int weight;
+        final int maxQueued;
+        // Hosts with requests waiting in this lane, in the order they will be offered the lane's next permit.
+        final Deque<String> hostOrder = new ArrayDeque<>();
+        double pass;
+        long heldUntil;
+        int active;
+        int waiting;
+        long granted;
+        long rejected;
+        long windowStart = System.nanoTime();
+        int windowGrants;
+        double lastRate;
+
+        Lane(Priority priority, int weight, int maxQueued) {
+            this.priority = priority;
+            this.weight = Math.max(1, weight);
+            this.maxQueued = Math.max(1, maxQueued);
+        }
+
+        void granted(long now) {
+            active++;
+            waiting--;
+            granted++;
+            rate(now);
+            windowGrants++;
+        }
+
+        /** Permits granted per second over the last complete window. */
+        double rate(long now) {
+            long elapsed = now - windowStart;
+            if (elapsed >= RATE_WINDOW_NANOS) {
+                lastRate = elapsed >= 2 * RATE_WINDOW_NANOS ? 0 : windowGrants * 1e9 / elapsed;
+                windowStart = now;
+                windowGrants = 0;
+            }
+            return lastRate;
+        }
+    }
+
+    /** Per-host bucket, concurrency count, back-off and per-lane queues. Guarded by the scheduler. */
+    private final class HostState {
+
+        private final Map<Priority, Deque<CompletableFuture<Permit>>> waiters = new EnumMap<>(Priority.class);
+        double tokens = perHostBurst;
+        long refilledAt = System.nanoTime();
+        long blockedUntil = Long.MIN_VALUE;
+        int active;
+
+        /**
+         * Returns {@code now} if a request may start, the time it may start if only the bucket
+         * or a back-off is in the way, or {@code Long.MAX_VALUE} if the host is at its cap.
+         */
+        long readyAt(long now) {
+            if (active >= perHostConcurrency) {
+                return Long.MAX_VALUE;
+            }
+            if (now < blockedUntil) {
+                return blockedUntil;
+            }
+            if (perHostRate <= 0) {
+                return now;
+            }
+            tokens = Math.min(perHostBurst, tokens + (now - refilledAt) * perHostRate / 1e9);
+            refilledAt = now;
+            return tokens >= 1 ? now : now + (long) ((1 - tokens) / perHostRate * 1e9);
+        }
+
+        void take() {
+            active++;
+            if (perHostRate > 0) {
+                tokens -= 1;
+            }
+        }
+
+        Deque<CompletableFuture<Permit>> waiters(Priority priority) {
+            return waiters.computeIfAbsent(priority, p -> new ArrayDeque<>());
+        }
+
+        boolean idle() {
+            return waiters.values().stream().allMatch(Deque::isEmpty);
+        }
+    }
+
+    /** Permission to send one request; releasing it more than once has no effect. */
+    public static final class Permit {
+
+        static final Permit NONE = new Permit(null, null, null);
+
+        private final HostScheduler scheduler;
+        private final HostState state;
+        private final Lane lane;
+        private final AtomicBoolean released = new AtomicBoolean();
+
+        private Permit(HostScheduler scheduler, HostState state, Lane lane) {
+            this.scheduler = scheduler;
+            this.state = state;
+            this.lane = lane;
+        }
+
+        public void release() {
+            if (scheduler != null && released.compareAndSet(false, true)) {
+                scheduler.release(state, lane);
+            }
+        }
+    }
+}
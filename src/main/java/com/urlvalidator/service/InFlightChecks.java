@@ -0,0 +1,74 @@
+package com.urlvalidator.service;
+
+import com.urlvalidator.model.CheckResult;
+import io.micrometer.core.instrument.FunctionCounter;
+import io.micrometer.core.instrument.Gauge;
+import io.micrometer.core.instrument.MeterRegistry;
+import io.micrometer.core.instrument.binder.MeterBinder;
+import org.springframework.stereotype.Component;
+
+import java.util.Map;
+import java.util.concurrent.CompletableFuture;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.atomic.AtomicLong;
+import java.util.function.Supplier;
+
+/**
+ * Coalesces concurrent checks of the same normalized URL: the first caller runs the
+ * probe and everyone who asks for the same key while it is running shares its result.
+ */
+@Component
+public class InFlightChecks implements MeterBinder {
+
+    private final Map<String, CompletableFuture<CheckResult>> inFlight = new ConcurrentHashMap<>();
+    private final AtomicLong leaders = new AtomicLong();
+    private final AtomicLong coalesced = new AtomicLong();
+
+    /**
+     * Returns the in-flight check for {@code key} if there is one, otherwise starts
+     * {@code probe} and publishes it for other callers until it completes.
+     */
+    public CompletableFuture<CheckResult> execute(String key, Supplier<CompletableFuture<CheckResult>> probe) {
+        CompletableFuture<CheckResult> shared = new CompletableFuture<>();
+        CompletableFuture<CheckResult> existing = inFlight.putIfAbsent(key, shared);
+        if (existing != null) {
+            coalesced.incrementAndGet();
+            return existing;
+        }
+
+        leaders.incrementAndGet();
+        CompletableFuture<CheckResult> running;
+        try {
+            running = probe.get();
+        } catch (RuntimeException e) {
+            running = CompletableFuture.failedFuture(e);
+        }
+        running.whenComplete((result, error) -> {
+            inFlight.remove(key, shared);
+            if (error != null) {
+                shared.completeExceptionally(error);
+            } else {
+                shared.complete(result);
+            }
+        });
+        return shared;
+    }
+
+    public Map<String, Object> stats() {
+        return Map.of(
+                "inFlight", inFlight.size(),
+                "probes", leaders.get(),
+                "coalesced", coalesced.get()
+        );
+    }
+
+    @Override
+    public void bindTo(MeterRegistry registry) {
+        Gauge.builder("urlchecker.coalescing.in.flight", inFlight, Map::size)
+                .description("Distinct URLs with a probe running")
+                .register(registry);
+        FunctionCounter.builder("urlchecker.coalescing.coalesced", coalesced, AtomicLong::get)
+                .description("Checks that joined a probe already in flight")
+                .register(registry);
+    }
+}
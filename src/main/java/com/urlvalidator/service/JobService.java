@@ -0,0 +1,843 @@
+package com.urlvalidator.service;
+
+import com.fasterxml.jackson.databind.ObjectMapper;
+import com.urlvalidator.model.CacheMode;
+import com.urlvalidator.model.CheckResult;
+import com.urlvalidator.model.FailureClass;
+import com.urlvalidator.model.JobOptions;
+import com.urlvalidator.model.JobState;
+import com.urlvalidator.model.JobStatus;
+import com.urlvalidator.model.Priority;
+import jakarta.annotation.PostConstruct;
+import jakarta.annotation.PreDestroy;
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+import org.springframework.beans.factory.annotation.Qualifier;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Service;
+import org.springframework.util.unit.DataSize;
+
+import java.io.BufferedReader;
+import java.io.BufferedWriter;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.InputStreamReader;
+import java.io.OutputStream;
+import java.nio.ByteBuffer;
+import java.nio.channels.FileChannel;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.DirectoryStream;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.StandardCopyOption;
+import java.nio.file.StandardOpenOption;
+import java.time.Duration;
+import java.util.ArrayDeque;
+import java.util.ArrayList;
+import java.util.Comparator;
+import java.util.Deque;
+import java.util.HashMap;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Locale;
+import java.util.Map;
+import java.util.UUID;
+import java.util.concurrent.ExecutorService;
+import java.util.stream.Stream;
+
+/**
+ * Bulk validation jobs: an uploaded CSV or text file of URLs is checked row by row and the
+ * results are written to a CSV file that can be downloaded while the job runs and after.
+ *
+ * <p>Each job lives in its own directory under {@code urlchecker.jobs.dir}: the uploaded
+ * file, the results and a {@code job.json} with its state. The file is read as a stream;
+ * only a window of {@code urlchecker.jobs.window} URLs waits in memory, dispatched
+ * round-robin across hosts like a batch. Duplicates are detected on the normalized URL
+ * through a set of 64-bit fingerprints, so a file with millions of rows needs a few bytes
+ * per distinct URL rather than the URLs themselves; results list each distinct URL once, in
+ * the order the checks finished.
+ *
+ * <p>Jobs that were queued or running when the process stopped are resumed on startup: the
+ * results file is cut back to its last complete row, the URLs already in it are skipped and
+ * the rest of the file is checked.
+ */
+@Service
+public class JobService {
+
+    private static final Logger log = LoggerFactory.getLogger(JobService.class);
+
+    private static final String INPUT = "input";
+    private static final String RESULTS = "results.csv";
+    private static final String STATUS = "job.json";
+    private static final String RESULTS_HEADER = "url,reachable,status,method,failure,error,total_ms";
+    private static final int FLUSH_EVERY = 500;
+
+    private final UrlCheckService checkService;
+    private final UrlNormalizer normalizer;
+    private final ObjectMapper objectMapper;
+    private final ExecutorService executor;
+    private final Path root;
+    private final DataSize maxUploadSize;
+    private final int maxJobs;
+    private final int window;
+    private final int defaultConcurrency;
+    private final int maxConcurrency;
+    private final int perHostConcurrency;
+
+    private final Map<String, Job> jobs = new LinkedHashMap<>();
+
+    public JobService(UrlCheckService checkService, UrlNormalizer normalizer, ObjectMapper objectMapper,
+                      @Qualifier("jobExecutor") ExecutorService executor,
+                      @Value("${urlchecker.jobs.dir:data/jobs}") String dir,
+                      @Value("${urlchecker.jobs.max-upload-size:2GB}") DataSize maxUploadSize,
+                      @Value("${urlchecker.jobs.max-jobs:100}") int maxJobs,
+                      @Value("${urlchecker.jobs.window:10000}") int window,
+                      @Value("${urlchecker.jobs.default-concurrency:32}") int defaultConcurrency,
+                      @Value("${urlchecker.jobs.max-concurrency:64}") int maxConcurrency,
+                      @Value("${urlchecker.jobs.per-host-concurrency:2}") int perHostConcurrency) {
+        this.checkService = checkService;
+        this.normalizer = normalizer;
+        this.objectMapper = objectMapper;
+        this.executor = executor;
+        this.root = Path.of(dir);
+        this.maxUploadSize = maxUploadSize;
+        this.maxJobs = maxJobs;
+        this.window = Math.max(1, window);
+        this.defaultConcurrency = defaultConcurrency;
+        this.maxConcurrency = maxConcurrency;
+        this.perHostConcurrency = Math.max(1, perHostConcurrency);
+    }
+
+    @PostConstruct
+    void resume() {
+        if (!Files.isDirectory(root)) {
+            return;
+        }
+        List<JobStatus> found = new ArrayList<>();
+        try (DirectoryStream<Path> dirs = Files.newDirectoryStream(root)) {
+            for (Path dir : dirs) {
+                Path status = dir.resolve(STATUS);
+                if (Files.exists(status)) {
+                    try {
+                        found.add(objectMapper.readValue(status.toFile(), JobStatus.class));
+                    } catch (IOException e) {
+                        log.warn("Skipping job in {}: {}", dir, e.toString());
+                    }
+                }
+            }
+        } catch (IOException e) {
+            log.warn("Could not list jobs in {}: {}", root, e.toString());
+            return;
+        }
+        found.sort(Comparator.comparingLong(JobStatus::createdAt));
+        for (JobStatus status : found) {
+            Job job = new Job(status);
+            synchronized (this) {
+                jobs.put(job.id, job);
+            }
+            if (status.state() == JobState.QUEUED || status.state() == JobState.RUNNING) {
+                log.info("Resuming job {} ({})", job.id, job.fileName);
+                executor.execute(job);
+            }
+        }
+    }
+
+    @PreDestroy
+    void suspend() {
+        List<Job> all;
+        synchronized (this) {
+            all = new ArrayList<>(jobs.values());
+        }
+        // Rows written so far are kept; anything still in flight is checked again after the restart.
+        for (Job job : all) {
+            job.suspend();
+        }
+    }
+
+    /**
+     * Stores the uploaded file and queues a job for it.
+     *
+     * @throws IllegalArgumentException if the options are invalid or the file is too large
+     * @throws IllegalStateException    if {@code urlchecker.jobs.max-jobs} jobs already exist
+     */
+    public JobStatus create(InputStream in, String fileName, JobOptions options) throws IOException {
+        String format = options.format() != null ? options.format().trim().toLowerCase(Locale.ROOT)
+                : (fileName != null && fileName.toLowerCase(Locale.ROOT).endsWith(".csv") ? "csv" : "text");
+        if (!format.equals("csv") && !format.equals("text")) {
+            throw new IllegalArgumentException("format must be one of: csv, text");
+        }
+        if (Boolean.FALSE.equals(options.header()) && options.column() != null && !isIndex(options.column())) {
+            throw new IllegalArgumentException("A column picked by name needs a header row; use its index with header=false");
+        }
+        synchronized (this) {
+            if (jobs.size() >= maxJobs) {
+                throw new IllegalStateException("Too many jobs (max " + maxJobs + "); delete finished ones first");
+            }
+        }
+
+        String id = UUID.randomUUID().toString();
+        Path dir = root.resolve(id);
+        Files.createDirectories(dir);
+        long lines;
+        try {
+            lines = copy(in, dir.resolve(INPUT));
+        } catch (IOException | RuntimeException e) {
+            deleteDirectory(dir);
+            throw e;
+        }
+
+        JobOptions effective = new JobOptions(format, options.column(), options.header(), options.concurrency(),
+                options.checkTimeoutSeconds(), options.cache() != null ? options.cache() : CacheMode.DEFAULT);
+        Job job = new Job(id, fileName, effective, lines);
+        synchronized (this) {
+            jobs.put(id, job);
+        }
+        persist(job);
+        executor.execute(job);
+        return job.status();
+    }
+
+    public JobStatus get(String id) {
+        Job job = job(id);
+        return job != null ? job.status() : null;
+    }
+
+    public List<JobStatus> list() {
+        List<Job> all;
+        synchronized (this) {
+            all = new ArrayList<>(jobs.values());
+        }
+        return all.stream().map(Job::status).toList();
+    }
+
+    /**
+     * Returns the results file of job {@code id} and its length up to the last complete row
+     * written so far, or {@code null} if there is no such job.
+     */
+    public Results results(String id) throws IOException {
+        Job job = job(id);
+        if (job == null) {
+            return null;
+        }
+        Path file = job.dir.resolve(RESULTS);
+        synchronized (job) {
+            if (job.out != null) {
+                job.out.flush();
+            }
+            // Measured under the lock, so a row being appended is never cut in half.
+            long length = Files.exists(file) ? Files.size(file) : 0;
+            return new Results(file, length, job.state == JobState.DONE);
+        }
+    }
+
+    /** Stops job {@code id} if it is running and deletes its files. */
+    public boolean delete(String id) throws IOException {
+        Job job;
+        synchronized (this) {
+            job = jobs.remove(id);
+        }
+        if (job == null) {
+            return false;
+        }
+        job.cancel();
+        deleteDirectory(job.dir);
+        return true;
+    }
+
+    private synchronized Job job(String id) {
+        return jobs.get(id);
+    }
+
+    /** Copies the upload to {@code target}, enforcing the size limit, and returns its number of lines. */
+    private long copy(InputStream in, Path target) throws IOException {
+        long lines = 0;
+        long bytes = 0;
+        byte last = '\n';
+        byte[] buffer = new byte[64 * 1024];
+        try (OutputStream out = Files.newOutputStream(target)) {
+            for (int n = in.read(buffer); n >= 0; n = in.read(buffer)) {
+                if (n == 0) {
+                    continue;
+                }
+                bytes += n;
+                if (bytes > maxUploadSize.toBytes()) {
+                    throw new IllegalArgumentException("File larger than " + maxUploadSize);
+                }
+                for (int i = 0; i < n; i++) {
+                    if (buffer[i] == '\n') {
+                        lines++;
+                    }
+                }
+                last = buffer[n - 1];
+                out.write(buffer, 0, n);
+            }
+        }
+        return last == '\n' ? lines : lines + 1;
+    }
+
+    private void persist(Job job) {
+        if (job.cancelled) {
+            return;
+        }
+        Path temp = job.dir.resolve(STATUS + ".tmp");
+        try {
+            objectMapper.writeValue(temp.toFile(), job.status());
+            Files.move(temp, job.dir.resolve(STATUS), StandardCopyOption.REPLACE_EXISTING, StandardCopyOption.ATOMIC_MOVE);
+        } catch (IOException e) {
+            log.warn("Could not save state of job {}: {}", job.id, e.toString());
+        }
+    }
+
+    private static void deleteDirectory(Path dir) throws IOException {
+        if (!Files.exists(dir)) {
+            return;
+        }
+        try (Stream<Path> paths = Files.walk(dir)) {
+            for (Path path : paths.sorted(Comparator.reverseOrder()).toList()) {
+                Files.deleteIfExists(path);
+            }
+        }
+    }
+
+    /** Cuts {@code file} back to its last complete line, dropping a row cut short by a crash. */
+    private static void truncateToLastLine(Path file) throws IOException {
+        try (FileChannel channel = FileChannel.open(file, StandardOpenOption.READ, StandardOpenOption.WRITE)) {
+            ByteBuffer buffer = ByteBuffer.allocate(8192);
+            long end = channel.size();
+            while (end > 0) {
+                int n = (int) Math.min(buffer.capacity(), end);
+                buffer.clear().limit(n);
+                while (buffer.hasRemaining() && channel.read(buffer, end - n + buffer.position()) >= 0) {
+                    // Positional reads may return short; keep going until the block is filled.
+                }
+                for (int i = n - 1; i >= 0; i--) {
+                    if (buffer.get(i) == '\n') {
+                        channel.truncate(end - n + i + 1);
+                        return;
+                    }
+                }
+                end -= n;
+            }
+            channel.truncate(0);
+        }
+    }
+
+    private static boolean isIndex(String column) {
+        return column != null && !column.isBlank() && column.trim().chars().allMatch(Character::isDigit);
+    }
+
+    /** 64-bit FNV-1a hash of a normalized URL; collisions are negligible at millions of URLs. */
+    static long fingerprint(String key) {
+        long hash = 0xcbf29ce484222325L;
+        for (int i = 0; i < key.length(); i++) {
+            hash ^= key.charAt(i);
+            hash *= 0x100000001b3L;
+        }
+        return hash;
+    }
+
+    /** Splits one CSV line into fields, honouring double quotes. Quoted line breaks are not supported. */
+    static List<String> csvFields(String line) {
+        List<String> fields = new ArrayList<>();
+        StringBuilder field = new StringBuilder();
+        boolean quoted = false;
+        for (int i = 0; i < line.length(); i++) {
+            char c = line.charAt(i);
+            if (quoted) {
+                if (c != '"') {
+                    field.append(c);
+                } else if (i + 1 < line.length() && line.charAt(i + 1) == '"') {
+                    field.append('"');
+                    i++;
+                } else {
+                    quoted = false;
+                }
+            } else if (c == '"') {
+                quoted = true;
+            } else if (c == ',') {
+                fields.add(field.toString());
+                field.setLength(0);
+            } else {
+                field.append(c);
+            }
+        }
+        fields.add(field.toString());
+        return fields;
+    }
+
+    static String csvField(Object value) {
+        if (value == null) {
+            return "";
+        }
+        String text = value.toString().replace('\r', ' ').replace('\n', ' ');
+        if (text.indexOf(',') < 0 && text.indexOf('"') < 0) {
+            return text;
+        }
+        return '"' + text.replace("\"", "\"\"") + '"';
+    }
+
+    private static String resultRow(CheckResult result) {
+        return String.join(",",
+                csvField(result.url()),
+                csvField(result.reachable()),
+                csvField(result.status()),
+                csvField(result.method()),
+                csvField(result.failure()),
+                csvField(result.error()),
+                csvField(result.timings() != null ? result.timings().total() : null));
+    }
+
+    /** The results file of a job and how many of its bytes are complete rows. */
+    public record Results(Path file, long length, boolean complete) {
+    }
+
+    /**
+     * One job: reads its file on a job thread and keeps up to {@code window} URLs queued or in
+     * flight. Everything below is guarded by the job's monitor.
+     */
+    private final class Job implements Runnable {
+
+        final String id;
+        final String fileName;
+        final JobOptions options;
+        final long lines;
+        final long createdAt;
+        final Path dir;
+
+        JobState state;
+        Long finishedAt;
+        String error;
+        long linesRead;
+        long urls;
+        long duplicates;
+        long checked;
+        long reachable;
+
+        private final Map<String, Deque<String>> pendingByHost = new HashMap<>();
+        private final Deque<String> hostOrder = new ArrayDeque<>();
+        private final Map<String, Integer> activeByHost = new HashMap<>();
+        private int pending;
+        private int inFlight;
+        private boolean dispatching;
+        private BufferedWriter out;
+        private int unflushed;
+        private IOException writeFailure;
+        volatile boolean cancelled;
+        private boolean suspended;
+
+        Job(String id, String fileName, JobOptions options, long lines) {
+            this.id = id;
+            this.fileName = fileName;
+            this.options = options;
+            this.lines = lines;
+            this.createdAt = System.currentTimeMillis();
+            this.dir = root.resolve(id);
+            this.state = JobState.QUEUED;
+        }
+
+        Job(JobStatus saved) {
+            this.id = saved.id();
+            this.fileName = saved.fileName();
+            this.options = saved.options();
+            this.lines = saved.lines();
+            this.createdAt = saved.createdAt();
+            this.dir = root.resolve(id);
+            this.state = saved.state();
+            this.finishedAt = saved.finishedAt();
+            this.error = saved.error();
+            this.linesRead = saved.linesRead();
+            this.urls = saved.urls();
+            this.duplicates = saved.duplicates();
+            this.checked = saved.checked();
+            this.reachable = saved.reachable();
+        }
+
+        synchronized JobStatus status() {
+            double progress = state == JobState.DONE ? 1
+                    : lines == 0 ? 0 : Math.min(1, Math.max(0, (double) (linesRead - pending - inFlight) / lines));
+            return new JobStatus(id, fileName, state, options, lines, linesRead, urls, duplicates, checked, reachable,
+                    progress, createdAt, finishedAt, error);
+        }
+
+        @Override
+        public void run() {
+            try {
+                execute();
+            } catch (InterruptedException e) {
+                // Shutting down; the job stays RUNNING on disk and resumes on the next start.
+                Thread.currentThread().interrupt();
+            } catch (IOException | RuntimeException e) {
+                synchronized (this) {
+                    if (stopped()) {
+                        return;
+                    }
+                    state = JobState.FAILED;
+                    error = e.getMessage() != null ? e.getMessage() : e.toString();
+                    finishedAt = System.currentTimeMillis();
+                }
+                log.warn("Job {} failed: {}", id, error);
+                persist(this);
+            } finally {
+                closeWriter();
+            }
+        }
+
+        private void execute() throws IOException, InterruptedException {
+            synchronized (this) {
+                if (cancelled) {
+                    return;
+                }
+                state = JobState.RUNNING;
+                linesRead = urls = duplicates = checked = reachable = 0;
+            }
+            persist(this);
+
+            LongSet done = new LongSet();
+            Path results = dir.resolve(RESULTS);
+            if (Files.exists(results)) {
+                readResults(results, done);
+            }
+            synchronized (this) {
+                out = Files.newBufferedWriter(results, StandardCharsets.UTF_8,
+                        StandardOpenOption.CREATE, StandardOpenOption.APPEND);
+                if (Files.size(results) == 0) {
+                    out.write(RESULTS_HEADER);
+                    out.newLine();
+                }
+            }
+
+            boolean csv = "csv".equals(options.format());
+            LongSet seen = new LongSet();
+            int column = -1;
+            try (BufferedReader reader = new BufferedReader(
+                    new InputStreamReader(Files.newInputStream(dir.resolve(INPUT)), StandardCharsets.UTF_8))) {
+                for (String line = reader.readLine(); line != null; line = reader.readLine()) {
+                    synchronized (this) {
+                        linesRead++;
+                    }
+                    if (column < 0 && !line.isEmpty() && line.charAt(0) == '\uFEFF') {
+                        line = line.substring(1);
+                    }
+                    String url;
+                    if (csv) {
+                        List<String> fields = csvFields(line);
+                        if (column < 0) {
+                            int header = headerColumn(fields);
+                            column = Math.max(header, 0);
+                            if (isHeaderRow(fields, column, header)) {
+                                continue;
+                            }
+                        }
+                        url = column < fields.size() ? fields.get(column).trim() : "";
+                    } else {
+                        column = 0;
+                        url = line.trim();
+                        if (url.startsWith("#")) {
+                            continue;
+                        }
+                    }
+                    if (url.isEmpty()) {
+                        continue;
+                    }
+
+                    UrlNormalizer.Normalized normalized = normalizer.canonicalize(url);
+                    long key = fingerprint(normalized.valid() ? normalized.url() : url);
+                    if (!seen.add(key)) {
+                        synchronized (this) {
+                            duplicates++;
+                        }
+                        continue;
+                    }
+                    synchronized (this) {
+                        urls++;
+                    }
+                    if (!done.contains(key) && !enqueue(url, normalized.valid() ? normalized.uri().getHost() : "")) {
+                        return;
+                    }
+                }
+            }
+
+            synchronized (this) {
+                while (pending + inFlight > 0 && !stopped()) {
+                    checkWriter();
+                    wait();
+                }
+                if (stopped()) {
+                    return;
+                }
+                checkWriter();
+                out.flush();
+                state = JobState.DONE;
+                finishedAt = System.currentTimeMillis();
+            }
+            log.info("Job {} done: {} urls checked, {} reachable, {} duplicates", id, checked, reachable, duplicates);
+            persist(this);
+        }
+
+        /**
+         * Picks the CSV column holding the URLs from the first row: the {@code column} option as
+         * an index, a header named like the {@code column} option, or a header called {@code url}.
+         * Returns the header's index, or -1 if the first row is data (column 0 unless given).
+         */
+        private int headerColumn(List<String> firstRow) {
+            String wanted = options.column();
+            if (isIndex(wanted)) {
+                return Integer.parseInt(wanted.trim());
+            }
+            String name = wanted != null ? wanted.trim() : "url";
+            for (int i = 0; i < firstRow.size(); i++) {
+                if (firstRow.get(i).trim().equalsIgnoreCase(name)) {
+                    return i;
+                }
+            }
+            if (wanted != null) {
+                throw new IllegalArgumentException("No column named " + name + " in the first row");
+            }
+            return -1;
+        }
+
+        /**
+         * Whether the first CSV row is a header rather than data. The {@code header} option decides
+         * if given; otherwise a row matched by name is a header, and with the column given by index
+         * the row is a header if that cell does not look like a URL.
+         */
+        private boolean isHeaderRow(List<String> firstRow, int column, int header) {
+            if (options.header() != null) {
+                return options.header();
+            }
+            if (header < 0) {
+                return false;
+            }
+            if (!isIndex(options.column())) {
+                return true;
+            }
+            String cell = column < firstRow.size() ? firstRow.get(column).trim() : "";
+            return !cell.isEmpty() && !looksLikeUrl(cell);
+        }
+
+        /**
+         * Whether {@code cell} reads as a URL. Bare words canonicalize too (as {@code https://word/}),
+         * so without a scheme the host must also contain a dot; "url" or "link" is a header name.
+         */
+        private boolean looksLikeUrl(String cell) {
+            UrlNormalizer.Normalized normalized = normalizer.canonicalize(cell);
+            return normalized.valid() && (cell.contains("://") || normalized.uri().getHost().indexOf('.') >= 0);
+        }
+
+        /** Loads the URLs a previous run already checked, after dropping a trailing partial row. */
+        private void readResults(Path results, LongSet done) throws IOException {
+            truncateToLastLine(results);
+            long rows = 0;
+            long up = 0;
+            try (BufferedReader reader = Files.newBufferedReader(results, StandardCharsets.UTF_8)) {
+                String line = reader.readLine();
+                if (line != null && line.equals(RESULTS_HEADER)) {
+                    line = reader.readLine();
+                }
+                for (; line != null; line = reader.readLine()) {
+                    List<String> fields = csvFields(line);
+                    done.add(fingerprint(normalizer.normalize(fields.get(0))));
+                    rows++;
+                    if (fields.size() > 1 && fields.get(1).equals("true")) {
+                        up++;
+                    }
+                }
+            }
+            synchronized (this) {
+                checked = rows;
+                reachable = up;
+            }
+        }
+
+        /** Queues {@code url}, waiting while the window is full. Returns false if the job was stopped. */
+        private synchronized boolean enqueue(String url, String host) throws IOException, InterruptedException {
+            while (pending + inFlight >= window && !stopped()) {
+                checkWriter();
+                wait();
+            }
+            if (stopped()) {
+                return false;
+            }
+            checkWriter();
+            Deque<String> queue = pendingByHost.get(host);
+            if (queue == null) {
+                queue = new ArrayDeque<>();
+                pendingByHost.put(host, queue);
+                hostOrder.addLast(host);
+            }
+            queue.addLast(url);
+            pending++;
+            dispatch();
+            return true;
+        }
+
+        /**
+         * Starts queued checks round-robin across hosts until a concurrency limit is hit. As in
+         * a batch, the guard stops checks that complete inline from recursing back in here.
+         */
+        private void dispatch() {
+            if (dispatching) {
+                return;
+            }
+            dispatching = true;
+            try {
+                int concurrency = Math.max(1, Math.min(
+                        options.concurrency() != null ? options.concurrency() : defaultConcurrency, maxConcurrency));
+                int skipped = 0;
+                while (inFlight < concurrency && skipped < hostOrder.size() && !stopped()) {
+                    String host = hostOrder.pollFirst();
+                    if (activeByHost.getOrDefault(host, 0) >= perHostConcurrency) {
+                        hostOrder.addLast(host);
+                        skipped++;
+                        continue;
+                    }
+                    Deque<String> queue = pendingByHost.get(host);
+                    String url = queue.pollFirst();
+                    if (queue.isEmpty()) {
+                        pendingByHost.remove(host);
+                    } else {
+                        hostOrder.addLast(host);
+                    }
+                    pending--;
+                    skipped = 0;
+                    launch(url, host);
+                }
+            } finally {
+                dispatching = false;
+            }
+        }
+
+        private void launch(String url, String host) {
+            inFlight++;
+            activeByHost.merge(host, 1, Integer::sum);
+            Duration checkTimeout = options.checkTimeoutSeconds() != null
+                    ? Duration.ofSeconds(options.checkTimeoutSeconds()) : null;
+            checkService.checkAsync(url, options.cache(), checkTimeout, Priority.BULK)
+                    .whenComplete((result, e) -> onChecked(host,
+                            result != null ? result : CheckResult.failed(url, FailureClass.HTTP, String.valueOf(e))));
+        }
+
+        private synchronized void onChecked(String host, CheckResult result) {
+            inFlight--;
+            if (activeByHost.merge(host, -1, Integer::sum) <= 0) {
+                activeByHost.remove(host);
+            }
+            if (out != null && writeFailure == null && !stopped()) {
+                try {
+                    out.write(resultRow(result));
+                    out.newLine();
+                    if (++unflushed >= FLUSH_EVERY) {
+                        out.flush();
+                        unflushed = 0;
+                    }
+                    checked++;
+                    if (result.reachable()) {
+                        reachable++;
+                    }
+                } catch (IOException e) {
+                    writeFailure = e;
+                }
+            }
+            dispatch();
+            notifyAll();
+        }
+
+        /** Cancelled by a delete, or suspended because the process is shutting down. */
+        private boolean stopped() {
+            return cancelled || suspended;
+        }
+
+        private void checkWriter() throws IOException {
+            if (writeFailure != null) {
+                throw writeFailure;
+            }
+        }
+
+        synchronized void cancel() {
+            cancelled = true;
+            closeWriter();
+            notifyAll();
+        }
+
+        synchronized void suspend() {
+            suspended = true;
+            closeWriter();
+        }
+
+        private synchronized void closeWriter() {
+            if (out == null) {
+                return;
+            }
+            try {
+                out.close();
+            } catch (IOException e) {
+                log.warn("Could not close results of job {}: {}", id, e.toString());
+            }
+            out = null;
+        }
+    }
+
+    /** Open-addressing set of longs, about 11 bytes per entry at its maximum load. */
+    static final class LongSet {
+
+        private long[] slots = new long[1024];
+        private int size;
+        private boolean hasZero;
+
+        boolean add(long value) {
+            if (value == 0) {
+                boolean added = !hasZero;
+                hasZero = true;
+                return added;
+            }
+            if ((size + 1) * 4L > slots.length * 3L) {
+                grow();
+            }
+            if (!insert(slots, value)) {
+                return false;
+            }
+            size++;
+            return true;
+        }
+
+        boolean contains(long value) {
+            if (value == 0) {
+                return hasZero;
+            }
+            int mask = slots.length - 1;
+            for (int i = index(value, mask); slots[i] != 0; i = (i + 1) & mask) {
+                if (slots[i] == value) {
+                    return true;
+                }
+            }
+            return false;
+        }
+
+        private static boolean insert(long[] table, long value) {
+            int mask = table.length - 1;
+            int i = index(value, mask);
+            while (table[i] != 0) {
+                if (table[i] == value) {
+                    return false;
+                }
+                i = (i + 1) & mask;
+            }
+            table[i] = value;
+            return true;
+        }
+
+        private void grow() {
+            long[] grown = new long[slots.length * 2];
+            for (long value : slots) {
+                if (value != 0) {
+                    insert(grown, value);
+                }
+            }
+            slots = grown;
+        }
+
+        private static int index(long value, int mask) {
+            return (int) (value ^ (value >>> 32)) & mask;
+        }
+    }
+}
@@ -0,0 +1,214 @@
+package com.urlvalidator.service;
+
+import com.urlvalidator.model.TlsInfo;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Component;
+
+import javax.net.ssl.SSLEngine;
+import javax.net.ssl.SSLPeerUnverifiedException;
+import javax.net.ssl.SSLSession;
+import javax.net.ssl.X509ExtendedTrustManager;
+import java.net.Socket;
+import java.security.cert.Certificate;
+import java.security.cert.CertificateException;
+import java.security.cert.CertificateParsingException;
+import java.security.cert.X509Certificate;
+import java.time.Duration;
+import java.util.Collection;
+import java.util.List;
+import java.util.Locale;
+import java.util.Map;
+import java.util.concurrent.ConcurrentHashMap;
+
+/**
+ * Certificate inspection for checks of https URLs ({@code urlchecker.tls.inspect-certificates}).
+ * After a successful exchange the certificate comes from the response's TLS session, which
+ * also works for resumed sessions. A rejected certificate never reaches a response, so the
+ * trust manager of the checker's {@code SSLContext} is wrapped to remember the chains it
+ * rejects per host and port for a short while. Either way no second connection is opened.
+ */
+@Component
+public class PeerCertificates {
+
+    private static final long REJECTION_TTL_MILLIS = Duration.ofMinutes(1).toMillis();
+    private static final long DAY_MILLIS = Duration.ofDays(1).toMillis();
+    private static final int PURGE_THRESHOLD = 1_000;
+    private static final int SAN_DNS = 2;
+    private static final int SAN_IP = 7;
+
+    private final boolean enabled;
+    private final Map<String, Rejection> rejections = new ConcurrentHashMap<>();
+
+    public PeerCertificates(@Value("${urlchecker.tls.inspect-certificates:false}") boolean enabled) {
+        this.enabled = enabled;
+    }
+
+    public boolean enabled() {
+        return enabled;
+    }
+
+    /** Wraps {@code delegate} so that the chains it rejects are remembered while inspection is on. */
+    public X509ExtendedTrustManager recording(X509ExtendedTrustManager delegate) {
+        return enabled ? new RecordingTrustManager(delegate) : delegate;
+    }
+
+    /** Describes the certificate of an established session with {@code host}, or {@code null} if there is none. */
+    public TlsInfo describe(SSLSession session, String host) {
+        Certificate[] chain;
+        try {
+            chain = session.getPeerCertificates();
+        } catch (SSLPeerUnverifiedException e) {
+            return null;
+        }
+        if (chain.length == 0 || !(chain[0] instanceof X509Certificate)) {
+            return null;
+        }
+        return describe((X509Certificate) chain[0], host, session.getProtocol(), session.getCipherSuite(), true, null);
+    }
+
+    /** Describes the certificate {@code host} presented on {@code port} if it was rejected in the last minute. */
+    public TlsInfo rejected(String host, int port) {
+        Rejection rejection = rejections.get(key(host, port));
+        if (rejection == null || System.currentTimeMillis() - rejection.at > REJECTION_TTL_MILLIS) {
+            return null;
+        }
+        return describe(rejection.certificate, host, null, null, false, rejection.problem);
+    }
+
+    private static TlsInfo describe(X509Certificate certificate, String host, String protocol, String cipherSuite,
+                                    boolean trusted, String problem) {
+        long notAfter = certificate.getNotAfter().getTime();
+        return new TlsInfo(protocol, cipherSuite,
+                certificate.getSubjectX500Principal().getName(),
+                certificate.getIssuerX500Principal().getName(),
+                certificate.getNotBefore().getTime(),
+                notAfter,
+                Math.floorDiv(notAfter - System.currentTimeMillis(), DAY_MILLIS),
+                matches(certificate, host),
+                trusted,
+                problem);
+    }
+
+    /**
+     * Whether {@code certificate} names {@code host} in its subject alternative names, with
+     * a wildcard standing for exactly one leftmost label as in RFC 6125.
+     */
+    static boolean matches(X509Certificate certificate, String host) {
+        String name = host.toLowerCase(Locale.ROOT);
+        boolean literal = name.startsWith("[") || name.matches("[0-9.]+");
+        name = name.startsWith("[") ? name.substring(1, name.length() - 1) : name;
+        Collection<List<?>> alternatives;
+        try {
+            alternatives = certificate.getSubjectAlternativeNames();
+        } catch (CertificateParsingException e) {
+            return false;
+        }
+        if (alternatives == null) {
+            return false;
+        }
+        for (List<?> alternative : alternatives) {
+            int type = (Integer) alternative.get(0);
+            String value = String.valueOf(alternative.get(1)).toLowerCase(Locale.ROOT);
+            if (literal ? type == SAN_IP && value.equals(name) : type == SAN_DNS && matchesDnsName(value, name)) {
+                return true;
+            }
+        }
+        return false;
+    }
+
+    private static boolean matchesDnsName(String pattern, String host) {
+        if (pattern.endsWith(".")) {
+            pattern = pattern.substring(0, pattern.length() - 1);
+        }
+        if (!pattern.startsWith("*.")) {
+            return pattern.equals(host);
+        }
+        int dot = host.indexOf('.');
+        return dot > 0 && host.substring(dot).equals(pattern.substring(1));
+    }
+
+    private void record(String host, int port, X509Certificate[] chain, CertificateException error) {
+        if (host == null || chain == null || chain.length == 0) {
+            return;
+        }
+        long now = System.currentTimeMillis();
+        if (rejections.size() >= PURGE_THRESHOLD) {
+            rejections.values().removeIf(r -> now - r.at > REJECTION_TTL_MILLIS);
+        }
+        rejections.put(key(host, port), new Rejection(chain[0], problem(error), now));
+    }
+
+    private static String key(String host, int port) {
+        return host.toLowerCase(Locale.ROOT) + ":" + port;
+    }
+
+    /** The innermost message, which names the actual problem (expired, unknown issuer, wrong name...). */
+    private static String problem(Throwable error) {
+        String message = null;
+        for (Throwable t = error; t != null; t = t.getCause()) {
+            if (t.getMessage() != null) {
+                message = t.getMessage();
+            }
+        }
+        return message != null ? message : error.getClass().getSimpleName();
+    }
+
+    private record Rejection(X509Certificate certificate, String problem, long at) {
+    }
+
+    /** Delegates every decision and only takes note of the server chains that were refused. */
+    private final class RecordingTrustManager extends X509ExtendedTrustManager {
+
+        private final X509ExtendedTrustManager delegate;
+
+        RecordingTrustManager(X509ExtendedTrustManager delegate) {
+            this.delegate = delegate;
+        }
+
+        @Override
+        public void checkServerTrusted(X509Certificate[] chain, String authType, SSLEngine engine)
+                throws CertificateException {
+            try {
+                delegate.checkServerTrusted(chain, authType, engine);
+            } catch (CertificateException e) {
+                if (engine != null) {
+                    record(engine.getPeerHost(), engine.getPeerPort(), chain, e);
+                }
+                throw e;
+            }
+        }
+
+        @Override
+        public void checkServerTrusted(X509Certificate[] chain, String authType, Socket socket)
+                throws CertificateException {
+            delegate.checkServerTrusted(chain, authType, socket);
+        }
+
+        @Override
+        public void checkServerTrusted(X509Certificate[] chain, String authType) throws CertificateException {
+            delegate.checkServerTrusted(chain, authType);
+        }
+
+        @Override
+        public void checkClientTrusted(X509Certificate[] chain, String authType, SSLEngine engine)
+                throws CertificateException {
+            delegate.checkClientTrusted(chain, authType, engine);
+        }
+
+        @Override
+        public void checkClientTrusted(X509Certificate[] chain, String authType, Socket socket)
+                throws CertificateException {
+            delegate.checkClientTrusted(chain, authType, socket);
+        }
+
+        @Override
+        public void checkClientTrusted(X509Certificate[] chain, String authType) throws CertificateException {
+            delegate.checkClientTrusted(chain, authType);
+        }
+
+        @Override
+        public X509Certificate[] getAcceptedIssuers() {
+            return delegate.getAcceptedIssuers();
+        }
+    }
+}
@@ -0,0 +1,91 @@
+package com.urlvalidator.service;
+
+import io.micrometer.core.instrument.FunctionCounter;
+import io.micrometer.core.instrument.Gauge;
+import io.micrometer.core.instrument.MeterRegistry;
+import io.micrometer.core.instrument.binder.MeterBinder;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Component;
+
+import java.net.URI;
+import java.time.Duration;
+import java.util.Map;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.atomic.AtomicLong;
+
+/**
+ * Remembers permanent redirects (301 and 308) by canonical URL, so later checks follow them
+ * without a request and go straight to where they lead. Entries expire after
+ * {@code urlchecker.redirects.cache-ttl}, so a moved redirect is noticed eventually.
+ */
+@Component
+public class PermanentRedirects implements MeterBinder {
+
+    private final boolean enabled;
+    private final long ttlMillis;
+    private final int maxEntries;
+    private final Map<String, Redirect> redirects = new ConcurrentHashMap<>();
+
+    private final AtomicLong hits = new AtomicLong();
+
+    public PermanentRedirects(@Value("${urlchecker.redirects.cache-enabled:true}") boolean enabled,
+                              @Value("${urlchecker.redirects.cache-ttl:1h}") Duration ttl,
+                              @Value("${urlchecker.redirects.cache-max-entries:100000}") int maxEntries) {
+        this.enabled = enabled;
+        this.ttlMillis = ttl.toMillis();
+        this.maxEntries = maxEntries;
+    }
+
+    public static boolean isPermanent(int status) {
+        return status == 301 || status == 308;
+    }
+
+    /** Returns where {@code url} permanently redirects to, or {@code null} if that is not known. */
+    public Redirect get(URI url) {
+        if (!enabled) {
+            return null;
+        }
+        String key = url.toString();
+        Redirect redirect = redirects.get(key);
+        if (redirect == null) {
+            return null;
+        }
+        if (System.currentTimeMillis() >= redirect.expiresAt) {
+            redirects.remove(key, redirect);
+            return null;
+        }
+        hits.incrementAndGet();
+        return redirect;
+    }
+
+    public void put(URI url, URI location, int status) {
+        if (!enabled || !isPermanent(status)) {
+            return;
+        }
+        long now = System.currentTimeMillis();
+        if (redirects.size() >= maxEntries) {
+            redirects.values().removeIf(r -> now >= r.expiresAt);
+            if (redirects.size() >= maxEntries) {
+                return;
+            }
+        }
+        redirects.put(url.toString(), new Redirect(location, status, now + ttlMillis));
+    }
+
+    public int size() {
+        return redirects.size();
+    }
+
+    @Override
+    public void bindTo(MeterRegistry registry) {
+        Gauge.builder("urlchecker.redirects.cache.size", this, PermanentRedirects::size)
+                .description("Permanent redirects remembered")
+                .register(registry);
+        FunctionCounter.builder("urlchecker.redirects.cache.hits", hits, AtomicLong::get)
+                .description("Redirects followed from the cache without a request")
+                .register(registry);
+    }
+
+    public record Redirect(URI location, int status, long expiresAt) {
+    }
+}
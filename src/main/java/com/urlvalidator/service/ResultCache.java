@@ -0,0 +1,160 @@
+package com.urlvalidator.service;
+
+import com.urlvalidator.model.CheckResult;
+import io.micrometer.core.instrument.FunctionCounter;
+import io.micrometer.core.instrument.Gauge;
+import io.micrometer.core.instrument.MeterRegistry;
+import io.micrometer.core.instrument.binder.MeterBinder;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Component;
+
+import java.time.Duration;
+import java.util.LinkedHashMap;
+import java.util.Map;
+import java.util.concurrent.atomic.AtomicLong;
+
+/**
+ * In-process cache of check results keyed by normalized URL. Reachable and unreachable
+ * results have separate TTLs, and once {@code maxSize} entries are stored the least
+ * recently used one is evicted.
+ */
+@Component
+public class ResultCache implements MeterBinder {
+
+    private final boolean enabled;
+    private final int maxSize;
+    private final long reachableTtlMillis;
+    private final long unreachableTtlMillis;
+    private final Map<String, CachedEntry> entries;
+
+    private final AtomicLong hits = new AtomicLong();
+    private final AtomicLong misses = new AtomicLong();
+    private final AtomicLong evictions = new AtomicLong();
+    private final AtomicLong expirations = new AtomicLong();
+
+    public ResultCache(@Value("${urlchecker.cache.enabled:true}") boolean enabled,
+                       @Value("${urlchecker.cache.max-size:100000}") int maxSize,
+                       @Value("${urlchecker.cache.reachable-ttl:10m}") Duration reachableTtl,
+                       @Value("${urlchecker.cache.unreachable-ttl:1m}") Duration unreachableTtl) {
+        this.enabled = enabled;
+        this.maxSize = maxSize;
+        this.reachableTtlMillis = reachableTtl.toMillis();
+        this.unreachableTtlMillis = unreachableTtl.toMillis();
+        // Access-ordered, so the eldest entry is always the least recently used one.
+        this.entries = new LinkedHashMap<>(16, 0.75f, true) {
+            @Override
+            protected boolean removeEldestEntry(Map.Entry<String, CachedEntry> eldest) {
+                if (size() > ResultCache.this.maxSize) {
+                    evictions.incrementAndGet();
+                    return true;
+                }
+                return false;
+            }
+        };
+    }
+
+    /**
+     * Returns the cached result for {@code key} with its age filled in, or {@code null}
+     * if nothing fresh is cached.
+     */
+    public CheckResult get(String key, String requestedUrl) {
+        if (!enabled) {
+            return null;
+        }
+        long now = System.currentTimeMillis();
+        CachedEntry entry;
+        synchronized (entries) {
+            entry = entries.get(key);
+            if (entry != null && now >= entry.expiresAt) {
+                entries.remove(key);
+                expirations.incrementAndGet();
+                entry = null;
+            }
+        }
+        if (entry == null) {
+            misses.incrementAndGet();
+            return null;
+        }
+        hits.incrementAndGet();
+        return entry.result.fromCache(requestedUrl, (now - entry.checkedAt) / 1000);
+    }
+
+    public void put(String key, CheckResult result) {
+        if (!enabled) {
+            return;
+        }
+        long now = System.currentTimeMillis();
+        long ttl = result.reachable() ? reachableTtlMillis : unreachableTtlMillis;
+        if (ttl <= 0) {
+            return;
+        }
+        synchronized (entries) {
+            entries.put(key, new CachedEntry(result, now, now + ttl));
+        }
+    }
+
+    /**
+     * Adds a result that was checked at {@code checkedAt} (epoch millis), for example one
+     * loaded from disk at startup. Stale results and keys that are already cached are ignored.
+     *
+     * @return whether the result was added
+     */
+    public boolean restore(String key, CheckResult result, long checkedAt) {
+        if (!enabled || !isFresh(result, checkedAt)) {
+            return false;
+        }
+        long expiresAt = checkedAt + (result.reachable() ? reachableTtlMillis : unreachableTtlMillis);
+        synchronized (entries) {
+            return entries.putIfAbsent(key, new CachedEntry(result, checkedAt, expiresAt)) == null;
+        }
+    }
+
+    /** Returns whether a result checked at {@code checkedAt} is still within its TTL. */
+    public boolean isFresh(CheckResult result, long checkedAt) {
+        long ttl = result.reachable() ? reachableTtlMillis : unreachableTtlMillis;
+        return ttl > 0 && System.currentTimeMillis() < checkedAt + ttl;
+    }
+
+    public Map<String, Object> stats() {
+        int size = size();
+        long hitCount = hits.get();
+        long lookups = hitCount + misses.get();
+        return Map.of(
+                "enabled", enabled,
+                "size", size,
+                "maxSize", maxSize,
+                "hits", hitCount,
+                "misses", misses.get(),
+                "evictions", evictions.get(),
+                "expirations", expirations.get(),
+                "hitRate", lookups == 0 ? 0.0 : (double) hitCount / lookups
+        );
+    }
+
+    @Override
+    public void bindTo(MeterRegistry registry) {
+        FunctionCounter.builder("urlchecker.cache.requests", hits, AtomicLong::get)
+                .description("Cache lookups")
+                .tag("result", "hit")
+                .register(registry);
+        FunctionCounter.builder("urlchecker.cache.requests", misses, AtomicLong::get)
+                .description("Cache lookups")
+                .tag("result", "miss")
+                .register(registry);
+        FunctionCounter.builder("urlchecker.cache.evictions", evictions, AtomicLong::get)
+                .description("Entries evicted to stay within max-size")
+                .register(registry);
+        Gauge.builder("urlchecker.cache.size", this, ResultCache::size)
+                .description("Cached results")
+                .register(registry);
+    }
+
+    private int size() {
+        synchronized (entries) {
+            return entries.size();
+        }
+    }
+
+    private record CachedEntry(CheckResult result, long checkedAt, long expiresAt) {
+    }
+}
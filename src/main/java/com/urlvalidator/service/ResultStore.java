@@ -0,0 +1,197 @@
+package com.urlvalidator.service;
+
+import com.fasterxml.jackson.core.JsonProcessingException;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import com.urlvalidator.model.CheckResult;
+import jakarta.annotation.PostConstruct;
+import jakarta.annotation.PreDestroy;
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+import org.springframework.beans.factory.annotation.Qualifier;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Component;
+
+import java.io.BufferedReader;
+import java.io.BufferedWriter;
+import java.io.IOException;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.StandardCopyOption;
+import java.nio.file.StandardOpenOption;
+import java.util.ArrayList;
+import java.util.Collection;
+import java.util.Comparator;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.TimeUnit;
+
+/**
+ * Optional on-disk copy of the result cache, so a restart does not send every URL back to
+ * the network at once. Each result is appended as one JSON line to
+ * {@code urlchecker.store.path}; at startup the log is compacted to the latest fresh result
+ * per URL and the most recently checked ones are loaded into {@link ResultCache}.
+ *
+ * <p>Writes happen on a single background thread. If the file cannot be read or written
+ * the store logs a warning and switches itself off; checks carry on without it.
+ */
+@Component
+public class ResultStore {
+
+    private static final Logger log = LoggerFactory.getLogger(ResultStore.class);
+
+    private final ResultCache cache;
+    private final ObjectMapper objectMapper;
+    private final ExecutorService executor;
+    private final boolean enabled;
+    private final Path path;
+    private final int warmStartMax;
+    private final long compactAfter;
+
+    // Only touched on the store thread once startup has finished.
+    private BufferedWriter out;
+    private long lines;
+    private long compactAt;
+    private volatile boolean failed;
+
+    public ResultStore(ResultCache cache, ObjectMapper objectMapper,
+                       @Qualifier("resultStoreExecutor") ExecutorService executor,
+                       @Value("${urlchecker.store.enabled:false}") boolean enabled,
+                       @Value("${urlchecker.store.path:data/results.ndjson}") String path,
+                       @Value("${urlchecker.store.warm-start-max:50000}") int warmStartMax,
+                       @Value("${urlchecker.store.compact-after:200000}") long compactAfter) {
+        this.cache = cache;
+        this.objectMapper = objectMapper;
+        this.executor = executor;
+        this.enabled = enabled;
+        this.path = Path.of(path);
+        this.warmStartMax = warmStartMax;
+        this.compactAfter = compactAfter;
+    }
+
+    @PostConstruct
+    void warmStart() {
+        if (!enabled) {
+            return;
+        }
+        try {
+            Collection<StoredResult> stored = compact();
+            List<StoredResult> hottest = new ArrayList<>(stored);
+            hottest.sort(Comparator.comparingLong(StoredResult::checkedAt).reversed());
+            hottest = hottest.subList(0, Math.min(warmStartMax, hottest.size()));
+            // Oldest first, so the cache's recency order matches the order the checks ran in.
+            int restored = 0;
+            for (int i = hottest.size() - 1; i >= 0; i--) {
+                StoredResult entry = hottest.get(i);
+                if (cache.restore(entry.key(), entry.result(), entry.checkedAt())) {
+                    restored++;
+                }
+            }
+            log.info("Result store {}: restored {} of {} fresh results", path, restored, stored.size());
+        } catch (IOException e) {
+            disable(e);
+        }
+    }
+
+    /** Queues {@code result}, just checked, to be appended to the log. */
+    public void save(String key, CheckResult result) {
+        if (!enabled || failed) {
+            return;
+        }
+        StoredResult entry = new StoredResult(key, System.currentTimeMillis(), result);
+        executor.execute(() -> append(entry));
+    }
+
+    @PreDestroy
+    void close() {
+        if (!enabled) {
+            return;
+        }
+        try {
+            executor.submit(this::closeWriter).get(5, TimeUnit.SECONDS);
+        } catch (Exception e) {
+            log.warn("Result store {} was not closed cleanly: {}", path, e.toString());
+        }
+    }
+
+    private void append(StoredResult entry) {
+        if (failed || out == null) {
+            return;
+        }
+        try {
+            out.write(objectMapper.writeValueAsString(entry));
+            out.newLine();
+            out.flush();
+            if (++lines >= compactAt) {
+                closeWriter();
+                compact();
+            }
+        } catch (IOException e) {
+            disable(e);
+        }
+    }
+
+    /**
+     * Rewrites the log with only the latest result per key that is still fresh, then reopens
+     * it for appending. Returns the results that were kept.
+     */
+    private Collection<StoredResult> compact() throws IOException {
+        Map<String, StoredResult> latest = new HashMap<>();
+        int unreadable = 0;
+        if (Files.exists(path)) {
+            try (BufferedReader reader = Files.newBufferedReader(path, StandardCharsets.UTF_8)) {
+                for (String line = reader.readLine(); line != null; line = reader.readLine()) {
+                    try {
+                        StoredResult entry = objectMapper.readValue(line, StoredResult.class);
+                        latest.put(entry.key(), entry);
+                    } catch (JsonProcessingException e) {
+                        // Typically a line cut short by a crash; the rest of the log is still usable.
+                        unreadable++;
+                    }
+                }
+            }
+        }
+        if (unreadable > 0) {
+            log.warn("Result store {}: skipped {} unreadable lines", path, unreadable);
+        }
+        latest.values().removeIf(entry -> !cache.isFresh(entry.result(), entry.checkedAt()));
+
+        Path parent = path.toAbsolutePath().getParent();
+        if (parent != null) {
+            Files.createDirectories(parent);
+        }
+        Path temp = path.resolveSibling(path.getFileName() + ".tmp");
+        try (BufferedWriter writer = Files.newBufferedWriter(temp, StandardCharsets.UTF_8)) {
+            for (StoredResult entry : latest.values()) {
+                writer.write(objectMapper.writeValueAsString(entry));
+                writer.newLine();
+            }
+        }
+        Files.move(temp, path, StandardCopyOption.REPLACE_EXISTING, StandardCopyOption.ATOMIC_MOVE);
+
+        out = Files.newBufferedWriter(path, StandardCharsets.UTF_8, StandardOpenOption.CREATE, StandardOpenOption.APPEND);
+        lines = latest.size();
+        // Leave room to grow past the live set, so a large set of fresh results is not rewritten on every append.
+        compactAt = Math.max(compactAfter, 2 * lines);
+        return latest.values();
+    }
+
+    private Void closeWriter() throws IOException {
+        if (out != null) {
+            out.close();
+            out = null;
+        }
+        return null;
+    }
+
+    private void disable(IOException e) {
+        failed = true;
+        log.warn("Result store {} disabled: {}", path, e.toString());
+    }
+
+    /** One line of the log: the normalized URL, when it was checked and the result. */
+    record StoredResult(String key, long checkedAt, CheckResult result) {
+    }
+}
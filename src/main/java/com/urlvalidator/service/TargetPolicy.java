@@ -0,0 +1,171 @@
+package com.urlvalidator.service;
+
+import com.urlvalidator.model.FailureClass;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.core.io.Resource;
+import org.springframework.stereotype.Component;
+
+import java.io.BufferedReader;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.io.UncheckedIOException;
+import java.net.InetAddress;
+import java.net.URI;
+import java.net.UnknownHostException;
+import java.nio.charset.StandardCharsets;
+import java.util.HashSet;
+import java.util.List;
+import java.util.Locale;
+import java.util.Set;
+import java.util.regex.Pattern;
+
+/**
+ * Decides, before any socket is opened, whether a canonical URL may be probed at all.
+ *
+ * <p>Host names must end in a known top-level domain (the bundled {@code tlds.txt}, taken
+ * from the Public Suffix List), so typos and internal names such as {@code localhost} or
+ * {@code *.internal} are rejected as {@code INVALID_URL} without a DNS query. IP literals
+ * and, after DNS, every address a host resolves to are matched against the
+ * {@code urlchecker.policy.blocked-networks} CIDR list (loopback, private, link-local and
+ * other special-purpose ranges by default) and refused as {@code BLOCKED}, so the checker
+ * cannot be used to reach the network it runs in. {@code allowed-networks} punches holes in
+ * the block list for deployments that are meant to check internal services.
+ */
+@Component
+public class TargetPolicy {
+
+    private static final Pattern IPV4_LITERAL = Pattern.compile("((25[0-5]|2[0-4]\\d|1?\\d?\\d)(\\.|$)){4}");
+
+    private final boolean checkTld;
+    private final Set<String> tlds;
+    private final List<Cidr> blocked;
+    private final List<Cidr> allowed;
+
+    public TargetPolicy(@Value("${urlchecker.policy.check-tld:true}") boolean checkTld,
+                        @Value("${urlchecker.policy.tld-file:classpath:tlds.txt}") Resource tldFile,
+                        @Value("${urlchecker.policy.blocked-networks:0.0.0.0/8,10.0.0.0/8,100.64.0.0/10,127.0.0.0/8,169.254.0.0/16,172.16.0.0/12,192.0.0.0/24,192.0.2.0/24,192.168.0.0/16,198.18.0.0/15,198.51.100.0/24,203.0.113.0/24,224.0.0.0/4,240.0.0.0/4,::/128,::1/128,64:ff9b::/96,2001::/32,2001:db8::/32,2002::/16,fc00::/7,fe80::/10,ff00::/8}")
+                        List<String> blockedNetworks,
+                        @Value("${urlchecker.policy.allowed-networks:}") List<String> allowedNetworks) {
+        this.checkTld = checkTld;
+        this.tlds = checkTld ? loadTlds(tldFile) : Set.of();
+        this.blocked = parseAll(blockedNetworks);
+        this.allowed = parseAll(allowedNetworks);
+    }
+
+    /**
+     * Checks the host of {@code uri} without any network I/O. Returns why it must not be
+     * probed, or {@code null} if it may be.
+     */
+    public Rejection check(URI uri) {
+        String host = uri.getHost();
+        if (host.startsWith("[") || IPV4_LITERAL.matcher(host).matches()) {
+            InetAddress address;
+            try {
+                // A literal is parsed in place; no lookup happens.
+                address = InetAddress.getByName(host);
+            } catch (UnknownHostException e) {
+                return new Rejection(FailureClass.INVALID_URL, "invalid IP address " + host);
+            }
+            return isBlocked(address) ? new Rejection(FailureClass.BLOCKED, "address " + address.getHostAddress() + " is not allowed") : null;
+        }
+        if (checkTld && !tlds.contains(host.substring(host.lastIndexOf('.') + 1))) {
+            return new Rejection(FailureClass.INVALID_URL, "unknown top-level domain in " + host);
+        }
+        return null;
+    }
+
+    /**
+     * Checks the addresses {@code host} resolved to. A single blocked address is enough to
+     * refuse the host, since the HTTP client may connect to any of them.
+     */
+    public Rejection check(String host, List<InetAddress> addresses) {
+        for (InetAddress address : addresses) {
+            if (isBlocked(address)) {
+                return new Rejection(FailureClass.BLOCKED, host + " resolves to " + address.getHostAddress() + ", which is not allowed");
+            }
+        }
+        return null;
+    }
+
+    private boolean isBlocked(InetAddress address) {
+        return matchesAny(blocked, address) && !matchesAny(allowed, address);
+    }
+
+    private static boolean matchesAny(List<Cidr> networks, InetAddress address) {
+        byte[] bytes = address.getAddress();
+        for (Cidr network : networks) {
+            if (network.contains(bytes)) {
+                return true;
+            }
+        }
+        return false;
+    }
+
+    private static Set<String> loadTlds(Resource file) {
+        Set<String> tlds = new HashSet<>(2048);
+        try (BufferedReader reader = new BufferedReader(new InputStreamReader(file.getInputStream(), StandardCharsets.UTF_8))) {
+            for (String line = reader.readLine(); line != null; line = reader.readLine()) {
+                line = line.trim();
+                if (!line.isEmpty() && !line.startsWith("#")) {
+                    tlds.add(line.toLowerCase(Locale.ROOT));
+                }
+            }
+        } catch (IOException e) {
+            throw new UncheckedIOException("Could not read TLD list " + file, e);
+        }
+        return Set.copyOf(tlds);
+    }
+
+    private static List<Cidr> parseAll(List<String> networks) {
+        return networks.stream()
+                .map(String::trim)
+                .filter(n -> !n.isEmpty())
+                .map(Cidr::parse)
+                .toList();
+    }
+
+    /** Why a URL was refused before probing: {@code INVALID_URL} or {@code BLOCKED}, and the detail. */
+    public record Rejection(FailureClass failure, String reason) {
+    }
+
+    /** An IPv4 or IPv6 network in CIDR notation. */
+    record Cidr(byte[] network, int prefix) {
+
+        static Cidr parse(String cidr) {
+            int slash = cidr.indexOf('/');
+            String literal = slash < 0 ? cidr : cidr.substring(0, slash);
+            if (!literal.contains(":") && !IPV4_LITERAL.matcher(literal).matches()) {
+                // getByName would otherwise try to resolve it.
+                throw new IllegalArgumentException("Not an IP network: " + cidr);
+            }
+            try {
+                byte[] network = InetAddress.getByName(literal).getAddress();
+                int prefix = slash < 0 ? network.length * 8 : Integer.parseInt(cidr.substring(slash + 1));
+                if (prefix < 0 || prefix > network.length * 8) {
+                    throw new IllegalArgumentException("Invalid prefix length in " + cidr);
+                }
+                return new Cidr(network, prefix);
+            } catch (UnknownHostException | NumberFormatException e) {
+                throw new IllegalArgumentException("Not an IP network: " + cidr, e);
+            }
+        }
+
+        boolean contains(byte[] address) {
+            if (address.length != network.length) {
+                return false;
+            }
+            int full = prefix / 8;
+            for (int i = 0; i < full; i++) {
+                if (address[i] != network[i]) {
+                    return false;
+                }
+            }
+            int rest = prefix % 8;
+            if (rest == 0) {
+                return true;
+            }
+            int mask = 0xff << (8 - rest);
+            return (address[full] & mask) == (network[full] & mask);
+        }
+    }
+}
@@ -0,0 +1,121 @@
+package com.urlvalidator.service;
+
+import com.urlvalidator.model.CacheMode;
+import com.urlvalidator.model.CheckResult;
+import com.urlvalidator.model.FailureClass;
+import com.urlvalidator.model.Priority;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Service;
+
+import java.time.Duration;
+import java.util.concurrent.CompletableFuture;
+import java.util.concurrent.TimeUnit;
+
+/**
+ * Entry point for checking a URL: consults the result cache and only calls
+ * {@link UrlChecker} when no fresh result is available. Concurrent misses for the
+ * same normalized URL share a single probe. Fresh results are also handed to the
+ * {@link ResultStore}, if enabled, so they survive a restart.
+ *
+ * <p>Each caller has its own deadline. A caller whose deadline passes gets a
+ * {@code DEADLINE} result while the shared probe keeps running for the others and still
+ * fills the cache.
+ *
+ * <p>In cluster mode a URL whose host another instance owns ({@link ClusterRouter}) is
+ * forwarded there instead of probed here, so that instance's cache, coalescing and
+ * politeness limits apply; if the owner cannot be reached the URL is checked locally.
+ */
+@Service
+public class UrlCheckService {
+
+    private final UrlChecker checker;
+    private final UrlNormalizer normalizer;
+    private final ResultCache cache;
+    private final InFlightChecks inFlight;
+    private final ResultStore store;
+    private final ClusterRouter cluster;
+    private final Duration defaultDeadline;
+    private final Duration maxDeadline;
+
+    public UrlCheckService(UrlChecker checker, UrlNormalizer normalizer, ResultCache cache, InFlightChecks inFlight,
+                           ResultStore store, ClusterRouter cluster,
+                           @Value("${urlchecker.check.default-deadline:30s}") Duration defaultDeadline,
+                           @Value("${urlchecker.check.max-deadline:60s}") Duration maxDeadline) {
+        this.checker = checker;
+        this.normalizer = normalizer;
+        this.cache = cache;
+        this.inFlight = inFlight;
+        this.store = store;
+        this.cluster = cluster;
+        this.defaultDeadline = defaultDeadline;
+        this.maxDeadline = maxDeadline;
+    }
+
+    /**
+     * Checks {@code url} without blocking the caller. The future completes with a cached
+     * result immediately, or when the (possibly shared) probe finishes, or with a
+     * {@code DEADLINE} failure once {@code deadline} has passed. A probe shared by several
+     * callers keeps the lane of the caller that started it.
+     *
+     * @param deadline how long this caller waits, or {@code null} for the default
+     * @param priority the lane the probe's requests wait in
+     */
+    public CompletableFuture<CheckResult> checkAsync(String url, CacheMode mode, Duration deadline,
+                                                     Priority priority) {
+        return check(url, mode, deadline, priority, true);
+    }
+
+    /**
+     * Checks {@code url} on this instance, which a peer picked as the owner of its host. The
+     * check is never forwarded again, so peers that briefly disagree about ownership (one of
+     * them has just marked another down) cannot pass it back and forth.
+     */
+    public CompletableFuture<CheckResult> checkOwned(String url, CacheMode mode, Duration deadline,
+                                                     Priority priority) {
+        return check(url, mode, deadline, priority, false);
+    }
+
+    private CompletableFuture<CheckResult> check(String url, CacheMode mode, Duration deadline, Priority priority,
+                                                 boolean route) {
+        UrlNormalizer.Normalized normalized = normalizer.canonicalize(url);
+        if (!normalized.valid()) {
+            // Rejected before any network I/O; there is nothing worth caching or sharing.
+            return checker.checkAsync(url, priority);
+        }
+        String key = normalized.url();
+        if (mode == CacheMode.DEFAULT) {
+            CheckResult cached = cache.get(key, url);
+            if (cached != null) {
+                return CompletableFuture.completedFuture(cached);
+            }
+        }
+
+        String owner = route ? cluster.ownerOf(normalized.uri().getHost()) : null;
+        return inFlight.execute(key, () -> owner == null ? probe(url, key, mode, priority)
+                        : cluster.forward(owner, url, mode, priority).thenCompose(result -> result != null
+                                ? CompletableFuture.completedFuture(result) : probe(url, key, mode, priority)))
+                .thenApply(result -> result.forUrl(url))
+                .completeOnTimeout(CheckResult.deadlineExceeded(url, null), deadline(deadline).toMillis(),
+                        TimeUnit.MILLISECONDS);
+    }
+
+    private CompletableFuture<CheckResult> probe(String url, String key, CacheMode mode, Priority priority) {
+        // A probe cut off by its deadline, or skipped because its host is down, says nothing about the URL,
+        // so it is not cached.
+        return checker.checkAsync(url, priority).thenApply(result -> {
+            if (mode != CacheMode.BYPASS && result.failure() != FailureClass.DEADLINE
+                    && result.failure() != FailureClass.HOST_DOWN) {
+                cache.put(key, result);
+                store.save(key, result);
+            }
+            return result;
+        });
+    }
+
+    private Duration deadline(Duration requested) {
+        if (requested == null || requested.isNegative() || requested.isZero()) {
+            return defaultDeadline;
+        }
+        return requested.compareTo(maxDeadline) > 0 ? maxDeadline : requested;
+    }
+}
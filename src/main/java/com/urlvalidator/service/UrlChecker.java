@@ -1,104 +1,712 @@
 package com.urlvalidator.service;
 
+import com.urlvalidator.model.CheckResult;
+import com.urlvalidator.model.FailureClass;
+import com.urlvalidator.model.Priority;
+import com.urlvalidator.model.RedirectHop;
+import com.urlvalidator.model.Timings;
+import com.urlvalidator.model.TlsInfo;
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+import org.springframework.beans.factory.annotation.Qualifier;
+import org.springframework.beans.factory.annotation.Value;
 import org.springframework.stereotype.Service;
 
+import java.io.IOException;
+import java.net.ConnectException;
+import java.net.NoRouteToHostException;
 import java.net.URI;
-import java.net.URLConnection;
+import java.net.UnknownHostException;
+import java.nio.ByteBuffer;
 import java.net.http.HttpClient;
+import java.net.http.HttpConnectTimeoutException;
 import java.net.http.HttpRequest;
 import java.net.http.HttpResponse;
+import java.net.http.HttpTimeoutException;
 import java.time.Duration;
+import java.time.Instant;
+import java.time.ZonedDateTime;
+import java.time.format.DateTimeFormatter;
+import java.time.format.DateTimeParseException;
+import java.util.ArrayList;
+import java.util.HashSet;
+import java.util.List;
+import java.util.Optional;
+import java.util.Set;
 import java.util.concurrent.CompletableFuture;
+import java.util.concurrent.CompletionException;
+import java.util.concurrent.CompletionStage;
+import java.util.concurrent.Flow;
+import java.util.concurrent.ScheduledExecutorService;
+import java.util.concurrent.ScheduledFuture;
 import java.util.concurrent.TimeUnit;
+import java.util.concurrent.TimeoutException;
+import java.util.concurrent.atomic.AtomicBoolean;
+import java.util.function.Function;
+
+import javax.net.ssl.SSLException;
 
 @Service
 public class UrlChecker {
 
+    private static final Logger log = LoggerFactory.getLogger(UrlChecker.class);
+
     private static final String USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36";
+    private static final Duration TIMEOUT_GRACE = Duration.ofSeconds(1);
+
+    private final HttpClient httpClient;
+    private final UrlNormalizer normalizer;
+    private final TargetPolicy targetPolicy;
+    private final DnsResolver dnsResolver;
+    private final CheckLogger checkLogger;
+    private final CheckMetrics metrics;
+    private final HostScheduler hostScheduler;
+    private final HostLatencies hostLatencies;
+    private final HostMethods hostMethods;
+    private final HostBreakers hostBreakers;
+    private final PermanentRedirects permanentRedirects;
+    private final PeerCertificates peerCertificates;
+    private final ScheduledExecutorService timer;
+    private final Duration maxQueueWait;
+    private final Duration maxRetryWait;
+    private final Duration maxDeadline;
+    private final boolean hedging;
+    private final Duration minHedgeDelay;
+    private final Duration maxHedgeDelay;
+    private final boolean rangeRequests;
+    private final HttpClient.Redirect redirectPolicy;
+    private final int maxHops;
 
-    public UrlChecker() {
-        System.out.println("[UrlChecker] Initialized");
+    public UrlChecker(HttpClient httpClient, UrlNormalizer normalizer, TargetPolicy targetPolicy,
+                      DnsResolver dnsResolver, CheckLogger checkLogger, CheckMetrics metrics,
+                      HostScheduler hostScheduler, HostLatencies hostLatencies, HostMethods hostMethods,
+                      HostBreakers hostBreakers, PermanentRedirects permanentRedirects,
+                      PeerCertificates peerCertificates,
+                      @Qualifier("checkScheduler") ScheduledExecutorService timer,
+                      @Value("${urlchecker.politeness.max-queue-wait:60s}") Duration maxQueueWait,
+                      @Value("${urlchecker.politeness.max-retry-wait:30s}") Duration maxRetryWait,
+                      @Value("${urlchecker.check.max-deadline:60s}") Duration maxDeadline,
+                      @Value("${urlchecker.hedging.enabled:true}") boolean hedging,
+                      @Value("${urlchecker.hedging.min-delay:250ms}") Duration minHedgeDelay,
+                      @Value("${urlchecker.hedging.max-delay:2s}") Duration maxHedgeDelay,
+                      @Value("${urlchecker.fallback.range-requests:true}") boolean rangeRequests,
+                      @Value("${urlchecker.http.redirect:NEVER}") HttpClient.Redirect redirectPolicy,
+                      @Value("${urlchecker.redirects.max-hops:10}") int maxHops) {
+        this.httpClient = httpClient;
+        this.normalizer = normalizer;
+        this.targetPolicy = targetPolicy;
+        this.dnsResolver = dnsResolver;
+        this.checkLogger = checkLogger;
+        this.metrics = metrics;
+        this.hostScheduler = hostScheduler;
+        this.hostLatencies = hostLatencies;
+        this.hostMethods = hostMethods;
+        this.hostBreakers = hostBreakers;
+        this.permanentRedirects = permanentRedirects;
+        this.peerCertificates = peerCertificates;
+        this.timer = timer;
+        this.maxQueueWait = maxQueueWait;
+        this.maxRetryWait = maxRetryWait;
+        this.maxDeadline = maxDeadline;
+        this.hedging = hedging;
+        this.minHedgeDelay = minHedgeDelay;
+        this.maxHedgeDelay = maxHedgeDelay;
+        this.rangeRequests = rangeRequests;
+        this.redirectPolicy = redirectPolicy;
+        this.maxHops = maxHops;
     }
 
     public boolean isReachable(String url) {
-        System.out.println("[UrlChecker.isReachable] Called with: " + url);
-        
-        try {
-            if (!url.startsWith("http://") && !url.startsWith("https://")) {
-                url = "https://" + url;
-            }
-            
-            System.out.println("[UrlChecker] URL to check: " + url);
-            
-            // Parse URL to validate format
-            URI uri = new URI(url);
-            System.out.println("[UrlChecker] URI parsed successfully");
-            
-            // Try with async HTTP client to avoid blocking issues
-            HttpClient httpClient = HttpClient.newBuilder()
-                    .connectTimeout(Duration.ofSeconds(10))
-                    .build();
-            
-            System.out.println("[UrlChecker] HttpClient created");
-            
-            // Create HEAD request
-            HttpRequest request = HttpRequest.newBuilder()
-                    .uri(uri)
-                    .timeout(Duration.ofSeconds(10))
-                    .method("HEAD", HttpRequest.BodyPublishers.noBody())
-                    .header("User-Agent", USER_AGENT)
-                    .build();
-            
-            System.out.println("[UrlChecker] Request created, attempting to send...");
-            
-            // Use sendAsync with a timeout wrapper
-            CompletableFuture<HttpResponse<Void>> future = httpClient.sendAsync(
-                    request, 
-                    HttpResponse.BodyHandlers.discarding()
-            );
-            
-            System.out.println("[UrlChecker] Async request sent");
-            
-            HttpResponse<Void> response = future.get(15, TimeUnit.SECONDS);
-            
-            System.out.println("[UrlChecker] Got response: " + response.statusCode());
-            
-            if (response.statusCode() >= 200 && response.statusCode() < 400) {
-                System.out.println("[UrlChecker] ✓ URL is reachable");
+        return checkAsync(url, Priority.INTERACTIVE).join().reachable();
+    }
+
+    /**
+     * Resolves the host, then sends a HEAD request and, if that does not return 2xx/3xx, a GET.
+     * Unless {@code urlchecker.http.redirect} is {@code NEVER}, redirects are followed hop by hop.
+     * URLs refused by {@link TargetPolicy}, hosts that do not resolve and hosts whose circuit is open
+     * ({@link HostBreakers}) fail without opening a socket. Request timeouts
+     * adapt to each host's observed latency, and a check still running after
+     * {@code urlchecker.check.max-deadline} fails with {@code DEADLINE}. Requests wait for the
+     * {@link HostScheduler} in {@code priority}'s lane. No thread waits on the network, and the
+     * returned future never completes exceptionally.
+     */
+    public CompletableFuture<CheckResult> checkAsync(String url, Priority priority) {
+        long started = System.nanoTime();
+        metrics.checkStarted();
+        return probe(url, priority, started)
+                .completeOnTimeout(null, maxDeadline.toMillis(), TimeUnit.MILLISECONDS)
+                .thenApply(result -> {
+                    if (result == null) {
+                        result = CheckResult.deadlineExceeded(url, new Timings(null, null, millisSince(started)));
+                    }
+                    metrics.checkFinished(result);
+                    checkLogger.log(result);
+                    return result;
+                });
+    }
+
+    private CompletableFuture<CheckResult> probe(String url, Priority priority, long started) {
+        // Malformed input is rejected here without any network I/O; everything else is probed in canonical form.
+        UrlNormalizer.Normalized normalized = normalizer.canonicalize(url);
+        if (!normalized.valid()) {
+            return CompletableFuture.completedFuture(CheckResult.failed(url, FailureClass.INVALID_URL, normalized.error()));
+        }
+        URI uri = normalized.uri();
+        TargetPolicy.Rejection rejection = targetPolicy.check(uri);
+        if (rejection != null) {
+            return CompletableFuture.completedFuture(CheckResult.failed(url, rejection.failure(), rejection.reason()));
+        }
+
+        return dnsResolver.resolve(uri.getHost()).thenCompose(resolution -> {
+            Probe probe = new Probe(url, uri, priority, started, millisSince(started));
+            if (!resolution.resolved()) {
+                return CompletableFuture.completedFuture(probe.failed(FailureClass.DNS, resolution.error()));
+            }
+            // Names can point anywhere, so the answer is checked against the block list too.
+            TargetPolicy.Rejection blocked = targetPolicy.check(uri.getHost(), resolution.addresses());
+            if (blocked != null) {
+                return CompletableFuture.completedFuture(probe.failed(blocked.failure(), blocked.reason()));
+            }
+            HostBreakers.Call call = hostBreakers.tryAcquire(uri.getHost());
+            if (call == null) {
+                return CompletableFuture.completedFuture(probe.failed(FailureClass.HOST_DOWN, hostDown(uri.getHost())));
+            }
+            CompletableFuture<CheckResult> result = probe.run();
+            result.whenComplete((checked, error) -> call.finish(probe.health()));
+            return result;
+        });
+    }
+
+    /** Maps a probe exception to the stage it failed at, looking through wrapped causes. */
+    static FailureClass classify(Throwable error) {
+        for (Throwable t = error; t != null; t = t.getCause()) {
+            if (t instanceof RedirectException) {
+                return ((RedirectException) t).failure;
+            }
+            if (t instanceof UnknownHostException) {
+                return FailureClass.DNS;
+            }
+            if (t instanceof SSLException) {
+                return FailureClass.TLS;
+            }
+            if (t instanceof HttpConnectTimeoutException || t instanceof ConnectException
+                    || t instanceof NoRouteToHostException) {
+                return FailureClass.CONNECT;
+            }
+        }
+        return FailureClass.HTTP;
+    }
+
+    /** Whether {@code error} is a request that got no response in time; connect timeouts are not. */
+    private static boolean timedOut(Throwable error) {
+        for (Throwable t = error; t != null; t = t.getCause()) {
+            if (t instanceof HttpConnectTimeoutException) {
+                return false;
+            }
+            if (t instanceof HttpTimeoutException || t instanceof TimeoutException) {
                 return true;
             }
-            
-            // If HEAD returned error, try GET
-            System.out.println("[UrlChecker] HEAD failed with status " + response.statusCode() + ", trying GET");
-            
-            HttpRequest getRequest = HttpRequest.newBuilder()
-                    .uri(uri)
-                    .timeout(Duration.ofSeconds(15))
-                    .GET()
-                    .header("User-Agent", USER_AGENT)
-                    .build();
-            
-            CompletableFuture<HttpResponse<Void>> getfuture = httpClient.sendAsync(
-                    getRequest,
-                    HttpResponse.BodyHandlers.discarding()
-            );
-            
-            HttpResponse<Void> getResponse = getfuture.get(20, TimeUnit.SECONDS);
-            
-            System.out.println("[UrlChecker] GET response: " + getResponse.statusCode());
-            
-            return getResponse.statusCode() >= 200 && getResponse.statusCode() < 400;
-            
-        } catch (java.util.concurrent.TimeoutException e) {
-            System.out.println("[UrlChecker] Timeout: " + e.getMessage());
-            return false;
-        } catch (Exception e) {
-            System.out.println("[UrlChecker] Exception: " + e.getClass().getSimpleName() + ": " + e.getMessage());
-            e.printStackTrace();
-            return false;
         }
+        return false;
     }
-}
 
+    private String hostDown(String host) {
+        long seconds = hostBreakers.retryIn(host).toSeconds();
+        return seconds > 0 ? "host recently down, next probe in " + seconds + "s"
+                : "host recently down, being probed again";
+    }
+
+    private static String describe(Throwable error) {
+        if (error instanceof TimeoutException) {
+            return "timed out";
+        }
+        return error.getMessage() != null ? error.getMessage() : error.getClass().getSimpleName();
+    }
+
+    /**
+     * Returns the delay a 429 or 503 response asked for in {@code Retry-After} (seconds or an
+     * HTTP date), or {@code null} if the response is not throttling us.
+     */
+    static Duration retryAfter(HttpResponse<?> response) {
+        int status = response.statusCode();
+        if (status != 429 && status != 503) {
+            return null;
+        }
+        Optional<String> header = response.headers().firstValue("Retry-After");
+        if (header.isEmpty()) {
+            return null;
+        }
+        String value = header.get().trim();
+        try {
+            if (value.chars().allMatch(Character::isDigit)) {
+                return Duration.ofSeconds(Long.parseLong(value));
+            }
+            Duration until = Duration.between(Instant.now(),
+                    ZonedDateTime.parse(value, DateTimeFormatter.RFC_1123_DATE_TIME).toInstant());
+            return until.isNegative() ? Duration.ZERO : until;
+        } catch (NumberFormatException | DateTimeParseException e) {
+            return null;
+        }
+    }
+
+    private static boolean isSuccess(int status) {
+        return status >= 200 && status < 400;
+    }
+
+    private static boolean isRedirect(int status) {
+        return status == 301 || status == 302 || status == 303 || status == 307 || status == 308;
+    }
+
+    /** Resolves a {@code Location} header against the URL that sent it, tolerating unescaped characters. */
+    static String resolve(URI from, String location) {
+        try {
+            return from.resolve(location).toString();
+        } catch (IllegalArgumentException e) {
+            // Not a valid URI reference as sent; make it absolute by hand and let canonicalization repair it.
+            String origin = from.getScheme() + "://" + from.getRawAuthority();
+            if (location.startsWith("//")) {
+                return from.getScheme() + ":" + location;
+            }
+            if (location.startsWith("/")) {
+                return origin + location;
+            }
+            if (location.matches("(?i)^https?://.*")) {
+                return location;
+            }
+            String path = from.getRawPath();
+            return origin + path.substring(0, path.lastIndexOf('/') + 1) + location;
+        }
+    }
+
+    private static long millisSince(long startNanos) {
+        return TimeUnit.NANOSECONDS.toMillis(System.nanoTime() - startNanos);
+    }
+
+    /**
+     * One check of a resolved URL. HEAD is sent first and GET is the fallback when HEAD does
+     * not return 2xx/3xx. If HEAD is still outstanding after the hedge delay, GET is sent
+     * alongside it and the first successful answer completes the check. Hosts where HEAD is
+     * known to fail get GET straight away. GET asks for a single byte and stops reading once
+     * the headers have arrived, so no page body is downloaded. HEAD and GET each follow
+     * redirects on their own, vetting every hop like the original URL.
+     */
+    private final class Probe {
+
+        private final String url;
+        private final URI uri;
+        private final String host;
+        private final Priority priority;
+        private final long started;
+        private final long dnsMillis;
+        private final AtomicBoolean getStarted = new AtomicBoolean();
+        private volatile boolean answered;
+        private volatile boolean unresponsive;
+        // The last https URL whose handshake failed, to look up the certificate it was refused for.
+        private volatile URI tlsFailed;
+        private final CompletableFuture<Attempt> get = new CompletableFuture<>();
+        private final CompletableFuture<CheckResult> outcome = new CompletableFuture<>();
+
+        Probe(String url, URI uri, Priority priority, long started, long dnsMillis) {
+            this.url = url;
+            this.uri = uri;
+            this.host = uri.getHost();
+            this.priority = priority;
+            this.started = started;
+            this.dnsMillis = dnsMillis;
+        }
+
+        CompletableFuture<CheckResult> run() {
+            if (hostMethods.skipHead(host)) {
+                metrics.headSkipped();
+                startGet()
+                        .handle((attempt, error) -> {
+                            if (error != null) {
+                                return failed("GET", error);
+                            }
+                            if (!attempt.succeeded()) {
+                                // GET is failing as well, so HEAD gets another chance next time.
+                                hostMethods.forget(host);
+                            }
+                            return completed(attempt);
+                        })
+                        .thenAccept(outcome::complete);
+                return outcome;
+            }
+
+            attempt("HEAD")
+                    .handle((head, error) -> {
+                        if (error == null && head.succeeded()) {
+                            return CompletableFuture.completedFuture(completed(head));
+                        }
+                        if (error != null && !getStarted.get()) {
+                            return CompletableFuture.completedFuture(failed("HEAD", error));
+                        }
+                        boolean headRejected = error == null;
+                        if (headRejected) {
+                            // If HEAD returned error, try GET
+                            log.debug("HEAD {} returned {}, retrying with GET", uri, head.status());
+                            metrics.headFallback();
+                        }
+                        return startGet().handle((attempt, getError) -> {
+                            if (getError != null) {
+                                return failed("GET", getError);
+                            }
+                            if (headRejected && attempt.succeeded()) {
+                                hostMethods.headFailed(host);
+                            }
+                            return completed(attempt);
+                        });
+                    })
+                    .thenCompose(Function.identity())
+                    .whenComplete((result, error) -> outcome.complete(result != null ? result : failed("HEAD", error)));
+
+            // A hedged GET only wins with a success; otherwise the HEAD path above decides.
+            get.thenAccept(attempt -> {
+                if (attempt.succeeded()) {
+                    outcome.complete(completed(attempt));
+                }
+            });
+            Duration delay = hedgeDelay();
+            if (delay != null) {
+                ScheduledFuture<?> hedge = timer.schedule(this::hedge, delay.toMillis(), TimeUnit.MILLISECONDS);
+                outcome.whenComplete((result, error) -> hedge.cancel(false));
+            }
+            return outcome;
+        }
+
+        /** Whether the host answered any request of this probe, or only failed to connect or respond. */
+        HostBreakers.Outcome health() {
+            if (answered) {
+                return HostBreakers.Outcome.ANSWERED;
+            }
+            return unresponsive ? HostBreakers.Outcome.FAILED : HostBreakers.Outcome.IGNORED;
+        }
+
+        private void hedge() {
+            if (!outcome.isDone() && !getStarted.get()) {
+                log.debug("HEAD {} still pending after hedge delay, sending GET alongside", uri);
+                metrics.hedged();
+                startGet();
+            }
+        }
+
+        private CompletableFuture<Attempt> startGet() {
+            if (getStarted.compareAndSet(false, true)) {
+                attempt("GET").whenComplete((attempt, error) -> {
+                    if (error != null) {
+                        get.completeExceptionally(error);
+                    } else {
+                        get.complete(attempt);
+                    }
+                });
+            }
+            return get;
+        }
+
+        /** Waits for p95 of the host's recent latency, within the configured bounds, before hedging. */
+        private Duration hedgeDelay() {
+            if (!hedging) {
+                return null;
+            }
+            Long p95 = hostLatencies.percentile(host, 0.95);
+            Duration delay = p95 != null ? Duration.ofMillis(p95) : maxHedgeDelay;
+            if (delay.compareTo(minHedgeDelay) < 0) {
+                return minHedgeDelay;
+            }
+            return delay.compareTo(maxHedgeDelay) > 0 ? maxHedgeDelay : delay;
+        }
+
+        /**
+         * Sends {@code method} to the probed URL and, when redirects are followed, on along the
+         * chain until a response that is not a redirect. The returned attempt is that final
+         * exchange, with the hops before it.
+         */
+        private CompletableFuture<Attempt> attempt(String method) {
+            Set<String> seen = new HashSet<>();
+            seen.add(uri.toString());
+            return follow(method, uri, new ArrayList<>(), seen);
+        }
+
+        private CompletableFuture<Attempt> follow(String method, URI target, List<RedirectHop> hops, Set<String> seen) {
+            PermanentRedirects.Redirect known = redirectPolicy != HttpClient.Redirect.NEVER
+                    ? permanentRedirects.get(target) : null;
+            if (known != null) {
+                hops.add(new RedirectHop(target.toString(), known.status(), null, true));
+                return next(method, known.location(), hops, seen);
+            }
+            return exchange(target, method, true).thenCompose(attempt -> {
+                UrlNormalizer.Normalized location = redirectOf(target, attempt.response);
+                if (location == null) {
+                    attempt.target = target;
+                    attempt.hops = hops;
+                    return CompletableFuture.completedFuture(attempt);
+                }
+                hops.add(new RedirectHop(target.toString(), attempt.status(), attempt.firstByteMillis(), null));
+                metrics.redirectFollowed();
+                if (!location.valid()) {
+                    return CompletableFuture.failedFuture(new RedirectException(FailureClass.INVALID_URL,
+                            "redirect to an invalid URL: " + location.error(), hops));
+                }
+                permanentRedirects.put(target, location.uri(), attempt.status());
+                return next(method, location.uri(), hops, seen);
+            });
+        }
+
+        /** Vets a redirect target like the probed URL itself (loops and hop limit first), then follows it. */
+        private CompletableFuture<Attempt> next(String method, URI location, List<RedirectHop> hops, Set<String> seen) {
+            if (!seen.add(location.toString())) {
+                return CompletableFuture.failedFuture(
+                        new RedirectException(FailureClass.HTTP, "redirect loop at " + location, hops));
+            }
+            if (hops.size() > maxHops) {
+                return CompletableFuture.failedFuture(
+                        new RedirectException(FailureClass.HTTP, "more than " + maxHops + " redirects", hops));
+            }
+            TargetPolicy.Rejection rejection = targetPolicy.check(location);
+            if (rejection != null) {
+                return CompletableFuture.failedFuture(new RedirectException(rejection.failure(),
+                        "redirect to " + location + ": " + rejection.reason(), hops));
+            }
+            return dnsResolver.resolve(location.getHost()).thenCompose(resolution -> {
+                if (!resolution.resolved()) {
+                    return CompletableFuture.failedFuture(new RedirectException(FailureClass.DNS,
+                            "redirect to " + location + ": " + resolution.error(), hops));
+                }
+                TargetPolicy.Rejection blocked = targetPolicy.check(location.getHost(), resolution.addresses());
+                if (blocked != null) {
+                    return CompletableFuture.failedFuture(new RedirectException(blocked.failure(),
+                            "redirect to " + location + ": " + blocked.reason(), hops));
+                }
+                return follow(method, location, hops, seen);
+            });
+        }
 
+        /** The canonical target of a redirect to follow, or {@code null} if {@code response} is final. */
+        private UrlNormalizer.Normalized redirectOf(URI from, HttpResponse<Void> response) {
+            if (redirectPolicy == HttpClient.Redirect.NEVER || !isRedirect(response.statusCode())) {
+                return null;
+            }
+            Optional<String> header = response.headers().firstValue("Location");
+            if (header.isEmpty() || header.get().isBlank()) {
+                return null;
+            }
+            UrlNormalizer.Normalized location = normalizer.canonicalize(resolve(from, header.get().trim()));
+            // Like the JDK client's NORMAL policy: never from https down to http.
+            if (location.valid() && redirectPolicy == HttpClient.Redirect.NORMAL
+                    && "https".equals(from.getScheme()) && "http".equals(location.uri().getScheme())) {
+                return null;
+            }
+            return location;
+        }
 
+        /**
+         * Sends one request once the host scheduler grants a permit. A 429/503 with
+         * {@code Retry-After} pauses the host, and if the requested wait is short enough the
+         * request is sent once more after it.
+         */
+        private CompletableFuture<Attempt> exchange(URI target, String method, boolean mayRetry) {
+            String targetHost = target.getHost();
+            return hostScheduler.acquire(targetHost, priority)
+                    .orTimeout(maxQueueWait.toMillis(), TimeUnit.MILLISECONDS)
+                    .thenCompose(permit -> send(target, method).whenComplete((attempt, error) -> {
+                        Duration retryAfter = attempt != null ? retryAfter(attempt.response) : null;
+                        if (retryAfter != null) {
+                            // Pause the host before releasing, so no queued request slips in first.
+                            hostScheduler.backOff(targetHost, retryAfter);
+                        }
+                        permit.release();
+                    }))
+                    .thenCompose(attempt -> {
+                        Duration retryAfter = retryAfter(attempt.response);
+                        if (!mayRetry || retryAfter == null || retryAfter.compareTo(maxRetryWait) > 0) {
+                            return CompletableFuture.completedFuture(attempt);
+                        }
+                        log.debug("{} {} returned {} with Retry-After {}s, retrying", method, target,
+                                attempt.status(), retryAfter.toSeconds());
+                        return exchange(target, method, false);
+                    });
+        }
+
+        private CompletableFuture<Attempt> send(URI target, String method) {
+            String targetHost = target.getHost();
+            Duration timeout = hostLatencies.timeoutFor(targetHost);
+            boolean isGet = "GET".equals(method);
+            HttpRequest.Builder builder = HttpRequest.newBuilder()
+                    .uri(target)
+                    .timeout(timeout)
+                    .method(method, HttpRequest.BodyPublishers.noBody())
+                    .header("User-Agent", USER_AGENT);
+            if (isGet && rangeRequests) {
+                builder.header("Range", "bytes=0-0");
+            }
+            Attempt attempt = new Attempt(method, isGet && rangeRequests);
+            // The body handler is invoked as soon as the status line and headers arrive.
+            HttpResponse.BodyHandler<Void> handler = info -> {
+                attempt.firstByteNanos = System.nanoTime();
+                return isGet ? new HeadersOnly() : HttpResponse.BodySubscribers.discarding();
+            };
+            HttpRequest request = builder.build();
+            return httpClient.sendAsync(request, handler)
+                    // Backstop in case the client's own request timeout does not fire.
+                    .orTimeout(timeout.plus(TIMEOUT_GRACE).toMillis(), TimeUnit.MILLISECONDS)
+                    .whenComplete((response, error) -> {
+                        FailureClass stage = error != null ? classify(error) : null;
+                        if (stage == FailureClass.TLS) {
+                            tlsFailed = target;
+                        }
+                        if (timedOut(error) && attempt.firstByteMillis() == null) {
+                            hostLatencies.timedOut(targetHost, timeout);
+                        }
+                        // Only the probed host's own answers count towards its circuit, not those of redirect targets.
+                        if (!host.equals(targetHost)) {
+                            return;
+                        }
+                        if (error == null) {
+                            answered = true;
+                        } else if (stage == FailureClass.CONNECT || stage == FailureClass.HTTP) {
+                            // TLS and DNS errors are about the setup, not about whether the host is up.
+                            unresponsive = true;
+                        }
+                    })
+                    .thenApply(response -> {
+                        attempt.response = response;
+                        Long firstByte = attempt.firstByteMillis();
+                        if (firstByte != null) {
+                            hostLatencies.record(targetHost, firstByte);
+                        }
+                        return attempt;
+                    });
+        }
+
+        private CheckResult completed(Attempt attempt) {
+            int status = attempt.status();
+            String finalUrl = attempt.redirected() ? attempt.target.toString() : null;
+            List<RedirectHop> redirects = attempt.redirected() ? attempt.hops : null;
+            TlsInfo tls = tls(attempt);
+            if (attempt.succeeded()) {
+                return new CheckResult(url, true, status, attempt.method, null, null, finalUrl, redirects, tls,
+                        timings(attempt), null);
+            }
+            return new CheckResult(url, false, status, attempt.method, FailureClass.HTTP, "HTTP " + status,
+                    finalUrl, redirects, tls, timings(attempt), null);
+        }
+
+        private CheckResult failed(String method, Throwable error) {
+            Throwable cause = error instanceof CompletionException && error.getCause() != null ? error.getCause() : error;
+            // Network failures are expected outcomes; the stack trace is only useful when debugging.
+            log.debug("{} {} failed", method, uri, cause);
+            if (cause instanceof TimeoutException || cause instanceof HttpTimeoutException) {
+                metrics.timeout();
+            }
+            List<RedirectHop> redirects = cause instanceof RedirectException ? ((RedirectException) cause).hops : null;
+            FailureClass failure = classify(cause);
+            TlsInfo tls = failure == FailureClass.TLS ? rejectedCertificate() : null;
+            return new CheckResult(url, false, null, method, failure, describe(cause), null, redirects, tls,
+                    timings(null), null);
+        }
+
+        CheckResult failed(FailureClass failure, String error) {
+            return new CheckResult(url, false, null, null, failure, error, null, null, null, timings(null), null);
+        }
+
+        /** The TLS session of the final exchange, which a resumed session describes just as well. */
+        private TlsInfo tls(Attempt attempt) {
+            if (!peerCertificates.enabled() || !"https".equals(attempt.target.getScheme())) {
+                return null;
+            }
+            return attempt.response.sslSession()
+                    .map(session -> peerCertificates.describe(session, attempt.target.getHost()))
+                    .orElse(null);
+        }
+
+        /** The certificate the failed handshake refused, if the trust manager saw one. */
+        private TlsInfo rejectedCertificate() {
+            URI target = tlsFailed;
+            if (!peerCertificates.enabled() || target == null) {
+                return null;
+            }
+            return peerCertificates.rejected(target.getHost(), target.getPort() != -1 ? target.getPort() : 443);
+        }
+
+        private Timings timings(Attempt attempt) {
+            return new Timings(dnsMillis, attempt != null ? attempt.firstByteMillis() : null, millisSince(started));
+        }
+    }
+
+    /** A redirect chain that could not be followed, with the hops taken until then. */
+    static final class RedirectException extends IOException {
+
+        final FailureClass failure;
+        final List<RedirectHop> hops;
+
+        RedirectException(FailureClass failure, String message, List<RedirectHop> hops) {
+            super(message);
+            this.failure = failure;
+            this.hops = List.copyOf(hops);
+        }
+    }
+
+    /** One HTTP exchange of a probe and when its first response byte arrived. */
+    private static final class Attempt {
+
+        final String method;
+        final boolean ranged;
+        final long sentNanos = System.nanoTime();
+        volatile long firstByteNanos;
+        volatile HttpResponse<Void> response;
+        // Where the exchange went and the redirects that led there; set once it turned out to be final.
+        volatile URI target;
+        volatile List<RedirectHop> hops;
+
+        Attempt(String method, boolean ranged) {
+            this.method = method;
+            this.ranged = ranged;
+        }
+
+        int status() {
+            return response.statusCode();
+        }
+
+        // 416 to a one-byte range only means the resource is empty; the URL itself answered.
+        boolean succeeded() {
+            return isSuccess(status()) || (ranged && status() == 416);
+        }
+
+        boolean redirected() {
+            return hops != null && !hops.isEmpty();
+        }
+
+        Long firstByteMillis() {
+            return firstByteNanos == 0 ? null : TimeUnit.NANOSECONDS.toMillis(firstByteNanos - sentNanos);
+        }
+    }
+
+    /**
+     * Completes as soon as the headers are in and cancels the body, so the exchange is
+     * aborted instead of the whole page being read off the wire and thrown away.
+     */
+    private static final class HeadersOnly implements HttpResponse.BodySubscriber<Void> {
+
+        @Override
+        public CompletionStage<Void> getBody() {
+            return CompletableFuture.completedFuture(null);
+        }
+
+        @Override
+        public void onSubscribe(Flow.Subscription subscription) {
+            subscription.cancel();
+        }
+
+        @Override
+        public void onNext(List<ByteBuffer> item) {
+        }
+
+        @Override
+        public void onError(Throwable throwable) {
+        }
+
+        @Override
+        public void onComplete() {
+        }
+    }
+}
@@ -0,0 +1,273 @@
+package com.urlvalidator.service;
+
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Component;
+
+import java.net.IDN;
+import java.net.URI;
+import java.net.URISyntaxException;
+import java.nio.charset.StandardCharsets;
+import java.util.List;
+import java.util.Locale;
+import java.util.Set;
+import java.util.StringJoiner;
+import java.util.regex.Matcher;
+import java.util.regex.Pattern;
+import java.util.stream.Collectors;
+
+/**
+ * Reduces equivalent spellings of a URL to one canonical string, used both as the key for
+ * caching and coalescing and as the address that is actually probed.
+ *
+ * <p>Canonicalization adds {@code https://} when the scheme is missing, lower-cases scheme
+ * and host, converts internationalized host names to punycode, drops default ports and the
+ * fragment, and repairs percent-encoding: characters that are not allowed are encoded,
+ * stray {@code %} signs are escaped, escapes of unreserved characters are decoded and hex
+ * digits are upper-cased. Tracking parameters such as {@code utm_*} can optionally be
+ * removed from the query. Input that cannot be turned into a valid http(s) URL is rejected
+ * here, before any network I/O.
+ */
+@Component
+public class UrlNormalizer {
+
+    private static final int MAX_LENGTH = 2048;
+    private static final Pattern SCHEME = Pattern.compile("^([a-zA-Z][a-zA-Z0-9+.-]*)://");
+    private static final Pattern HOST_LABEL = Pattern.compile("[a-z0-9]([a-z0-9-]*[a-z0-9])?");
+    private static final Pattern IPV6_LITERAL = Pattern.compile("\\[[0-9a-f:.]+]");
+    private static final char[] HEX = "0123456789ABCDEF".toCharArray();
+    private static final String PATH_CHARS = "!$&'()*+,;=:@/";
+    private static final String QUERY_CHARS = PATH_CHARS + "?";
+
+    private final boolean stripTracking;
+    private final Set<String> trackingParams;
+
+    public UrlNormalizer(@Value("${urlchecker.normalize.strip-tracking-params:true}") boolean stripTracking,
+                         @Value("${urlchecker.normalize.tracking-params:utm_*,gclid,dclid,fbclid,msclkid,yclid,igshid,mc_cid,mc_eid,_ga,_gl}")
+                         List<String> trackingParams) {
+        this.stripTracking = stripTracking;
+        this.trackingParams = trackingParams.stream()
+                .map(p -> p.trim().toLowerCase(Locale.ROOT))
+                .filter(p -> !p.isEmpty())
+                .collect(Collectors.toSet());
+    }
+
+    /**
+     * Returns the canonical form of {@code url}, or the input trimmed but otherwise unchanged
+     * if it cannot be canonicalized.
+     */
+    public String normalize(String url) {
+        Normalized normalized = canonicalize(url);
+        return normalized.valid() ? normalized.url() : url.trim();
+    }
+
+    /** Canonicalizes {@code url}, or says why it is not a usable http(s) URL. */
+    public Normalized canonicalize(String url) {
+        // Browsers drop tabs and line breaks pasted into a URL; so do we.
+        String candidate = url.trim().replaceAll("[\\t\\r\\n]", "");
+        if (candidate.isEmpty()) {
+            return Normalized.rejected("empty url");
+        }
+        if (candidate.length() > MAX_LENGTH) {
+            return Normalized.rejected("url longer than " + MAX_LENGTH + " characters");
+        }
+
+        String scheme = "https";
+        Matcher schemeMatch = SCHEME.matcher(candidate);
+        if (schemeMatch.find()) {
+            scheme = schemeMatch.group(1).toLowerCase(Locale.ROOT);
+            if (!scheme.equals("http") && !scheme.equals("https")) {
+                return Normalized.rejected("unsupported scheme " + scheme);
+            }
+            candidate = candidate.substring(schemeMatch.end());
+        } else if (candidate.startsWith("//")) {
+            candidate = candidate.substring(2);
+        }
+        // Browsers treat backslashes in http(s) URLs as slashes.
+        candidate = candidate.replace('\\', '/');
+
+        int fragment = candidate.indexOf('#');
+        if (fragment >= 0) {
+            // The fragment never reaches the server, so it is dropped.
+            candidate = candidate.substring(0, fragment);
+        }
+        int authorityEnd = indexOfAny(candidate, "/?");
+        String authority = authorityEnd < 0 ? candidate : candidate.substring(0, authorityEnd);
+        String rest = authorityEnd < 0 ? "" : candidate.substring(authorityEnd);
+        int queryStart = rest.indexOf('?');
+        String path = queryStart < 0 ? rest : rest.substring(0, queryStart);
+        String query = queryStart < 0 ? null : rest.substring(queryStart + 1);
+
+        String userInfo = null;
+        int at = authority.lastIndexOf('@');
+        if (at >= 0) {
+            userInfo = authority.substring(0, at);
+            authority = authority.substring(at + 1);
+        }
+        int portStart = authority.startsWith("[") ? authority.indexOf(':', authority.indexOf(']')) : authority.lastIndexOf(':');
+        String host = portStart < 0 ? authority : authority.substring(0, portStart);
+        String portText = portStart < 0 ? "" : authority.substring(portStart + 1);
+
+        host = canonicalHost(host);
+        if (host == null) {
+            return Normalized.rejected("invalid host in " + url.trim());
+        }
+        int port = -1;
+        if (!portText.isEmpty()) {
+            if (!portText.chars().allMatch(Character::isDigit) || portText.length() > 5
+                    || Integer.parseInt(portText) < 1 || Integer.parseInt(portText) > 65535) {
+                return Normalized.rejected("invalid port " + portText);
+            }
+            port = Integer.parseInt(portText);
+            if ((port == 80 && scheme.equals("http")) || (port == 443 && scheme.equals("https"))) {
+                port = -1;
+            }
+        }
+
+        StringBuilder sb = new StringBuilder(candidate.length() + 16).append(scheme).append("://");
+        if (userInfo != null && !userInfo.isEmpty()) {
+            sb.append(repair(userInfo, "!$&'()*+,;=:")).append('@');
+        }
+        sb.append(host);
+        if (port != -1) {
+            sb.append(':').append(port);
+        }
+        sb.append(path.isEmpty() ? "/" : repair(path, PATH_CHARS));
+        if (query != null) {
+            String canonicalQuery = canonicalQuery(repair(query, QUERY_CHARS));
+            if (!canonicalQuery.isEmpty()) {
+                sb.append('?').append(canonicalQuery);
+            }
+        }
+
+        try {
+            URI uri = new URI(sb.toString()).normalize();
+            if (uri.getHost() == null) {
+                return Normalized.rejected("invalid host in " + url.trim());
+            }
+            return new Normalized(uri.toString(), uri, null);
+        } catch (URISyntaxException e) {
+            return Normalized.rejected(e.getMessage());
+        }
+    }
+
+    /** Lower-cased ASCII (punycode) host, or {@code null} if it is not a valid host name or IP literal. */
+    private static String canonicalHost(String host) {
+        String lower = host.toLowerCase(Locale.ROOT);
+        if (lower.startsWith("[")) {
+            return IPV6_LITERAL.matcher(lower).matches() ? lower : null;
+        }
+        if (lower.endsWith(".")) {
+            lower = lower.substring(0, lower.length() - 1);
+        }
+        String ascii;
+        try {
+            ascii = IDN.toASCII(lower, IDN.ALLOW_UNASSIGNED).toLowerCase(Locale.ROOT);
+        } catch (IllegalArgumentException e) {
+            return null;
+        }
+        if (ascii.isEmpty() || ascii.length() > 253) {
+            return null;
+        }
+        for (String label : ascii.split("\\.", -1)) {
+            if (label.length() > 63 || !HOST_LABEL.matcher(label).matches()) {
+                return null;
+            }
+        }
+        return ascii;
+    }
+
+    /** Drops tracking parameters and empty pieces from an already repaired query string. */
+    private String canonicalQuery(String query) {
+        if (!stripTracking) {
+            return query;
+        }
+        StringJoiner kept = new StringJoiner("&");
+        for (String param : query.split("&")) {
+            if (param.isEmpty()) {
+                continue;
+            }
+            int eq = param.indexOf('=');
+            String name = (eq < 0 ? param : param.substring(0, eq)).toLowerCase(Locale.ROOT);
+            if (!isTrackingParam(name)) {
+                kept.add(param);
+            }
+        }
+        return kept.toString();
+    }
+
+    private boolean isTrackingParam(String name) {
+        if (trackingParams.contains(name)) {
+            return true;
+        }
+        for (String pattern : trackingParams) {
+            if (pattern.endsWith("*") && name.startsWith(pattern.substring(0, pattern.length() - 1))) {
+                return true;
+            }
+        }
+        return false;
+    }
+
+    /**
+     * Percent-encodes everything outside the unreserved set and {@code allowed}, escapes
+     * {@code %} signs that do not start a valid escape, decodes escaped unreserved characters
+     * and upper-cases the hex digits of the escapes that remain.
+     */
+    static String repair(String part, String allowed) {
+        byte[] bytes = part.getBytes(StandardCharsets.UTF_8);
+        StringBuilder sb = new StringBuilder(bytes.length + 8);
+        for (int i = 0; i < bytes.length; i++) {
+            int b = bytes[i] & 0xff;
+            if (b == '%' && i + 2 < bytes.length && isHex(bytes[i + 1]) && isHex(bytes[i + 2])) {
+                int decoded = Character.digit(bytes[i + 1], 16) * 16 + Character.digit(bytes[i + 2], 16);
+                if (isUnreserved(decoded)) {
+                    sb.append((char) decoded);
+                } else {
+                    appendEscaped(sb, decoded);
+                }
+                i += 2;
+            } else if (isUnreserved(b) || (b < 0x80 && allowed.indexOf(b) >= 0)) {
+                sb.append((char) b);
+            } else {
+                appendEscaped(sb, b);
+            }
+        }
+        return sb.toString();
+    }
+
+    private static void appendEscaped(StringBuilder sb, int b) {
+        sb.append('%').append(HEX[b >> 4]).append(HEX[b & 0xf]);
+    }
+
+    private static boolean isUnreserved(int c) {
+        return (c >= 'a' && c <= 'z') || (c >= 'A' && c <= 'Z') || (c >= '0' && c <= '9')
+                || c == '-' || c == '.' || c == '_' || c == '~';
+    }
+
+    private static boolean isHex(byte b) {
+        return Character.digit(b, 16) >= 0;
+    }
+
+    private static int indexOfAny(String s, String chars) {
+        for (int i = 0; i < s.length(); i++) {
+            if (chars.indexOf(s.charAt(i)) >= 0) {
+                return i;
+            }
+        }
+        return -1;
+    }
+
+    /**
+     * Result of {@link #canonicalize}: the canonical URL and its parsed form, or the reason
+     * the input was rejected.
+     */
+    public record Normalized(String url, URI uri, String error) {
+
+        static Normalized rejected(String error) {
+            return new Normalized(null, null, error);
+        }
+
+        public boolean valid() {
+            return error == null;
+        }
+    }
+}
@@ -0,0 +1,344 @@
+package com.urlvalidator.service;
+
+import com.fasterxml.jackson.core.JsonProcessingException;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import com.urlvalidator.model.CacheMode;
+import com.urlvalidator.model.CheckResult;
+import com.urlvalidator.model.FailureClass;
+import com.urlvalidator.model.Priority;
+import com.urlvalidator.model.StatusChange;
+import com.urlvalidator.model.WatchStatus;
+import jakarta.annotation.PostConstruct;
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+import org.springframework.beans.factory.annotation.Qualifier;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Service;
+
+import java.net.URI;
+import java.net.http.HttpClient;
+import java.net.http.HttpRequest;
+import java.net.http.HttpResponse;
+import java.time.Duration;
+import java.util.ArrayDeque;
+import java.util.ArrayList;
+import java.util.Deque;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.ScheduledExecutorService;
+import java.util.concurrent.ThreadLocalRandom;
+import java.util.concurrent.TimeUnit;
+
+/**
+ * Keeps a registry of watched URLs and re-checks each one on its own interval.
+ *
+ * <p>Due times are kept on a hashed timing wheel: one slot per tick, with watches further
+ * out than one revolution carrying a count of remaining rounds. A single scheduled task
+ * advances the wheel, so 100k watches cost one timer. Each watch's first check lands at a
+ * random point within its interval and later ones are jittered, which keeps re-checks
+ * spread out rather than arriving in bursts. Checks go through {@link UrlCheckService}, so
+ * they share the outbound politeness limits and refresh the cache; at most
+ * {@code urlchecker.watch.max-concurrency} run at once and the rest wait for a free slot.
+ *
+ * <p>When a watched URL's reachability flips, a {@link StatusChange} is recorded for
+ * {@link #changesSince} and, if {@code urlchecker.watch.webhook-url} is set, POSTed there.
+ */
+@Service
+public class WatchService {
+
+    private static final Logger log = LoggerFactory.getLogger(WatchService.class);
+
+    private final UrlCheckService checkService;
+    private final UrlNormalizer normalizer;
+    private final HttpClient httpClient;
+    private final ObjectMapper objectMapper;
+    private final ScheduledExecutorService scheduler;
+    private final long tickMillis;
+    private final Duration defaultInterval;
+    private final Duration minInterval;
+    private final double jitter;
+    private final int maxWatches;
+    private final int maxConcurrency;
+    private final int maxEvents;
+    private final URI webhook;
+
+    private final Deque<Watch>[] wheel;
+    private int cursor;
+    private final Map<Long, Watch> watches = new LinkedHashMap<>();
+    private final Map<String, Watch> byKey = new LinkedHashMap<>();
+    private final Deque<Watch> due = new ArrayDeque<>();
+    private final Deque<StatusChange> events = new ArrayDeque<>();
+    private long nextId = 1;
+    private long nextSeq = 1;
+    private int inFlight;
+    private boolean dispatching;
+
+    @SuppressWarnings("unchecked")
+    public WatchService(UrlCheckService checkService, UrlNormalizer normalizer, HttpClient httpClient,
+                        ObjectMapper objectMapper,
+                        @Qualifier("checkScheduler") ScheduledExecutorService scheduler,
+                        @Value("${urlchecker.watch.tick:1s}") Duration tick,
+                        @Value("${urlchecker.watch.wheel-slots:3600}") int wheelSlots,
+                        @Value("${urlchecker.watch.default-interval:5m}") Duration defaultInterval,
+                        @Value("${urlchecker.watch.min-interval:30s}") Duration minInterval,
+                        @Value("${urlchecker.watch.jitter:0.1}") double jitter,
+                        @Value("${urlchecker.watch.max-watches:200000}") int maxWatches,
+                        @Value("${urlchecker.watch.max-concurrency:32}") int maxConcurrency,
+                        @Value("${urlchecker.watch.max-events:10000}") int maxEvents,
+                        @Value("${urlchecker.watch.webhook-url:}") String webhookUrl) {
+        this.checkService = checkService;
+        this.normalizer = normalizer;
+        this.httpClient = httpClient;
+        this.objectMapper = objectMapper;
+        this.scheduler = scheduler;
+        this.tickMillis = Math.max(1, tick.toMillis());
+        this.defaultInterval = defaultInterval;
+        this.minInterval = minInterval;
+        this.jitter = jitter;
+        this.maxWatches = maxWatches;
+        this.maxConcurrency = Math.max(1, maxConcurrency);
+        this.maxEvents = maxEvents;
+        this.webhook = webhookUrl.isBlank() ? null : URI.create(webhookUrl);
+        this.wheel = new Deque[Math.max(1, wheelSlots)];
+        for (int i = 0; i < wheel.length; i++) {
+            wheel[i] = new ArrayDeque<>();
+        }
+    }
+
+    @PostConstruct
+    void start() {
+        scheduler.scheduleAtFixedRate(this::tick, tickMillis, tickMillis, TimeUnit.MILLISECONDS);
+    }
+
+    /**
+     * Starts watching {@code url}, or changes the interval if it is already watched. A shorter
+     * interval takes effect at once: a next check further out than the new interval is moved
+     * to a random point within it.
+     *
+     * @param interval re-check interval, or {@code null} for the default; raised to the minimum
+     * @throws IllegalStateException if the registry is full
+     */
+    public synchronized WatchStatus watch(String url, Duration interval) {
+        String key = normalizer.normalize(url);
+        long intervalMillis = intervalOf(interval).toMillis();
+        Watch watch = byKey.get(key);
+        if (watch != null) {
+            watch.intervalMillis = intervalMillis;
+            if (watch.slot >= 0 && watch.dueAt - System.currentTimeMillis() > intervalMillis) {
+                wheel[watch.slot].remove(watch);
+                schedule(watch, ThreadLocalRandom.current().nextLong(Math.max(1, intervalMillis)));
+            }
+            return watch.status();
+        }
+        if (watches.size() >= maxWatches) {
+            throw new IllegalStateException("Too many watched urls (max " + maxWatches + ")");
+        }
+        watch = new Watch(nextId++, url, key, intervalMillis);
+        watches.put(watch.id, watch);
+        byKey.put(key, watch);
+        // First check at a random point in the interval, so a bulk registration does not fire at once.
+        schedule(watch, ThreadLocalRandom.current().nextLong(Math.max(1, intervalMillis)));
+        return watch.status();
+    }
+
+    public synchronized boolean unwatch(long id) {
+        Watch watch = watches.remove(id);
+        if (watch == null) {
+            return false;
+        }
+        byKey.remove(watch.key);
+        // Left in its wheel slot and skipped when the slot comes round.
+        watch.removed = true;
+        return true;
+    }
+
+    public synchronized WatchStatus get(long id) {
+        Watch watch = watches.get(id);
+        return watch != null ? watch.status() : null;
+    }
+
+    public synchronized List<WatchStatus> list(int offset, int limit) {
+        List<WatchStatus> page = new ArrayList<>();
+        int index = 0;
+        for (Watch watch : watches.values()) {
+            if (index++ < offset) {
+                continue;
+            }
+            if (page.size() >= limit) {
+                break;
+            }
+            page.add(watch.status());
+        }
+        return page;
+    }
+
+    public synchronized int size() {
+        return watches.size();
+    }
+
+    /** Returns up to {@code limit} status changes with a {@code seq} greater than {@code since}, oldest first. */
+    public synchronized List<StatusChange> changesSince(long since, int limit) {
+        List<StatusChange> changes = new ArrayList<>();
+        for (StatusChange change : events) {
+            if (change.seq() > since) {
+                if (changes.size() >= limit) {
+                    break;
+                }
+                changes.add(change);
+            }
+        }
+        return changes;
+    }
+
+    private Duration intervalOf(Duration requested) {
+        if (requested == null) {
+            return defaultInterval;
+        }
+        return requested.compareTo(minInterval) < 0 ? minInterval : requested;
+    }
+
+    private void tick() {
+        try {
+            synchronized (this) {
+                Deque<Watch> slot = wheel[cursor];
+                cursor = (cursor + 1) % wheel.length;
+                for (int n = slot.size(); n > 0; n--) {
+                    Watch watch = slot.pollFirst();
+                    if (watch.removed) {
+                        continue;
+                    }
+                    if (watch.rounds > 0) {
+                        watch.rounds--;
+                        slot.addLast(watch);
+                    } else {
+                        watch.slot = -1;
+                        due.addLast(watch);
+                    }
+                }
+                dispatch();
+            }
+        } catch (RuntimeException e) {
+            // An exception would cancel the periodic task and stop every watch.
+            log.error("Watch tick failed", e);
+        }
+    }
+
+    /**
+     * Starts due checks until {@code maxConcurrency} are running. Checks that complete inline
+     * (an invalid URL, say) call back into {@link #onChecked}; the guard keeps that from
+     * recursing, and this loop picks up the freed slot itself.
+     */
+    private void dispatch() {
+        if (dispatching) {
+            return;
+        }
+        dispatching = true;
+        try {
+            while (inFlight < maxConcurrency && !due.isEmpty()) {
+                Watch watch = due.pollFirst();
+                if (watch.removed) {
+                    continue;
+                }
+                inFlight++;
+                checkService.checkAsync(watch.url, CacheMode.REFRESH, null, Priority.BACKGROUND)
+                        .whenComplete((result, error) -> onChecked(watch, result != null ? result
+                                : CheckResult.failed(watch.url, FailureClass.HTTP, String.valueOf(error))));
+            }
+        } finally {
+            dispatching = false;
+        }
+    }
+
+    private void onChecked(Watch watch, CheckResult result) {
+        StatusChange change = null;
+        synchronized (this) {
+            inFlight--;
+            long now = System.currentTimeMillis();
+            CheckResult previous = watch.last;
+            watch.last = result;
+            watch.lastCheckedAt = now;
+            if (previous != null && previous.reachable() != result.reachable() && !watch.removed) {
+                change = new StatusChange(nextSeq++, watch.id, watch.url, result.reachable(), result, now);
+                events.addLast(change);
+                if (events.size() > maxEvents) {
+                    events.pollFirst();
+                }
+            }
+            if (!watch.removed) {
+                schedule(watch, jittered(watch.intervalMillis));
+            }
+            dispatch();
+        }
+        if (change != null) {
+            log.info("Watched url {} is now {}", watch.url, change.reachable() ? "reachable" : "unreachable");
+            notify(change);
+        }
+    }
+
+    private long jittered(long intervalMillis) {
+        double factor = 1 + jitter * (2 * ThreadLocalRandom.current().nextDouble() - 1);
+        return (long) (intervalMillis * factor);
+    }
+
+    /** Puts {@code watch} in the slot {@code delayMillis} ahead of the cursor, counting whole revolutions as rounds. */
+    private void schedule(Watch watch, long delayMillis) {
+        long ticks = Math.max(1, (delayMillis + tickMillis - 1) / tickMillis);
+        watch.rounds = (ticks - 1) / wheel.length;
+        watch.slot = (int) ((cursor + ticks - 1) % wheel.length);
+        watch.dueAt = System.currentTimeMillis() + ticks * tickMillis;
+        wheel[watch.slot].addLast(watch);
+    }
+
+    private void notify(StatusChange change) {
+        if (webhook == null) {
+            return;
+        }
+        String body;
+        try {
+            body = objectMapper.writeValueAsString(change);
+        } catch (JsonProcessingException e) {
+            log.warn("Could not serialize status change {}", change.seq(), e);
+            return;
+        }
+        HttpRequest request = HttpRequest.newBuilder(webhook)
+                .timeout(Duration.ofSeconds(10))
+                .header("Content-Type", "application/json")
+                .POST(HttpRequest.BodyPublishers.ofString(body))
+                .build();
+        httpClient.sendAsync(request, HttpResponse.BodyHandlers.discarding()).whenComplete((response, error) -> {
+            if (error != null) {
+                log.warn("Webhook {} failed for change {}: {}", webhook, change.seq(), error.toString());
+            } else if (response.statusCode() >= 300) {
+                log.warn("Webhook {} answered {} for change {}", webhook, response.statusCode(), change.seq());
+            }
+        });
+    }
+
+    /** A watched URL. Guarded by the service. */
+    private static final class Watch {
+
+        final long id;
+        final String url;
+        final String key;
+        long intervalMillis;
+        long rounds;
+        // The wheel slot the watch waits in and when it comes due; -1 while due or being checked.
+        int slot = -1;
+        long dueAt;
+        boolean removed;
+        CheckResult last;
+        Long lastCheckedAt;
+
+        Watch(long id, String url, String key, long intervalMillis) {
+            this.id = id;
+            this.url = url;
+            this.key = key;
+            this.intervalMillis = intervalMillis;
+        }
+
+        WatchStatus status() {
+            return new WatchStatus(id, url, TimeUnit.MILLISECONDS.toSeconds(intervalMillis), last, lastCheckedAt);
+        }
+    }
+}
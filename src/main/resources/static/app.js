@@ -17,11 +17,14 @@ async function checkUrl(url) {
       body: JSON.stringify({url})
     });
     const json = await res.json();
-    const msg = json && json.message ? json.message : JSON.stringify(json);
-    statusEl.textContent = msg;
-    if (msg.includes('✅')) {
+    if (!res.ok) {
+      statusEl.textContent = json.message || res.statusText;
+      statusEl.classList.add('fail');
+    } else if (json.reachable) {
+      statusEl.textContent = '✅ Valid website URL';
       statusEl.classList.add('success');
     } else {
+      statusEl.textContent = '❌ Invalid or unreachable website URL' + (json.failure ? ` (${json.failure})` : '');
       statusEl.classList.add('fail');
     }
     detailsEl.textContent = JSON.stringify(json, null, 2);
@@ -40,3 +43,75 @@ form.addEventListener('submit', e => {
 });
 
 document.querySelectorAll('.example').forEach(b => b.addEventListener('click', () => { urlInput.value = b.textContent; checkUrl(b.textContent); }));
+
+// Batch mode: results are streamed as NDJSON and rendered as each check finishes.
+const batchForm = document.getElementById('batchForm');
+const batchInput = document.getElementById('batchInput');
+const batchBtn = document.getElementById('batchBtn');
+const batchProgress = document.getElementById('batchProgress');
+const batchTable = document.getElementById('batchTable');
+const batchRows = document.getElementById('batchRows');
+
+function addBatchRow(item) {
+  const row = document.createElement('tr');
+  const urlCell = document.createElement('td');
+  const resultCell = document.createElement('td');
+  urlCell.textContent = item.url;
+  resultCell.textContent = item.reachable
+    ? '✅ Reachable'
+    : '❌ ' + (item.failure ? item.failure + ': ' : '') + (item.error || 'Unreachable');
+  resultCell.className = item.reachable ? 'success' : 'fail';
+  row.append(urlCell, resultCell);
+  batchRows.appendChild(row);
+}
+
+async function checkBatch(urls) {
+  batchRows.textContent = '';
+  batchTable.classList.remove('hidden');
+  batchProgress.classList.remove('hidden');
+  batchProgress.className = 'status';
+  batchProgress.textContent = `0 / ${urls.length} checked`;
+  batchBtn.disabled = true;
+
+  let done = 0;
+  try {
+    const res = await fetch('/api/check-urls/stream', {
+      method: 'POST',
+      headers: {'Content-Type':'application/json', 'Accept':'application/x-ndjson'},
+      body: JSON.stringify({urls})
+    });
+    if (!res.ok) {
+      const json = await res.json();
+      throw new Error(json.message || res.statusText);
+    }
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffered = '';
+    for (;;) {
+      const {value, done: finished} = await reader.read();
+      if (finished) break;
+      buffered += decoder.decode(value, {stream: true});
+      const lines = buffered.split('\n');
+      buffered = lines.pop();
+      for (const line of lines) {
+        if (!line.trim()) continue;
+        addBatchRow(JSON.parse(line));
+        done++;
+      }
+      batchProgress.textContent = `${done} / ${urls.length} checked`;
+    }
+  } catch (err) {
+    batchProgress.textContent = 'Request failed: ' + err.message;
+    batchProgress.classList.add('fail');
+  } finally {
+    batchBtn.disabled = false;
+  }
+}
+
+batchForm.addEventListener('submit', e => {
+  e.preventDefault();
+  const urls = batchInput.value.split('\n').map(u => u.trim()).filter(u => u);
+  if (!urls.length) return;
+  checkBatch(urls);
+});
@@ -0,0 +1,111 @@
+package com.urlvalidator.service;
+
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.params.ParameterizedTest;
+import org.junit.jupiter.params.provider.CsvSource;
+import org.junit.jupiter.params.provider.ValueSource;
+
+import java.util.List;
+import java.util.Random;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertFalse;
+import static org.junit.jupiter.api.Assertions.assertNotEquals;
+import static org.junit.jupiter.api.Assertions.assertTrue;
+
+class JobServiceTest {
+
+    @ParameterizedTest
+    @CsvSource({
+            // FNV-1a 64 test vectors; resumed jobs match URLs by these values, so they must never change.
+            "'', cbf29ce484222325",
+            "a, af63dc4c8601ec8c",
+            "foobar, 85944171f73967e8",
+    })
+    void fingerprintIsFnv1a64(String key, String hex) {
+        assertEquals(Long.parseUnsignedLong(hex, 16), JobService.fingerprint(key));
+    }
+
+    @Test
+    void fingerprintTellsUrlsApart() {
+        assertNotEquals(JobService.fingerprint("https://example.com/a"), JobService.fingerprint("https://example.com/b"));
+    }
+
+    @Test
+    void longSetAddsEachValueOnce() {
+        JobService.LongSet set = new JobService.LongSet();
+        assertFalse(set.contains(42));
+        assertTrue(set.add(42));
+        assertFalse(set.add(42));
+        assertTrue(set.contains(42));
+        assertFalse(set.contains(43));
+    }
+
+    @ParameterizedTest
+    @ValueSource(longs = {0, -1, Long.MIN_VALUE, Long.MAX_VALUE})
+    void longSetHoldsSpecialValues(long value) {
+        JobService.LongSet set = new JobService.LongSet();
+        assertFalse(set.contains(value));
+        assertTrue(set.add(value));
+        assertFalse(set.add(value));
+        assertTrue(set.contains(value));
+    }
+
+    @Test
+    void longSetZeroIsNotConfusedWithEmptySlots() {
+        JobService.LongSet set = new JobService.LongSet();
+        set.add(1);
+        assertFalse(set.contains(0));
+        assertTrue(set.add(0));
+        assertTrue(set.contains(0));
+    }
+
+    @Test
+    void longSetResolvesCollidingSlots() {
+        JobService.LongSet set = new JobService.LongSet();
+        // All of these land in the same slot of the initial table.
+        long[] colliding = {5, 5 + 1024, 5 + 2048, 5 + (1L << 40) + (1L << 8), 5 + (1L << 42) + (1L << 10)};
+        for (long value : colliding) {
+            assertTrue(set.add(value));
+        }
+        for (long value : colliding) {
+            assertTrue(set.contains(value));
+            assertFalse(set.add(value));
+        }
+        assertFalse(set.contains(5 + 3072));
+    }
+
+    @Test
+    void longSetKeepsEveryValueAcrossGrowth() {
+        JobService.LongSet set = new JobService.LongSet();
+        Random random = new Random(7);
+        long[] values = new long[100_000];
+        for (int i = 0; i < values.length; i++) {
+            values[i] = random.nextLong();
+            set.add(values[i]);
+        }
+        for (long value : values) {
+            assertTrue(set.contains(value));
+        }
+        Random other = new Random(8);
+        int falsePositives = 0;
+        for (int i = 0; i < 10_000; i++) {
+            if (set.contains(other.nextLong())) {
+                falsePositives++;
+            }
+        }
+        assertEquals(0, falsePositives);
+    }
+
+    @ParameterizedTest
+    @ValueSource(strings = {"https://example.com/", "https://example.com/?a=1,b=2", "say \"hi\"", "", "a\"b,c"})
+    void csvFieldRoundTrips(String value) {
+        assertEquals(List.of(value, "x"), JobService.csvFields(JobService.csvField(value) + ",x"));
+    }
+
+    @Test
+    void csvFieldsHonourQuotes() {
+        assertEquals(List.of("a", "b,c", "d\"e", ""), JobService.csvFields("a,\"b,c\",\"d\"\"e\","));
+        assertEquals(List.of(""), JobService.csvFields(""));
+    }
+}
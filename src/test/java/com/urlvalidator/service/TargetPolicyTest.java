@@ -0,0 +1,141 @@
+package com.urlvalidator.service;
+
+import com.urlvalidator.model.FailureClass;
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.params.ParameterizedTest;
+import org.junit.jupiter.params.provider.CsvSource;
+import org.junit.jupiter.params.provider.ValueSource;
+import org.springframework.core.io.ByteArrayResource;
+import org.springframework.core.io.Resource;
+
+import java.net.InetAddress;
+import java.net.URI;
+import java.net.UnknownHostException;
+import java.nio.charset.StandardCharsets;
+import java.util.List;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertNotNull;
+import static org.junit.jupiter.api.Assertions.assertNull;
+import static org.junit.jupiter.api.Assertions.assertThrows;
+
+class TargetPolicyTest {
+
+    // The defaults of urlchecker.policy.blocked-networks.
+    private static final List<String> BLOCKED = List.of(
+            "0.0.0.0/8", "10.0.0.0/8", "100.64.0.0/10", "127.0.0.0/8", "169.254.0.0/16", "172.16.0.0/12",
+            "192.0.0.0/24", "192.0.2.0/24", "192.168.0.0/16", "198.18.0.0/15", "198.51.100.0/24", "203.0.113.0/24",
+            "224.0.0.0/4", "240.0.0.0/4", "::/128", "::1/128", "64:ff9b::/96", "2001::/32", "2001:db8::/32",
+            "2002::/16", "fc00::/7", "fe80::/10", "ff00::/8");
+
+    private static final Resource TLDS = new ByteArrayResource(
+            "# comment\ncom\nORG\n\nxn--p1ai\n".getBytes(StandardCharsets.UTF_8));
+
+    private final TargetPolicy policy = new TargetPolicy(true, TLDS, BLOCKED, List.of());
+
+    @ParameterizedTest
+    @ValueSource(strings = {
+            "https://example.com/",
+            "https://www.example.org/",
+            "https://xn--e1afmkfd.xn--p1ai/",
+            "http://8.8.8.8/",
+            "http://100.128.0.1/",
+            "http://172.15.255.255/",
+            "http://172.32.0.0/",
+            "http://[2606:4700:4700::1111]/",
+            "http://[2001:4860:4860::8888]/",
+    })
+    void allows(String url) {
+        assertNull(policy.check(URI.create(url)));
+    }
+
+    @ParameterizedTest
+    @CsvSource({
+            // Names outside the TLD list, including numeric hosts that are not dotted quads
+            "http://localhost/, INVALID_URL",
+            "https://service.internal/, INVALID_URL",
+            "https://example.invalid/, INVALID_URL",
+            "http://2130706433/, INVALID_URL",
+            "http://0x7f000001/, INVALID_URL",
+            // IPv4 special-purpose ranges, at their edges
+            "http://0.0.0.0/, BLOCKED",
+            "http://127.0.0.1/, BLOCKED",
+            "http://10.255.255.255/, BLOCKED",
+            "http://100.64.0.1/, BLOCKED",
+            "http://100.127.255.255/, BLOCKED",
+            "http://169.254.169.254/, BLOCKED",
+            "http://172.16.0.0/, BLOCKED",
+            "http://172.31.255.255/, BLOCKED",
+            "http://192.168.1.1/, BLOCKED",
+            "http://224.0.0.1/, BLOCKED",
+            "http://255.255.255.255/, BLOCKED",
+            // IPv6 loopback, private and link-local, and IPv4 hidden inside IPv6
+            "http://[::1]/, BLOCKED",
+            "http://[::]/, BLOCKED",
+            "http://[fc00::1]/, BLOCKED",
+            "http://[fd12:3456::1]/, BLOCKED",
+            "http://[fe80::1]/, BLOCKED",
+            "http://[::ffff:127.0.0.1]/, BLOCKED",
+            "http://[64:ff9b::7f00:1]/, BLOCKED",
+            "http://[2002:7f00:1::]/, BLOCKED",
+            "http://[2001:0:4136:e378:8000:63bf:3fff:fdd2]/, BLOCKED",
+            "http://[2001:db8::1]/, BLOCKED",
+    })
+    void rejects(String url, FailureClass failure) {
+        TargetPolicy.Rejection rejection = policy.check(URI.create(url));
+        assertNotNull(rejection, url);
+        assertEquals(failure, rejection.failure(), url);
+    }
+
+    @Test
+    void allowedNetworksPunchHolesInTheBlockList() {
+        TargetPolicy internal = new TargetPolicy(true, TLDS, BLOCKED, List.of("10.0.0.0/24", "fd00::/64"));
+        assertNull(internal.check(URI.create("http://10.0.0.5/")));
+        assertNull(internal.check(URI.create("http://[fd00::5]/")));
+        assertEquals(FailureClass.BLOCKED, internal.check(URI.create("http://10.0.1.5/")).failure());
+        assertEquals(FailureClass.BLOCKED, internal.check(URI.create("http://[fd00:0:0:1::5]/")).failure());
+    }
+
+    @Test
+    void tldCheckCanBeTurnedOff() {
+        TargetPolicy anyName = new TargetPolicy(false, TLDS, BLOCKED, List.of());
+        assertNull(anyName.check(URI.create("http://localhost/")));
+        assertEquals(FailureClass.BLOCKED, anyName.check(URI.create("http://127.0.0.1/")).failure());
+    }
+
+    @Test
+    void oneBlockedAddressRefusesTheHost() throws UnknownHostException {
+        InetAddress publicAddress = InetAddress.getByName("93.184.216.34");
+        InetAddress privateAddress = InetAddress.getByName("10.0.0.1");
+        assertNull(policy.check("example.com", List.of(publicAddress)));
+        TargetPolicy.Rejection rejection = policy.check("example.com", List.of(publicAddress, privateAddress));
+        assertNotNull(rejection);
+        assertEquals(FailureClass.BLOCKED, rejection.failure());
+    }
+
+    @ParameterizedTest
+    @CsvSource(delimiter = '|', value = {
+            "10.0.0.0/8     | 10.1.2.3      | true",
+            "10.0.0.0/8     | 11.0.0.0      | false",
+            "100.64.0.0/10  | 100.127.0.1   | true",
+            "100.64.0.0/10  | 100.128.0.1   | false",
+            "192.0.2.7      | 192.0.2.7     | true",
+            "192.0.2.7      | 192.0.2.8     | false",
+            "0.0.0.0/0      | 203.0.113.9   | true",
+            "0.0.0.0/0      | ::1           | false",
+            "fe80::/10      | febf::1       | true",
+            "fe80::/10      | fec0::1       | false",
+            "2002::/16      | 2002:a00:1::  | true",
+            "2001::/32      | 2001:1::1     | false",
+    })
+    void cidrContains(String cidr, String address, boolean contained) throws UnknownHostException {
+        byte[] bytes = InetAddress.getByName(address).getAddress();
+        assertEquals(contained, TargetPolicy.Cidr.parse(cidr).contains(bytes));
+    }
+
+    @ParameterizedTest
+    @ValueSource(strings = {"example.com/8", "10.0.0.0/33", "::/129", "10.0.0.0/-1", "10.0.0.0/x", "256.0.0.0/8"})
+    void rejectsInvalidNetworks(String cidr) {
+        assertThrows(IllegalArgumentException.class, () -> TargetPolicy.Cidr.parse(cidr));
+    }
+}
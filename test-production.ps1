@@ -107,7 +107,7 @@ try {
         -Body $Body `
         -UseBasicParsing -TimeoutSec 60
     
-    if ($Response.Content -match "Valid") {
+    if ($Response.Content -match '"reachable":true') {
         Write-Host "   ✓ Google URL validation passed" -ForegroundColor Green
         Write-Host "   Response: $($Response.Content)" -ForegroundColor Cyan
     } else {
@@ -130,7 +130,7 @@ try {
         -Body $Body `
         -UseBasicParsing -TimeoutSec 60
     
-    if ($Response.Content -match "Valid") {
+    if ($Response.Content -match '"reachable":true') {
         Write-Host "   ✓ GoIndiGo URL validation passed" -ForegroundColor Green
         Write-Host "   Response: $($Response.Content)" -ForegroundColor Cyan
     } else {
@@ -152,7 +152,7 @@ try {
         -Body $Body `
         -UseBasicParsing -TimeoutSec 60
     
-    if ($Response.Content -match "Invalid") {
+    if ($Response.Content -match '"reachable":false') {
         Write-Host "   ✓ Invalid URL correctly identified" -ForegroundColor Green
         Write-Host "   Response: $($Response.Content)" -ForegroundColor Cyan
     } else {
@@ -175,7 +175,7 @@ try {
         -Body $Body `
         -UseBasicParsing -TimeoutSec 60
     
-    if ($Response.Content -match "Valid") {
+    if ($Response.Content -match '"reachable":true') {
         Write-Host "   ✓ URL prefix handling works" -ForegroundColor Green
         Write-Host "   Response: $($Response.Content)" -ForegroundColor Cyan
     } else {
@@ -77,7 +77,7 @@ echo "5. Testing https://www.google.com (should be valid)..."
 RESPONSE=$(curl -s -X POST "$BASE_URL/api/check-url" \
     -H "Content-Type: application/json" \
     -d '{"url":"https://www.google.com"}')
-if echo "$RESPONSE" | grep -q "Valid"; then
+if echo "$RESPONSE" | grep -q "\"reachable\":true"; then
     echo "   ✓ Google URL validation passed"
     echo "   Response: $RESPONSE"
 else
@@ -92,7 +92,7 @@ echo "6. Testing https://www.goindigo.in (Cloudflare-protected, should be valid)
 RESPONSE=$(curl -s -X POST "$BASE_URL/api/check-url" \
     -H "Content-Type: application/json" \
     -d '{"url":"https://www.goindigo.in"}')
-if echo "$RESPONSE" | grep -q "Valid"; then
+if echo "$RESPONSE" | grep -q "\"reachable\":true"; then
     echo "   ✓ GoIndiGo URL validation passed"
     echo "   Response: $RESPONSE"
 else
@@ -108,7 +108,7 @@ echo "7. Testing https://invalid-url-that-does-not-exist-12345.com (should be in
 RESPONSE=$(curl -s -X POST "$BASE_URL/api/check-url" \
     -H "Content-Type: application/json" \
     -d '{"url":"https://invalid-url-that-does-not-exist-12345.com"}')
-if echo "$RESPONSE" | grep -q "Invalid"; then
+if echo "$RESPONSE" | grep -q "\"reachable\":false"; then
     echo "   ✓ Invalid URL correctly identified"
     echo "   Response: $RESPONSE"
 else
@@ -123,7 +123,7 @@ echo "8. Testing github.com (without https prefix)..."
 RESPONSE=$(curl -s -X POST "$BASE_URL/api/check-url" \
     -H "Content-Type: application/json" \
     -d '{"url":"github.com"}')
-if echo "$RESPONSE" | grep -q "Valid"; then
+if echo "$RESPONSE" | grep -q "\"reachable\":true"; then
     echo "   ✓ URL prefix handling works"
     echo "   Response: $RESPONSE"
 else
@@ -0,0 +1,474 @@
+"""Load and latency benchmark for the URL validator, with no network access needed.
+
+Starts the fake origin (origin.py) and, given --jar, the service itself with a JDK hosts
+file that maps the benchmark host names to 127.0.0.1. Each scenario drives one endpoint
+with unique URLs (so the result cache does not answer for the origin) for a fixed time
+and reports throughput, client-side latency percentiles, verdicts, and the service's
+threads, sockets and memory sampled while it ran. The report is JSON; compare.py diffs two.
+
+    python tools/bench/bench.py --jar target/url-validator-1.0.0.jar -o bench.json
+    python tools/bench/bench.py --service http://localhost:8080 --pid 4242 --scenarios single-fast
+
+A service started by hand must use the same hosts file and allow loopback targets:
+
+    python tools/bench/bench.py --write-hosts /tmp/bench.hosts
+    java -Djdk.net.hosts.file=/tmp/bench.hosts -jar app.jar --urlchecker.policy.allowed-networks=127.0.0.0/8
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+DOMAIN = "bench-origin.com"
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Weights of each kind of host in a URL mix; nxdomain names are not in the hosts file.
+MIXES = {
+    "fast": {"fast": 1},
+    "mixed": {"fast": 70, "slow": 10, "nohead": 10, "loop": 4, "blackhole": 2, "nxdomain": 4},
+}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    endpoint: str
+    mix: str
+
+
+SCENARIOS = {
+    "single-fast": Scenario("single", "fast"),
+    "single-mixed": Scenario("single", "mixed"),
+    "batch-fast": Scenario("batch", "fast"),
+    "batch-mixed": Scenario("batch", "mixed"),
+    "job-mixed": Scenario("job", "mixed"),
+}
+
+
+def write_hosts(path: str, hosts: int):
+    with open(path, "w", encoding="ascii") as f:
+        for kind in ("fast", "slow", "nohead", "loop", "blackhole"):
+            for i in range(hosts):
+                f.write(f"127.0.0.1 {kind}-{i}.{DOMAIN}\n")
+
+
+class Urls:
+    """Endless, reproducible stream of unique URLs drawn from a mix."""
+
+    def __init__(self, mix: Dict[str, int], hosts: int, origin_port: int, seed: int):
+        self.kinds = list(mix)
+        self.weights = list(mix.values())
+        self.hosts = hosts
+        self.origin_port = origin_port
+        self.rng = random.Random(seed)
+        self.counter = itertools.count()
+        # Keeps URLs unique across runs against a service whose cache is still warm.
+        self.run = uuid.uuid4().hex[:8]
+        self.lock = threading.Lock()
+
+    def next(self) -> str:
+        with self.lock:
+            kind = self.rng.choices(self.kinds, self.weights)[0]
+            host = f"{kind}-{self.rng.randrange(self.hosts)}.{DOMAIN}"
+            n = next(self.counter)
+        port = self.origin_port + 1 if kind == "blackhole" else self.origin_port
+        return f"http://{host}:{port}/?r={self.run}&n={n}"
+
+    def take(self, count: int) -> List[str]:
+        return [self.next() for _ in range(count)]
+
+
+class Recorder:
+
+    def __init__(self, measure_from: float):
+        self.measure_from = measure_from
+        self.latencies: List[float] = []
+        self.requests = 0
+        self.errors = 0
+        self.urls = 0
+        self.verdicts = Counter()
+        self.lock = threading.Lock()
+
+    def record(self, started: float, elapsed: float, ok: bool, results: List[dict]):
+        if started < self.measure_from:
+            return
+        with self.lock:
+            self.requests += 1
+            self.latencies.append(elapsed * 1000)
+            if not ok:
+                self.errors += 1
+                return
+            self.urls += len(results)
+            for result in results:
+                self.verdicts["reachable" if result.get("reachable") else result.get("failure", "UNKNOWN")] += 1
+
+
+class Sampler(threading.Thread):
+    """Samples the service's threads, sockets and memory from /proc (given its pid) and its
+    Prometheus endpoint until stopped."""
+
+    def __init__(self, service: str, pid: Optional[int], interval: float):
+        super().__init__(daemon=True)
+        self.service = service
+        self.pid = pid
+        self.interval = interval
+        self.samples: Dict[str, List[float]] = {}
+        self.stopped = threading.Event()
+        self.prometheus = True
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.sample()
+            self.stopped.wait(self.interval)
+
+    def stop(self) -> dict:
+        self.stopped.set()
+        self.join()
+        self.sample()
+        return {name: {"peak": round(max(values), 1), "mean": round(sum(values) / len(values), 1)}
+                for name, values in self.samples.items() if values}
+
+    def add(self, name: str, value: float):
+        self.samples.setdefault(name, []).append(value)
+
+    def sample(self):
+        if self.pid is not None:
+            try:
+                with open(f"/proc/{self.pid}/status") as f:
+                    for line in f:
+                        if line.startswith("Threads:"):
+                            self.add("threads", int(line.split()[1]))
+                        elif line.startswith("VmRSS:"):
+                            self.add("rssMb", int(line.split()[1]) / 1024)
+                fds = os.listdir(f"/proc/{self.pid}/fd")
+                sockets = 0
+                for fd in fds:
+                    try:
+                        sockets += os.readlink(f"/proc/{self.pid}/fd/{fd}").startswith("socket:")
+                    except OSError:
+                        pass
+                self.add("fds", len(fds))
+                self.add("sockets", sockets)
+            except OSError:
+                pass
+        if self.prometheus:
+            try:
+                with urllib.request.urlopen(self.service + "/actuator/prometheus", timeout=5) as response:
+                    text = response.read().decode()
+            except (OSError, http.client.HTTPException):
+                # Not exposed (or not reachable) at all: stop asking.
+                self.prometheus = False
+                return
+            heap = 0.0
+            for line in text.splitlines():
+                if line.startswith("jvm_threads_live_threads"):
+                    self.add("jvmThreads", float(line.rsplit(" ", 1)[1]))
+                elif line.startswith("jvm_memory_used_bytes") and 'area="heap"' in line:
+                    heap += float(line.rsplit(" ", 1)[1])
+            if heap:
+                self.add("heapMb", heap / (1024 * 1024))
+
+
+def _post(conn: http.client.HTTPConnection, path: str, body: bytes, content_type: str):
+    conn.request("POST", path, body=body, headers={"Content-Type": content_type})
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+def _get_json(service: str, path: str, timeout: float = 10):
+    with urllib.request.urlopen(service + path, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def _connection(service: str) -> http.client.HTTPConnection:
+    host_port = service.split("://", 1)[1].rstrip("/")
+    return http.client.HTTPConnection(host_port, timeout=600)
+
+
+def _drive(service: str, clients: int, until: float, recorder: Recorder, request):
+    """Runs `clients` closed-loop workers, each sending request(conn) until `until`."""
+
+    def worker():
+        conn = _connection(service)
+        while time.monotonic() < until:
+            started = time.monotonic()
+            try:
+                ok, results = request(conn)
+            except (OSError, http.client.HTTPException, ValueError):
+                conn.close()
+                conn = _connection(service)
+                ok, results = False, []
+            recorder.record(started, time.monotonic() - started, ok, results)
+        conn.close()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run_single(args, urls: Urls, recorder: Recorder, until: float):
+    def request(conn):
+        status, body = _post(conn, "/api/check-url", json.dumps({"url": urls.next()}).encode(), "application/json")
+        return status == 200, [json.loads(body)] if status == 200 else []
+
+    _drive(args.service, args.clients, until, recorder, request)
+
+
+def run_batch(args, urls: Urls, recorder: Recorder, until: float):
+    def request(conn):
+        payload = {"urls": urls.take(args.batch_size), "concurrency": args.batch_concurrency}
+        status, body = _post(conn, "/api/check-urls", json.dumps(payload).encode(), "application/json")
+        return status == 200, json.loads(body)["results"] if status == 200 else []
+
+    _drive(args.service, args.batch_clients, until, recorder, request)
+
+
+def run_job(args, urls: Urls, recorder: Recorder, until: float):
+    """One file job of --job-size URLs; its latency is the time until the job is done."""
+    started = time.monotonic()
+    conn = _connection(args.service)
+    body = ("\n".join(urls.take(args.job_size)) + "\n").encode()
+    status, response = _post(conn, f"/api/jobs?concurrency={args.job_concurrency}", body, "text/plain")
+    conn.close()
+    if status != 201:
+        recorder.record(started, time.monotonic() - started, False, [])
+        return
+    job = json.loads(response)
+    while job["state"] in ("QUEUED", "RUNNING") and time.monotonic() < until:
+        time.sleep(0.5)
+        job = _get_json(args.service, f"/api/jobs/{job['id']}")
+    elapsed = time.monotonic() - started
+    done = job["state"] == "DONE"
+    request = urllib.request.Request(f"{args.service}/api/jobs/{job['id']}/results")
+    with urllib.request.urlopen(request, timeout=60) as results:
+        rows = results.read().decode().splitlines()[1:]
+    urllib.request.urlopen(urllib.request.Request(f"{args.service}/api/jobs/{job['id']}", method="DELETE"),
+                           timeout=60).close()
+    verdicts = []
+    for row in rows:
+        fields = row.split(",")
+        # url,reachable,status,method,failure,...; URLs here never contain commas.
+        verdicts.append({"reachable": fields[1] == "true", "failure": fields[4] or "UNKNOWN"})
+    recorder.record(started, elapsed, done, verdicts)
+
+
+RUNNERS = {"single": run_single, "batch": run_batch, "job": run_job}
+
+
+def run_scenario(args, name: str, scenario: Scenario) -> dict:
+    urls = Urls(MIXES[scenario.mix], args.hosts, args.origin_port, args.seed)
+    origin_before = _get_json(f"http://127.0.0.1:{args.origin_port}", "/__stats")
+    sampler = Sampler(args.service, args.pid, args.sample_interval)
+    sampler.start()
+    started = time.monotonic()
+    if scenario.endpoint == "job":
+        # A job is measured whole; --duration only bounds how long it may take.
+        recorder = Recorder(started)
+        run_job(args, urls, recorder, started + max(args.duration, 600))
+    else:
+        recorder = Recorder(started + args.warmup)
+        RUNNERS[scenario.endpoint](args, urls, recorder, started + args.warmup + args.duration)
+    elapsed = time.monotonic() - max(started, recorder.measure_from)
+    resources = sampler.stop()
+    origin_after = _get_json(f"http://127.0.0.1:{args.origin_port}", "/__stats")
+
+    latencies = sorted(recorder.latencies)
+    report = {
+        "name": name,
+        "endpoint": scenario.endpoint,
+        "mix": scenario.mix,
+        "seconds": round(elapsed, 2),
+        "requests": recorder.requests,
+        "errors": recorder.errors,
+        "urls": recorder.urls,
+        "requestsPerSecond": round(recorder.requests / elapsed, 1) if elapsed > 0 else 0,
+        "urlsPerSecond": round(recorder.urls / elapsed, 1) if elapsed > 0 else 0,
+        "latencyMs": {
+            "p50": _percentile(latencies, 50),
+            "p90": _percentile(latencies, 90),
+            "p99": _percentile(latencies, 99),
+            "max": round(latencies[-1], 1) if latencies else None,
+            "mean": round(sum(latencies) / len(latencies), 1) if latencies else None,
+        },
+        "verdicts": dict(recorder.verdicts),
+        "resources": resources,
+        "origin": _origin_delta(origin_before, origin_after),
+    }
+    return report
+
+
+def _percentile(values: List[float], p: float):
+    if not values:
+        return None
+    rank = max(0, min(len(values) - 1, int(round(p / 100 * len(values) + 0.5)) - 1))
+    return round(values[rank], 1)
+
+
+def _origin_delta(before: dict, after: dict) -> dict:
+    requests = Counter(after["requests"])
+    requests.subtract(before["requests"])
+    methods = Counter(after["methods"])
+    methods.subtract(before["methods"])
+    return {
+        "requests": {k: v for k, v in requests.items() if v},
+        "methods": {k: v for k, v in methods.items() if v},
+        "connections": after["connections"] - before["connections"],
+        "blackholedConnections": after["blackholedConnections"] - before["blackholedConnections"],
+        "peakOpenConnections": after["peakOpenConnections"],
+    }
+
+
+def start_origin(args) -> subprocess.Popen:
+    process = subprocess.Popen([sys.executable, os.path.join(HERE, "origin.py"), "--port", str(args.origin_port),
+                                "--slow-ms", str(args.slow_ms)], stdout=subprocess.PIPE, text=True)
+    if not process.stdout.readline():
+        raise SystemExit(f"fake origin did not start on port {args.origin_port}")
+    return process
+
+
+def start_service(args, work: str) -> subprocess.Popen:
+    hosts_file = os.path.join(work, "hosts")
+    write_hosts(hosts_file, args.hosts)
+    command = [args.java, *args.java_opt, f"-Djdk.net.hosts.file={hosts_file}", "-jar", args.jar,
+               f"--server.port={args.port}", "--urlchecker.policy.allowed-networks=127.0.0.0/8",
+               f"--urlchecker.jobs.dir={os.path.join(work, 'jobs')}", "--urlchecker.store.enabled=false",
+               "--logging.level.root=WARN", *args.service_arg]
+    log = open(os.path.join(work, "service.log"), "w")
+    process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + args.startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"service exited with {process.returncode}; see {log.name}")
+        try:
+            _get_json(args.service, "/api/health", timeout=2)
+            return process
+        except (OSError, ValueError, http.client.HTTPException):
+            time.sleep(0.5)
+    process.terminate()
+    raise SystemExit(f"service did not become healthy within {args.startup_timeout}s; see {log.name}")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--jar", help="start this service jar for the run (recommended)")
+    target.add_argument("--service", help="benchmark an already running service at this base URL")
+    target.add_argument("--write-hosts", metavar="FILE", help="only write the hosts file a service needs, then exit")
+    parser.add_argument("--pid", type=int, help="pid of a --service, for thread, socket and memory sampling")
+    parser.add_argument("--java", default="java")
+    parser.add_argument("--java-opt", action="append", default=[], help="extra JVM option (repeatable)")
+    parser.add_argument("--service-arg", action="append", default=[],
+                        help="extra service argument, e.g. --service-arg=--urlchecker.http.version=HTTP_1_1")
+    parser.add_argument("--port", type=int, default=18090, help="port for a service started with --jar")
+    parser.add_argument("--startup-timeout", type=float, default=120)
+    parser.add_argument("--origin-port", type=int, default=18080, help="fake origin port (black hole on port + 1)")
+    parser.add_argument("--slow-ms", type=int, default=800, help="first-byte delay of the slow hosts")
+    parser.add_argument("--hosts", type=int, default=200, help="host names per kind of host (default: 200)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated, from {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds per scenario (default: 30)")
+    parser.add_argument("--warmup", type=float, default=5, help="unmeasured seconds before each scenario")
+    parser.add_argument("--clients", type=int, default=64, help="concurrent single-URL clients (default: 64)")
+    parser.add_argument("--batch-clients", type=int, default=2, help="concurrent batch requests (default: 2)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--batch-concurrency", type=int, default=64)
+    parser.add_argument("--job-size", type=int, default=20000)
+    parser.add_argument("--job-concurrency", type=int, default=64)
+    parser.add_argument("--sample-interval", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=1, help="seed of the URL mix")
+    parser.add_argument("-o", "--output", default="-", help="JSON report file (default: stdout)")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios.split(",") if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    if not (args.jar or args.service or args.write_hosts):
+        parser.error("one of --jar, --service or --write-hosts is required")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.write_hosts:
+        write_hosts(args.write_hosts, args.hosts)
+        return
+    if args.jar:
+        args.service = f"http://127.0.0.1:{args.port}"
+    args.service = args.service.rstrip("/")
+
+    processes = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="urlcheck-bench-") as work:
+            processes.append(start_origin(args))
+            if args.jar:
+                service = start_service(args, work)
+                processes.append(service)
+                args.pid = service.pid
+            reports = []
+            for name in args.scenarios.split(","):
+                print(f"running {name}...", file=sys.stderr, flush=True)
+                report = run_scenario(args, name, SCENARIOS[name])
+                reports.append(report)
+                latency = report["latencyMs"]
+                print(f"  {report['requestsPerSecond']} req/s, {report['urlsPerSecond']} urls/s, "
+                      f"p50 {latency['p50']} ms, p99 {latency['p99']} ms, {report['errors']} errors",
+                      file=sys.stderr, flush=True)
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    document = {
+        "meta": {
+            "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "python": platform.python_version(),
+            "settings": {name: getattr(args, name) for name in (
+                "duration", "warmup", "clients", "batch_clients", "batch_size", "batch_concurrency", "job_size",
+                "job_concurrency", "hosts", "slow_ms", "seed", "service_arg", "java_opt")},
+        },
+        "scenarios": reports,
+    }
+    text = json.dumps(document, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(130)
@@ -0,0 +1,64 @@
+"""Compares two bench.py reports scenario by scenario and flags regressions.
+
+    python tools/bench/compare.py baseline.json current.json --threshold 0.1
+
+Exits with 1 when a scenario's throughput dropped, or its p99 latency, peak threads or
+peak memory grew, by more than the threshold.
+"""
+
+import argparse
+import json
+import sys
+
+# (label, how to read it from a scenario, whether higher is better)
+METRICS = (
+    ("urls/s", lambda s: s["urlsPerSecond"], True),
+    ("p50 ms", lambda s: s["latencyMs"]["p50"], False),
+    ("p99 ms", lambda s: s["latencyMs"]["p99"], False),
+    ("threads", lambda s: s["resources"].get("threads", s["resources"].get("jvmThreads", {})).get("peak"), False),
+    ("sockets", lambda s: s["resources"].get("sockets", {}).get("peak"), False),
+    ("rss MB", lambda s: s["resources"].get("rssMb", {}).get("peak"), False),
+    ("heap MB", lambda s: s["resources"].get("heapMb", {}).get("peak"), False),
+)
+# Latency and memory are noisier than throughput and only flagged on these.
+GATED = ("urls/s", "p99 ms", "threads", "rss MB")
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> bool:
+    before = {s["name"]: s for s in baseline["scenarios"]}
+    regressed = False
+    print(f"{'scenario':<14} {'metric':<8} {'baseline':>10} {'current':>10} {'change':>8}")
+    for scenario in current["scenarios"]:
+        old = before.get(scenario["name"])
+        if old is None:
+            print(f"{scenario['name']:<14} (not in baseline)")
+            continue
+        for label, read, higher_is_better in METRICS:
+            a, b = read(old), read(scenario)
+            if a is None or b is None:
+                continue
+            change = (b - a) / a if a else 0.0
+            worse = -change if higher_is_better else change
+            flag = ""
+            if label in GATED and worse > threshold:
+                flag = "  REGRESSION"
+                regressed = True
+            print(f"{scenario['name']:<14} {label:<8} {a:>10} {b:>10} {change:>+8.1%}{flag}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed relative change (default: 0.1)")
+    args = parser.parse_args(argv)
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    sys.exit(1 if compare(baseline, current, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Fake origin for benchmarks: answers on 127.0.0.1 and behaves according to the Host name.
+
+The first label of the host selects the behaviour (``fast-17.bench-origin.com`` is fast):
+
+    fast       200 straight away
+    slow       200 after --slow-ms
+    nohead     405 to HEAD; 206 to a ranged GET, 200 otherwise
+    loop       302 between / and /again forever
+    blackhole  (on --port + 1) accepts the connection and never answers
+
+``nxdomain-*`` names are simply left out of the hosts file, so they never reach this server.
+``GET /__stats`` on the main port returns request and connection counts as JSON.
+
+    python tools/bench/origin.py --port 18080
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+
+BEHAVIOURS = ("fast", "slow", "nohead", "loop")
+MAX_HEAD = 64 * 1024
+
+
+class Origin:
+
+    def __init__(self, slow_ms: int):
+        self.slow = slow_ms / 1000
+        self.requests = Counter()
+        self.methods = Counter()
+        self.connections = 0
+        self.open = 0
+        self.peak_open = 0
+        self.blackholed = 0
+        self.started = time.time()
+
+    def stats(self) -> dict:
+        return {"requests": dict(self.requests), "methods": dict(self.methods), "connections": self.connections,
+                "openConnections": self.open, "peakOpenConnections": self.peak_open,
+                "blackholedConnections": self.blackholed, "uptimeSeconds": round(time.time() - self.started, 1)}
+
+    async def serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self.open += 1
+        self.peak_open = max(self.peak_open, self.open)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                method, target, headers = _parse(head)
+                length = int(headers.get("content-length", "0") or 0)
+                if length:
+                    await reader.readexactly(length)
+                keep_alive = "close" not in headers.get("connection", "").lower()
+                await self.respond(writer, method, target, headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        finally:
+            self.open -= 1
+            writer.close()
+
+    async def respond(self, writer, method: str, target: str, headers: dict, keep_alive: bool):
+        path = target.split("?", 1)[0]
+        if path == "/__stats":
+            return await _send(writer, method, 200, json.dumps(self.stats()).encode(), keep_alive,
+                               {"Content-Type": "application/json"})
+        behaviour = headers.get("host", "").split(".", 1)[0].split("-", 1)[0].lower()
+        self.requests[behaviour if behaviour in BEHAVIOURS else "unknown"] += 1
+        self.methods[method] += 1
+        if behaviour == "fast":
+            await _send(writer, method, 200, b"ok", keep_alive)
+        elif behaviour == "slow":
+            await asyncio.sleep(self.slow)
+            await _send(writer, method, 200, b"ok", keep_alive)
+        elif behaviour == "nohead":
+            if method == "HEAD":
+                await _send(writer, method, 405, b"", keep_alive, {"Allow": "GET"})
+            elif headers.get("range", "").startswith("bytes=0-0"):
+                await _send(writer, method, 206, b"x", keep_alive, {"Content-Range": "bytes 0-0/1024"})
+            else:
+                await _send(writer, method, 200, b"x" * 1024, keep_alive)
+        elif behaviour == "loop":
+            location = "/" if path == "/again" else "/again"
+            await _send(writer, method, 302, b"", keep_alive, {"Location": location})
+        else:
+            await _send(writer, method, 404, b"unknown host", keep_alive)
+
+    async def hold(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Black hole: the request is read and never answered until the client gives up."""
+        self.blackholed += 1
+        try:
+            while await reader.read(4096):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def _parse(head: bytes):
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ")
+    if len(parts) != 3:
+        raise ValueError(f"malformed request line {lines[0][:100]!r}")
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return parts[0], parts[1], headers
+
+
+async def _send(writer, method: str, status: int, body: bytes, keep_alive: bool, extra=None):
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, 'Status')}", f"Content-Length: {len(body)}"]
+    lines += [f"{name}: {value}" for name, value in (extra or {}).items()]
+    if not keep_alive:
+        lines.append("Connection: close")
+    data = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    writer.write(data if method == "HEAD" else data + body)
+    await writer.drain()
+
+
+_REASONS = {200: "OK", 206: "Partial Content", 302: "Found", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+async def run(port: int, slow_ms: int, ready=None):
+    origin = Origin(slow_ms)
+    main = await asyncio.start_server(origin.serve, "127.0.0.1", port, limit=MAX_HEAD, backlog=4096)
+    blackhole = await asyncio.start_server(origin.hold, "127.0.0.1", port + 1, backlog=4096)
+    if ready is not None:
+        ready()
+    async with main, blackhole:
+        await asyncio.gather(main.serve_forever(), blackhole.serve_forever())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake origin for URL check benchmarks")
+    parser.add_argument("--port", type=int, default=18080, help="main port; the black hole listens on port + 1")
+    parser.add_argument("--slow-ms", type=int, default=800, help="delay of the slow hosts (default: 800)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run(args.port, args.slow_ms,
+                        lambda: print(f"origin listening on 127.0.0.1:{args.port} (black hole on {args.port + 1})",
+                                      flush=True)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
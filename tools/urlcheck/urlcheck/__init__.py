@@ -0,0 +1,8 @@
+"""Bulk URL reachability checker with the same rules as the URL Validator service."""
+
+from .checker import Checker, Options
+from .normalize import Normalizer
+from .policy import TargetPolicy
+
+__all__ = ["Checker", "Options", "Normalizer", "TargetPolicy"]
+__version__ = "1.0.0"
@@ -0,0 +1,123 @@
+"""Command line entry point: reads URLs, one per line, and writes one NDJSON result per URL.
+
+    python -m urlcheck links.txt > results.ndjson
+    cat links.txt | python -m urlcheck --concurrency 500 --unique
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .checker import Checker, Options
+from .normalize import Normalizer
+from .policy import DEFAULT_BLOCKED_NETWORKS, TargetPolicy
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="urlcheck", description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", default=["-"], help="input files, one URL per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="NDJSON output file (default: stdout)")
+    parser.add_argument("-c", "--concurrency", type=int, default=200, help="URLs checked at once (default: 200)")
+    parser.add_argument("--per-host", type=int, default=4, help="URLs of one host checked at once (default: 4)")
+    parser.add_argument("--rate", type=float, default=5.0, help="requests per second per host (default: 5)")
+    parser.add_argument("--burst", type=int, default=10, help="request burst per host (default: 10)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds per request (default: 10)")
+    parser.add_argument("--connect-timeout", type=float, default=10.0, help="seconds to connect (default: 10)")
+    parser.add_argument("--deadline", type=float, default=30.0, help="seconds per URL (default: 30)")
+    parser.add_argument("--no-range", action="store_true", help="send the GET fallback without Range: bytes=0-0")
+    parser.add_argument("--unique", action="store_true", help="check each normalized URL only once")
+    parser.add_argument("--keep-tracking-params", action="store_true", help="keep utm_* and similar parameters")
+    parser.add_argument("--no-policy", action="store_true", help="skip the TLD and private-address checks")
+    parser.add_argument("--allow-network", action="append", default=[], metavar="CIDR",
+                        help="probe addresses in this network even though it is blocked by default")
+    parser.add_argument("--insecure", action="store_true", help="do not verify TLS certificates")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no summary on stderr")
+    return parser.parse_args(argv)
+
+
+async def run(args) -> int:
+    loop = asyncio.get_running_loop()
+    # getaddrinfo blocks, so lookups need more threads than the default executor has.
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=min(256, max(32, args.concurrency))))
+    options = Options(concurrency=args.concurrency, per_host_concurrency=args.per_host, per_host_rate=args.rate,
+                      per_host_burst=args.burst, timeout=args.timeout, connect_timeout=args.connect_timeout,
+                      deadline=args.deadline, range_requests=not args.no_range, verify_tls=not args.insecure)
+    normalizer = Normalizer(strip_tracking=not args.keep_tracking_params)
+    policy = None if args.no_policy else TargetPolicy(blocked_networks=DEFAULT_BLOCKED_NETWORKS,
+                                                      allowed_networks=args.allow_network)
+    checker = Checker(options, normalizer, policy)
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    # Only a bounded number of URLs is read ahead of the checks, so input of any size streams through.
+    window = asyncio.Semaphore(args.concurrency * 4)
+    reader = ThreadPoolExecutor(max_workers=1)
+    seen = set()
+    counts = {"checked": 0, "reachable": 0, "duplicates": 0}
+    pending = set()
+    started = time.monotonic()
+
+    async def check(url):
+        try:
+            result = await checker.check(url)
+            out.write(json.dumps(result, separators=(",", ":")) + "\n")
+            counts["checked"] += 1
+            counts["reachable"] += result["reachable"]
+        finally:
+            window.release()
+
+    try:
+        for name in args.files:
+            source = sys.stdin if name == "-" else open(name, encoding="utf-8", errors="replace")
+            try:
+                while True:
+                    line = await loop.run_in_executor(reader, source.readline)
+                    if not line:
+                        break
+                    url = line.strip().lstrip("\ufeff")
+                    if not url or url.startswith("#"):
+                        continue
+                    if args.unique:
+                        key = normalizer.normalize(url)
+                        if key in seen:
+                            counts["duplicates"] += 1
+                            continue
+                        seen.add(key)
+                    await window.acquire()
+                    task = asyncio.ensure_future(check(url))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            finally:
+                if source is not sys.stdin:
+                    source.close()
+        if pending:
+            await asyncio.gather(*pending)
+    finally:
+        out.flush()
+        if out is not sys.stdout:
+            out.close()
+        checker.close()
+        reader.shutdown(wait=False)
+
+    if not args.quiet:
+        elapsed = time.monotonic() - started
+        rate = counts["checked"] / elapsed * 60 if elapsed > 0 else 0
+        print(f"checked {counts['checked']} urls in {elapsed:.1f}s ({rate:.0f}/min): {counts['reachable']} reachable, "
+              f"{counts['checked'] - counts['reachable']} unreachable, {counts['duplicates']} duplicates skipped",
+              file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    try:
+        sys.exit(asyncio.run(run(parse_args(argv))))
+    except KeyboardInterrupt:
+        sys.exit(130)
+    except BrokenPipeError:
+        # Output piped into head and the like; stop quietly.
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
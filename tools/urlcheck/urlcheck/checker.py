@@ -0,0 +1,260 @@
+"""The check itself, following the service's UrlChecker.
+
+A URL is canonicalized and checked against the target policy, its host is resolved (and
+the addresses checked again), then HEAD is sent. If HEAD does not answer 2xx/3xx, GET is
+sent with ``Range: bytes=0-0``; a 416 to that range still counts as reachable. Hosts where
+HEAD fails but GET works are remembered and go straight to GET. A 429/503 with a short
+``Retry-After`` pauses the host and the request is retried once.
+
+Results have the same shape as the service's JSON: ``url``, ``reachable``, ``status``,
+``method``, ``failure``, ``error`` and ``timings`` (``dns``, ``firstByte``, ``total`` in ms),
+with absent values left out.
+"""
+
+import asyncio
+import socket
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+
+from .http import ConnectionPool, ProbeError, Response
+from .normalize import Normalizer
+from .policy import TargetPolicy
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+
+@dataclass
+class Options:
+    concurrency: int = 200
+    per_host_concurrency: int = 4
+    per_host_rate: float = 5.0
+    per_host_burst: int = 10
+    timeout: float = 10.0
+    connect_timeout: float = 10.0
+    deadline: float = 30.0
+    max_retry_wait: float = 30.0
+    range_requests: bool = True
+    head_memory_ttl: float = 3600.0
+    dns_positive_ttl: float = 300.0
+    dns_negative_ttl: float = 60.0
+    keep_alive: float = 30.0
+    verify_tls: bool = True
+
+
+class _Host:
+    """Per-host politeness: a cap on URLs checked at once plus a token bucket for requests."""
+
+    __slots__ = ("slots", "tokens", "updated", "blocked_until", "users")
+
+    def __init__(self, concurrency: int, burst: int):
+        self.slots = asyncio.Semaphore(concurrency)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.users = 0
+
+    async def take(self, rate: float, burst: int):
+        while True:
+            now = time.monotonic()
+            if self.blocked_until > now:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            self.tokens = min(burst, self.tokens + (now - self.updated) * rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / rate)
+
+
+class Checker:
+
+    def __init__(self, options: Optional[Options] = None, normalizer: Optional[Normalizer] = None,
+                 policy: Optional[TargetPolicy] = None):
+        self.options = options or Options()
+        self.normalizer = normalizer or Normalizer()
+        self.policy = policy
+        self.pool = ConnectionPool(self.options.keep_alive, max(8, self.options.per_host_concurrency),
+                                   self.options.verify_tls)
+        self._global = asyncio.Semaphore(self.options.concurrency)
+        self._hosts: Dict[str, _Host] = {}
+        self._dns: Dict[str, tuple] = {}
+        self._head_fails_until: Dict[str, float] = {}
+
+    async def check(self, url: str) -> dict:
+        """Checks one URL. Never raises; failures are reported in the result."""
+        started = time.monotonic()
+        try:
+            return await asyncio.wait_for(self._check(url, started), self.options.deadline)
+        except asyncio.TimeoutError:
+            return _result(url, False, failure="DEADLINE", error="deadline exceeded", started=started)
+
+    async def _check(self, url: str, started: float) -> dict:
+        normalized = self.normalizer.canonicalize(url)
+        if not normalized.valid:
+            return _result(url, False, failure="INVALID_URL", error=normalized.error)
+        if self.policy is not None:
+            rejection = self.policy.check_host(normalized.host)
+            if rejection is not None:
+                return _result(url, False, failure=rejection.failure, error=rejection.reason)
+
+        host = self._hosts.get(normalized.host)
+        if host is None:
+            host = self._hosts[normalized.host] = _Host(self.options.per_host_concurrency, self.options.per_host_burst)
+        host.users += 1
+        try:
+            # The host slot is taken first, so URLs waiting on a busy host do not hold global slots.
+            async with host.slots, self._global:
+                return await self._probe(url, normalized, host, started)
+        finally:
+            host.users -= 1
+            if host.users == 0 and host.blocked_until <= time.monotonic():
+                del self._hosts[normalized.host]
+
+    async def _probe(self, url, normalized, host: _Host, started: float) -> dict:
+        addresses = await self._resolve(normalized.host.strip("[]"), normalized.port)
+        dns_ms = int((time.monotonic() - started) * 1000)
+        if isinstance(addresses, str):
+            return _result(url, False, failure="DNS", error=addresses, dns=dns_ms, started=started)
+        if self.policy is not None:
+            rejection = self.policy.check_addresses(normalized.host, addresses)
+            if rejection is not None:
+                return _result(url, False, failure=rejection.failure, error=rejection.reason, dns=dns_ms,
+                               started=started)
+        # Connect to the address that was vetted, not whatever a second lookup returns.
+        address = addresses[0]
+
+        def done(method: str, response: Response) -> dict:
+            if _succeeded(response, method == "GET" and self.options.range_requests):
+                return _result(url, True, response.status, method, dns=dns_ms,
+                               first_byte=response.first_byte_ms, started=started)
+            return _result(url, False, response.status, method, "HTTP", f"HTTP {response.status}",
+                           dns=dns_ms, first_byte=response.first_byte_ms, started=started)
+
+        def failed(method: str, error: Exception) -> dict:
+            failure, message = _classify(error)
+            return _result(url, False, method=method, failure=failure, error=message, dns=dns_ms, started=started)
+
+        if self._skip_head(normalized.host):
+            try:
+                response = await self._attempt("GET", normalized, address, host, True)
+            except Exception as e:
+                return failed("GET", e)
+            if not _succeeded(response, self.options.range_requests):
+                # GET is failing as well, so HEAD gets another chance next time.
+                self._head_fails_until.pop(normalized.host, None)
+            return done("GET", response)
+
+        try:
+            head = await self._attempt("HEAD", normalized, address, host, True)
+        except Exception as e:
+            return failed("HEAD", e)
+        if _succeeded(head, False):
+            return done("HEAD", head)
+        try:
+            response = await self._attempt("GET", normalized, address, host, True)
+        except Exception as e:
+            return failed("GET", e)
+        if _succeeded(response, self.options.range_requests):
+            self._head_fails_until[normalized.host] = time.monotonic() + self.options.head_memory_ttl
+        return done("GET", response)
+
+    async def _attempt(self, method: str, normalized, address: str, host: _Host, may_retry: bool) -> Response:
+        headers = {"User-Agent": USER_AGENT}
+        if method == "GET" and self.options.range_requests:
+            headers["Range"] = "bytes=0-0"
+        await host.take(self.options.per_host_rate, self.options.per_host_burst)
+        response = await self.pool.request(method, normalized.scheme, normalized.host, normalized.port,
+                                           normalized.target, address, headers, self.options.timeout,
+                                           self.options.connect_timeout)
+        retry_after = _retry_after(response)
+        if retry_after is not None:
+            host.blocked_until = max(host.blocked_until, time.monotonic() + retry_after)
+        if may_retry and retry_after is not None and retry_after <= self.options.max_retry_wait:
+            return await self._attempt(method, normalized, address, host, False)
+        return response
+
+    async def _resolve(self, host: str, port: int):
+        """Returns the host's addresses, or an error message if it does not resolve. Answers are cached."""
+        now = time.monotonic()
+        cached = self._dns.get(host)
+        if cached is not None and now < cached[0]:
+            return await asyncio.shield(cached[1])
+        future = asyncio.ensure_future(self._lookup(host, port))
+        # Shared by concurrent lookups of the same host until it completes.
+        self._dns[host] = (float("inf"), future)
+        result = await asyncio.shield(future)
+        ttl = self.options.dns_negative_ttl if isinstance(result, str) else self.options.dns_positive_ttl
+        if self._dns.get(host, (None, None))[1] is future:
+            self._dns[host] = (time.monotonic() + ttl, future)
+        return result
+
+    async def _lookup(self, host: str, port: int):
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except (socket.gaierror, UnicodeError):
+            return f"unknown host {host}"
+        addresses: List[str] = []
+        for info in infos:
+            if info[4][0] not in addresses:
+                addresses.append(info[4][0])
+        return addresses or f"unknown host {host}"
+
+    def _skip_head(self, host: str) -> bool:
+        until = self._head_fails_until.get(host)
+        if until is None:
+            return False
+        if time.monotonic() >= until:
+            del self._head_fails_until[host]
+            return False
+        return True
+
+    def close(self):
+        self.pool.close()
+
+
+def _succeeded(response: Response, ranged: bool) -> bool:
+    # 416 to a one-byte range only means the resource is empty; the URL itself answered.
+    return 200 <= response.status < 400 or (ranged and response.status == 416)
+
+
+def _retry_after(response: Response) -> Optional[float]:
+    if response.status not in (429, 503):
+        return None
+    value = response.headers.get("retry-after", "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _classify(error: Exception):
+    if isinstance(error, ProbeError):
+        return error.failure, str(error)
+    if isinstance(error, asyncio.TimeoutError):
+        return "HTTP", "timed out"
+    return "HTTP", str(error) or type(error).__name__
+
+
+def _result(url: str, reachable: bool, status: Optional[int] = None, method: Optional[str] = None,
+            failure: Optional[str] = None, error: Optional[str] = None, dns: Optional[int] = None,
+            first_byte: Optional[int] = None, started: Optional[float] = None) -> dict:
+    result = {"url": url, "reachable": reachable}
+    for name, value in (("status", status), ("method", method), ("failure", failure), ("error", error)):
+        if value is not None:
+            result[name] = value
+    if started is not None:
+        timings = {}
+        if dns is not None:
+            timings["dns"] = dns
+        if first_byte is not None:
+            timings["firstByte"] = first_byte
+        timings["total"] = int((time.monotonic() - started) * 1000)
+        result["timings"] = timings
+    return result
@@ -0,0 +1,174 @@
+"""A small HTTP/1.1 client on asyncio streams, with a keep-alive connection pool.
+
+Only what a reachability check needs: send a bodiless request, read the status line and
+headers, then either drain a small body and pool the connection or drop the connection
+instead of downloading the rest, as the service does for its GET fallback.
+"""
+
+import asyncio
+import ssl
+import time
+from collections import defaultdict, deque
+from typing import Dict, NamedTuple, Optional, Tuple
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_DRAINED_BODY = 64 * 1024
+
+
+class ProbeError(Exception):
+    """A failed exchange, tagged with the stage it failed at (CONNECT, TLS or HTTP)."""
+
+    def __init__(self, failure: str, message: str):
+        super().__init__(message)
+        self.failure = failure
+
+
+class Response(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    first_byte_ms: int
+
+
+class _Connection:
+
+    __slots__ = ("key", "reader", "writer", "idle_since")
+
+    def __init__(self, key, reader, writer):
+        self.key = key
+        self.reader = reader
+        self.writer = writer
+        self.idle_since = 0.0
+
+    def usable(self, keep_alive: float) -> bool:
+        return (not self.writer.is_closing() and not self.reader.at_eof()
+                and time.monotonic() - self.idle_since < keep_alive)
+
+    def close(self):
+        self.writer.close()
+
+
+class ConnectionPool:
+    """Idle keep-alive connections per (scheme, host, port), reused most recent first."""
+
+    def __init__(self, keep_alive: float = 30.0, max_idle_per_host: int = 8, verify: bool = True):
+        self.keep_alive = keep_alive
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: Dict[Tuple[str, str, int], deque] = defaultdict(deque)
+        self._ssl = ssl.create_default_context()
+        if not verify:
+            self._ssl.check_hostname = False
+            self._ssl.verify_mode = ssl.CERT_NONE
+        self._ssl.set_alpn_protocols(["http/1.1"])
+
+    async def _connect(self, key, address: str, connect_timeout: float) -> _Connection:
+        scheme, host, port = key
+        tls = self._ssl if scheme == "https" else None
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(address, port, ssl=tls, limit=MAX_HEADER_BYTES,
+                                        server_hostname=host.strip("[]") if tls else None),
+                connect_timeout)
+        except asyncio.TimeoutError:
+            raise ProbeError("CONNECT", "connect timed out") from None
+        except ssl.SSLError as e:
+            raise ProbeError("TLS", str(e)) from None
+        except OSError as e:
+            raise ProbeError("CONNECT", e.strerror or str(e)) from None
+        return _Connection(key, reader, writer)
+
+    def _take_idle(self, key) -> Optional[_Connection]:
+        idle = self._idle.get(key)
+        while idle:
+            conn = idle.pop()
+            if conn.usable(self.keep_alive):
+                return conn
+            conn.close()
+        return None
+
+    def _release(self, conn: _Connection):
+        idle = self._idle[conn.key]
+        if len(idle) >= self.max_idle_per_host:
+            conn.close()
+            return
+        conn.idle_since = time.monotonic()
+        idle.append(conn)
+
+    async def request(self, method: str, scheme: str, host: str, port: int, target: str, address: str,
+                      headers: Dict[str, str], timeout: float, connect_timeout: float) -> Response:
+        """Sends one request and returns once the response headers are in."""
+        key = (scheme, host, port)
+        conn = self._take_idle(key)
+        if conn is not None:
+            try:
+                return await asyncio.wait_for(self._exchange(conn, method, target, headers), timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # The server closed the pooled connection while it sat idle; use a fresh one.
+                conn.close()
+            except BaseException:
+                conn.close()
+                raise
+        conn = await self._connect(key, address, connect_timeout)
+        try:
+            return await asyncio.wait_for(self._exchange(conn, method, target, headers), timeout)
+        except BaseException:
+            conn.close()
+            raise
+
+    async def _exchange(self, conn: _Connection, method: str, target: str, headers: Dict[str, str]) -> Response:
+        scheme, host, port = conn.key
+        default_port = 80 if scheme == "http" else 443
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host if port == default_port else f'{host}:{port}'}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        conn.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        sent = time.monotonic()
+        await conn.writer.drain()
+
+        while True:
+            head = await conn.reader.readuntil(b"\r\n\r\n")
+            version, status, response_headers = _parse_head(head)
+            # Interim answers (100 Continue, 103 Early Hints) are followed by the real one.
+            if not 100 <= status < 200 or status == 101:
+                break
+        first_byte_ms = int((time.monotonic() - sent) * 1000)
+
+        if self._reusable(conn, method, version, status, response_headers):
+            # HEAD, 204 and 304 answers carry no body whatever their Content-Length says.
+            if method != "HEAD" and status not in (204, 304):
+                length = int(response_headers.get("content-length", "0") or 0)
+                if length:
+                    await conn.reader.readexactly(length)
+            self._release(conn)
+        else:
+            # Anything with a body of unknown or large size is cut off rather than read.
+            conn.close()
+        return Response(status, response_headers, first_byte_ms)
+
+    @staticmethod
+    def _reusable(conn, method, version, status, headers) -> bool:
+        if version != "HTTP/1.1" or "close" in headers.get("connection", "").lower():
+            return False
+        if method == "HEAD" or status in (204, 304):
+            return True
+        if "transfer-encoding" in headers:
+            return False
+        length = headers.get("content-length")
+        return length is not None and length.strip().isdigit() and int(length) <= MAX_DRAINED_BODY
+
+    def close(self):
+        for idle in self._idle.values():
+            for conn in idle:
+                conn.close()
+        self._idle.clear()
+
+
+def _parse_head(head: bytes):
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ", 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/") or not parts[1].isdigit():
+        raise ProbeError("HTTP", f"malformed status line {lines[0][:100]!r}")
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return parts[0], int(parts[1]), headers
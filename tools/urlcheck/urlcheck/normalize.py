@@ -0,0 +1,183 @@
+"""URL canonicalization, following the service's UrlNormalizer.
+
+Adds ``https://`` when the scheme is missing, lower-cases scheme and host, converts
+internationalized host names to punycode, drops default ports and the fragment, repairs
+percent-encoding and optionally strips tracking query parameters. Input that cannot be
+made into a valid http(s) URL is rejected with a reason.
+"""
+
+import re
+from typing import Iterable, NamedTuple, Optional
+
+MAX_LENGTH = 2048
+DEFAULT_TRACKING_PARAMS = ("utm_*", "gclid", "dclid", "fbclid", "msclkid", "yclid", "igshid",
+                           "mc_cid", "mc_eid", "_ga", "_gl")
+
+_SCHEME = re.compile(r"^([a-zA-Z][a-zA-Z0-9+.-]*)://")
+_HOST_LABEL = re.compile(r"[a-z0-9]([a-z0-9-]*[a-z0-9])?")
+_IPV6_LITERAL = re.compile(r"\[[0-9a-f:.]+\]")
+_UNRESERVED = frozenset(b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-._~")
+_HEX = b"0123456789abcdefABCDEF"
+_PATH_CHARS = "!$&'()*+,;=:@/"
+_QUERY_CHARS = _PATH_CHARS + "?"
+_USERINFO_CHARS = "!$&'()*+,;=:"
+
+
+class Normalized(NamedTuple):
+    """The canonical URL and its parts, or the reason the input was rejected."""
+
+    url: Optional[str]
+    scheme: Optional[str] = None
+    host: Optional[str] = None
+    port: Optional[int] = None
+    target: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def valid(self) -> bool:
+        return self.error is None
+
+
+def _rejected(error: str) -> Normalized:
+    return Normalized(url=None, error=error)
+
+
+class Normalizer:
+
+    def __init__(self, strip_tracking: bool = True, tracking_params: Iterable[str] = DEFAULT_TRACKING_PARAMS):
+        self.strip_tracking = strip_tracking
+        params = {p.strip().lower() for p in tracking_params if p.strip()}
+        self._exact = frozenset(p for p in params if not p.endswith("*"))
+        self._prefixes = tuple(p[:-1] for p in params if p.endswith("*"))
+
+    def normalize(self, url: str) -> str:
+        """Returns the canonical form of ``url``, or the trimmed input if it has none."""
+        normalized = self.canonicalize(url)
+        return normalized.url if normalized.valid else url.strip()
+
+    def canonicalize(self, url: str) -> Normalized:
+        candidate = re.sub(r"[\t\r\n]", "", url.strip())
+        if not candidate:
+            return _rejected("empty url")
+        if len(candidate) > MAX_LENGTH:
+            return _rejected(f"url longer than {MAX_LENGTH} characters")
+
+        scheme = "https"
+        match = _SCHEME.match(candidate)
+        if match:
+            scheme = match.group(1).lower()
+            if scheme not in ("http", "https"):
+                return _rejected(f"unsupported scheme {scheme}")
+            candidate = candidate[match.end():]
+        elif candidate.startswith("//"):
+            candidate = candidate[2:]
+        candidate = candidate.replace("\\", "/").split("#", 1)[0]
+
+        authority_end = min((i for i in (candidate.find("/"), candidate.find("?")) if i >= 0), default=-1)
+        authority = candidate if authority_end < 0 else candidate[:authority_end]
+        rest = "" if authority_end < 0 else candidate[authority_end:]
+        path, _, query = rest.partition("?")
+        has_query = "?" in rest
+
+        user_info = None
+        if "@" in authority:
+            user_info, _, authority = authority.rpartition("@")
+        if authority.startswith("["):
+            port_start = authority.find(":", authority.find("]"))
+        else:
+            port_start = authority.rfind(":")
+        host = authority if port_start < 0 else authority[:port_start]
+        port_text = "" if port_start < 0 else authority[port_start + 1:]
+
+        host = _canonical_host(host)
+        if host is None:
+            return _rejected(f"invalid host in {url.strip()}")
+        port = None
+        if port_text:
+            if not port_text.isdigit() or len(port_text) > 5 or not 1 <= int(port_text) <= 65535:
+                return _rejected(f"invalid port {port_text}")
+            port = int(port_text)
+            if (port == 80 and scheme == "http") or (port == 443 and scheme == "https"):
+                port = None
+
+        target = _remove_dot_segments(repair(path, _PATH_CHARS)) if path else "/"
+        if has_query:
+            canonical_query = self._canonical_query(repair(query, _QUERY_CHARS))
+            if canonical_query:
+                target += "?" + canonical_query
+
+        authority = host if port is None else f"{host}:{port}"
+        if user_info:
+            authority = repair(user_info, _USERINFO_CHARS) + "@" + authority
+        return Normalized(f"{scheme}://{authority}{target}", scheme, host,
+                          port if port is not None else (80 if scheme == "http" else 443), target)
+
+    def _canonical_query(self, query: str) -> str:
+        if not self.strip_tracking:
+            return query
+        kept = []
+        for param in query.split("&"):
+            if not param:
+                continue
+            name = param.split("=", 1)[0].lower()
+            if name in self._exact or name.startswith(self._prefixes):
+                continue
+            kept.append(param)
+        return "&".join(kept)
+
+
+def _canonical_host(host: str) -> Optional[str]:
+    lower = host.lower()
+    if lower.startswith("["):
+        return lower if _IPV6_LITERAL.fullmatch(lower) else None
+    if lower.endswith("."):
+        lower = lower[:-1]
+    try:
+        ascii_host = lower.encode("idna").decode("ascii").lower()
+    except UnicodeError:
+        return None
+    if not ascii_host or len(ascii_host) > 253:
+        return None
+    for label in ascii_host.split("."):
+        if len(label) > 63 or not _HOST_LABEL.fullmatch(label):
+            return None
+    return ascii_host
+
+
+def repair(part: str, allowed: str) -> str:
+    """Percent-encodes disallowed characters, escapes stray ``%`` signs, decodes escaped
+    unreserved characters and upper-cases the hex digits of the escapes that remain."""
+    data = part.encode("utf-8")
+    allowed_bytes = allowed.encode("ascii")
+    out = []
+    i = 0
+    while i < len(data):
+        b = data[i]
+        if b == 0x25 and i + 2 < len(data) and data[i + 1] in _HEX and data[i + 2] in _HEX:
+            decoded = int(data[i + 1:i + 3], 16)
+            out.append(chr(decoded) if decoded in _UNRESERVED else f"%{decoded:02X}")
+            i += 3
+            continue
+        if b in _UNRESERVED or (b < 0x80 and b in allowed_bytes):
+            out.append(chr(b))
+        else:
+            out.append(f"%{b:02X}")
+        i += 1
+    return "".join(out)
+
+
+def _remove_dot_segments(path: str) -> str:
+    if "." not in path:
+        return path
+    segments = path.split("/")
+    out = []
+    for segment in segments[1:]:
+        if segment == "..":
+            if out:
+                out.pop()
+        elif segment != ".":
+            out.append(segment)
+    result = "/" + "/".join(out)
+    if segments[-1] in (".", "..") and not result.endswith("/"):
+        result += "/"
+    return result
@@ -0,0 +1,80 @@
+"""Target policy, following the service's TargetPolicy.
+
+Host names must end in a known top-level domain, and IP literals as well as every address
+a host resolves to are refused when they fall inside the blocked networks (loopback,
+private, link-local and other special-purpose ranges by default).
+"""
+
+import ipaddress
+import re
+from importlib import resources
+from typing import Iterable, NamedTuple, Optional
+
+DEFAULT_BLOCKED_NETWORKS = (
+    "0.0.0.0/8", "10.0.0.0/8", "100.64.0.0/10", "127.0.0.0/8", "169.254.0.0/16", "172.16.0.0/12",
+    "192.0.0.0/24", "192.0.2.0/24", "192.168.0.0/16", "198.18.0.0/15", "198.51.100.0/24", "203.0.113.0/24",
+    "224.0.0.0/4", "240.0.0.0/4", "::/128", "::1/128", "64:ff9b::/96", "2001:db8::/32", "fc00::/7",
+    "fe80::/10", "ff00::/8",
+)
+
+_IPV4_LITERAL = re.compile(r"((25[0-5]|2[0-4]\d|1?\d?\d)(\.|$)){4}")
+
+
+class Rejection(NamedTuple):
+    failure: str
+    reason: str
+
+
+def load_tlds(path: Optional[str] = None) -> frozenset:
+    """Reads one TLD per line; defaults to the list bundled with the package."""
+    if path is None:
+        text = resources.files(__package__).joinpath("tlds.txt").read_text(encoding="utf-8")
+    else:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    return frozenset(line.strip().lower() for line in text.splitlines()
+                     if line.strip() and not line.startswith("#"))
+
+
+class TargetPolicy:
+
+    def __init__(self, check_tld: bool = True, tld_file: Optional[str] = None,
+                 blocked_networks: Iterable[str] = DEFAULT_BLOCKED_NETWORKS,
+                 allowed_networks: Iterable[str] = ()):
+        self.check_tld = check_tld
+        self._tlds = load_tlds(tld_file) if check_tld else frozenset()
+        self._blocked = [ipaddress.ip_network(n.strip(), strict=False) for n in blocked_networks if n.strip()]
+        self._allowed = [ipaddress.ip_network(n.strip(), strict=False) for n in allowed_networks if n.strip()]
+
+    def check_host(self, host: str) -> Optional[Rejection]:
+        """Checks a canonical host without any network I/O."""
+        if host.startswith("[") or _IPV4_LITERAL.fullmatch(host):
+            try:
+                address = ipaddress.ip_address(host.strip("[]"))
+            except ValueError:
+                return Rejection("INVALID_URL", f"invalid IP address {host}")
+            if self.is_blocked(address):
+                return Rejection("BLOCKED", f"address {_plain(address)} is not allowed")
+            return None
+        if self.check_tld and host.rsplit(".", 1)[-1] not in self._tlds:
+            return Rejection("INVALID_URL", f"unknown top-level domain in {host}")
+        return None
+
+    def check_addresses(self, host: str, addresses: Iterable[str]) -> Optional[Rejection]:
+        """Refuses the host if any address it resolved to is blocked."""
+        for text in addresses:
+            address = ipaddress.ip_address(text.split("%", 1)[0])
+            if self.is_blocked(address):
+                return Rejection("BLOCKED", f"{host} resolves to {_plain(address)}, which is not allowed")
+        return None
+
+    def is_blocked(self, address) -> bool:
+        address = _plain(address)
+        return (any(address in n for n in self._blocked if n.version == address.version)
+                and not any(address in n for n in self._allowed if n.version == address.version))
+
+
+def _plain(address):
+    # Java sees IPv4-mapped IPv6 addresses as plain IPv4; do the same.
+    mapped = getattr(address, "ipv4_mapped", None)
+    return mapped if mapped is not None else address